@@ -3,208 +3,15 @@ from external import space4ai_logger
 import pdb
 from classes.System import System
 from classes.AlgorithmPool import AlgPool
+from classes.LambdaSweep import LambdaSweep
 import sys
 import os
 import json
 import argparse
 import numpy as np
-import multiprocessing as mpp
-from multiprocessing import Pool
-import functools
-from classes.Solution import Result, EliteResults
-import time
 import pathlib
 
 
-#####################################
-
-class MultiProcessing:
-
-    ## @var starting_point
-    # Some starting point(s) as initial solution(s)
-
-    ## @var cpuCore
-    # The Object of Logger.Logger type
-
-    ## @var cpuCore
-    # The number of cpu cores in the current machine
-
-    ## MultiProcessing class constructor
-    #   @param self The object pointer
-    #   @param method A dictionary includes the name of algorithm and all the required parameters
-    def __init__(self, method):
-        self.method = method
-        self.cpuCore = int(mpp.cpu_count())
-        if "starting_point" in self.method["parameters"]:
-            self.StartingPoints = self.method["parameters"]["starting_point"]
-        else:
-            self.StartingPoints = None
-        self._core_params = self._get_core_params()
-        self.logger = self.method["parameters"]["log"]
-
-    ## Function to get a list whose n-th element stores a tuple with the number
-    # of iterations to be performed by the n-th cpu core and the seed it should
-    # use for random numbers generation
-    #   @param iteration Total number of iterations to be performed
-    #   @param seed Seed for random number generation
-    #   @param cpuCore Total number of cpu cores
-    #   @param logger Current logger
-    #   @return The list of parameters required by each core (number of
-    #           iterations, seed and logger)
-    def _get_core_params(self):
-        iteration = self.method["parameters"]["max_steps"]
-        Max_time = self.method["parameters"]["max_time"]
-        seed = self.method["parameters"]["seed"]
-        logger = self.method["parameters"]["log"]
-        core_params = []
-        local_itr = int(iteration / self.cpuCore)
-        remainder_itr = iteration % self.cpuCore
-        local_Max_time = Max_time / self.cpuCore
-        if self.StartingPoints:
-            local_StartingPoints = int(len(self.StartingPoints) / self.cpuCore)
-            remainder_StartingPoints = len(self.StartingPoints) % self.cpuCore
-        next_idx = 0
-        for r in range(self.cpuCore):
-            if logger.out_stream != sys.stdout:
-                if self.cpuCore > 1 and logger.verbose > 0:
-                    log_file = ".".join(logger.out_stream.name.split(".")[:-1])
-                    log_file += "_" + str(r) + ".log"
-                else:
-                    log_file = logger.out_stream.name
-            else:
-                log_file = ""
-            r_seed = r * r * self.cpuCore * self.cpuCore * seed
-            if r < remainder_itr:
-                current_local_itr = local_itr + 1
-            else:
-                current_local_itr = local_itr
-
-            if self.StartingPoints:
-                if r < remainder_StartingPoints:
-                    current_local_StartingPoints = local_StartingPoints + 1
-                else:
-                    current_local_StartingPoints = local_StartingPoints
-                starting_points = self.StartingPoints[next_idx: next_idx + current_local_StartingPoints]
-                next_idx = next_idx + current_local_StartingPoints
-                core_params.append((current_local_itr, local_Max_time, r_seed, log_file, starting_points))
-            else:
-                core_params.append((current_local_itr, local_Max_time, r_seed, log_file))
-        return core_params
-
-    ## Method to run the algorithem on a specific core
-    #   @param core_params The core params
-    #   @param S The object of System.system
-    #   @param method The dictionary includes the name and all required parameters of the method
-    #   @return A list of results
-    def run_alg(self, core_params, system_file, method):
-        with open(system_file, "r") as a_file:
-            json_object = json.load(a_file)
-        Lambda = json_object["Lambda"]
-        method["parameters"]["seed"] = core_params[2]
-        core_logger = method["parameters"]["log"]
-        if core_params[3] != "":
-            log_file = open(core_params[3], "a")
-            core_logger.out_stream = log_file
-            method["parameters"]["log"] = core_logger
-        core_logger.log("Seed: " + str(core_params[2]))
-        core_logger.log("Iteration number: " + str(core_params[0]))
-        S = System(system_json=json_object, log=core_logger)
-        method["parameters"]["system"] = S
-        if self.StartingPoints:
-            elite_sol = EliteResults(
-                1, 
-                space4ai_logger.Logger(
-                    name="SPACE4AI-D",
-                    out_stream=core_logger.out_stream,
-                    verbose=core_logger.verbose
-                )
-            )
-            elite_sol.elite_results.add(Result(core_logger))
-            if self.method["name"] in list(
-                    i for i in AlgPool.algorithms if AlgPool.algorithms[i] == AlgPool.algorithms["GA"]):
-                if len(core_params[4]) > 0:
-                    method["parameters"]["initial_state"] = core_params[4]
-                    method["parameters"]["max_steps"] = core_params[0]
-                    method["parameters"]["max_time"] = core_params[1]
-                    algorithm = AlgPool.create(method["name"], **method["parameters"])
-                    result = algorithm.run_algorithm()
-                    elite_sol.add(result[0])
-            else:
-                for initial_state in core_params[4]:
-                    method["parameters"]["initial_state"] = initial_state
-                    method["parameters"]["max_steps"] = int(core_params[0] / len(core_params[4]))
-                    method["parameters"]["max_time"] = core_params[1] / len(core_params[4])
-                    algorithm = AlgPool.create(method["name"], **method["parameters"])
-                    result = algorithm.run_algorithm()
-                    elite_sol.add(result[0])
-            results = elite_sol.elite_results[0], elite_sol
-        else:
-            method["parameters"]["max_steps"] = core_params[0]
-            method["parameters"]["max_time"] = core_params[1]
-            algorithm = AlgPool.create(method["name"], **method["parameters"])
-            results = algorithm.run_algorithm()
-
-        return results
-
-    ## Method to run the algorithems in multi-processing manner
-    #   @param json_object The json object of system json file
-    #   @return 1) A boolean to show if the best solution is feasible
-    #           2) A list of k_best solutions
-    #           3) The result of the best solution
-    #           4) The system object
-    def run(self, system_file):
-        # if self.method["name"] == "LS":
-
-        #   results = self.run_alg(self._core_params[1], system_file, self.method)
-        #  pdb.set_trace()
-        solutions = []
-        feasible_found = False
-        elite_sol = []
-        start = time.time()
-        if __name__ == "__main__":
-            with Pool(processes=self.cpuCore) as pool:
-                partial_gp = functools.partial(self.run_alg, system_file=system_file, method=self.method)
-                full_result = pool.map(partial_gp, self._core_params)
-            print("Multiprocessing ends.")
-            # S = full_result[0][1]
-            first_unfeasible = False
-            # get final list combining the results of all threads
-            for tid in range(self.cpuCore):
-                if feasible_found:
-                    if full_result[tid][1].elite_results[0].performance[0]:
-                        elite_sol.merge(full_result[tid][1], True)
-                else:
-                    if full_result[tid][1].elite_results[0].performance[0]:
-                        feasible_found = True
-                        elite_sol = EliteResults(full_result[tid][1].K)
-                        elite_sol.elite_results.add(Result())
-                        elite_sol.add(full_result[tid][1].elite_results[0])
-                    else:
-                        if not first_unfeasible:
-                            elite_sol = EliteResults(full_result[tid][1].K)
-                            elite_sol.elite_results.add(Result())
-                            elite_sol.add(full_result[tid][1].elite_results[0], feasible_found)
-                            first_unfeasible = True
-                        else:
-                            elite_sol.merge(full_result[tid][1], False)
-                # if len(elite_sol.elite_results)<K:
-                #    K=len(elite_sol.elite_results)
-
-            if feasible_found:
-                for sol in elite_sol.elite_results:
-                    if sol.cost < np.inf:
-                        solutions.append(sol.solution)
-            else:
-                for sol in elite_sol.elite_results:
-                    if sol.violation_rate < np.inf:
-                        solutions.append(sol.solution)
-
-        return feasible_found, solutions, elite_sol.elite_results[0]
-
-
-######################################################
-
-
 ## Function to create a directory given its name (if the directory already
 # exists, nothing is done)
 #   @param directory Name of the directory to be created
@@ -246,28 +53,6 @@ def create_pure_json(main_json_file):
     return pure_json
 
 
-## Function to generate the output json file as the optimal placement for a
-# specified Lambda
-#   @param Lambda incoming workload rate
-#   @param result The optimal Solution.Result returned by fun_greedy
-#   @param S An instance of System.System class including system description
-#   @param onFile True if the result should be printed on file (default: True)
-def generate_output_json(system_file, Lambda, result, logger, onFile=True):
-    # generate name of output file (if required)
-    if onFile:
-        path = pathlib.Path(system_file).parent.resolve()
-        output_json = str(path) + "/Lambda_" + str(round(float(Lambda), 4)) + ".json"
-    else:
-        output_json = ""
-    # load system
-    with open(system_file, 'r') as f:
-        data = json.load(f)
-    data["Lambda"] = Lambda
-    S = System(system_json=data, log=logger)
-    # print
-    result.print_result(S, solution_file=output_json)
-
-
 def main(dic, logger, log_directory):
     system_file = dic["system_file"]
     Lambda_list = []
@@ -328,6 +113,18 @@ def main(dic, logger, log_directory):
             step = input_json["LambdaBound"]["step"]
             for Lambda in np.arange(start_lambda, end_lambda, step):
                 Lambda_list.append(Lambda)
+        # check if each Lambda should be warm-started from the previous one
+        warm_start = False
+        if "WarmStart" in input_json.keys():
+            warm_start = input_json["WarmStart"]
+        # check how the work and the time budget of each run should be 
+        # shared among the cpu cores (see MultiProcessing.MultiProcessing)
+        scheduling = "dynamic"
+        if "Scheduling" in input_json.keys():
+            scheduling = input_json["Scheduling"]
+        time_budget = "deadline"
+        if "TimeBudget" in input_json.keys():
+            time_budget = input_json["TimeBudget"]
         if "VerboseLevel" in input_json.keys():
             verbose = input_json["VerboseLevel"]
             logger.log(f"Using verbosity level from configuration file ({verbose})")
@@ -407,6 +204,12 @@ def main(dic, logger, log_directory):
                 else:
                     logger.err(" startingPointNumber should be specified")
                     sys.exit(1)
+                # number and kind of the workers exploring the neighborhood of each 
+                # solution (optional)
+                if "neighborhoodWorkers" in Heu:
+                    Heu_method["parameters"]["neighborhood_workers"] = Heu["neighborhoodWorkers"]
+                if "neighborhoodExecutor" in Heu:
+                    Heu_method["parameters"]["neighborhood_executor"] = Heu["neighborhoodExecutor"]
                 #################### Special parameters #######################################
                 ############ LS parameters #####################
                 if Heu_method["name"] in list(
@@ -472,48 +275,15 @@ def main(dic, logger, log_directory):
                     else:
                         Heu_method["parameters"]["min_fitness"] = Heu["specialParameters"]["minFitness"]
         RG_method["parameters"]["k_best"] = startingPointNumber
-        for Lambda in Lambda_list:
-            with open(system_file, 'r') as f:
-                data = json.load(f)
-            data["Lambda"] = Lambda
-            system = json.dumps(data, indent=2)
-            with open(system_file, "w") as f:
-                f.write(system)
-            # set logger stream for the current load
-            if log_directory != "":
-                log_file_lambda = "LOG_" + str(round(float(Lambda), 4)) + ".log"
-                log_file_lambda = os.path.join(log_directory, log_file_lambda)
-                log_file_lambda = open(log_file_lambda, "a")
-            else:
-                log_file_lambda = sys.stdout
-            lambda_logger = space4ai_logger.Logger(
-                name=logger.name, 
-                out_stream=log_file_lambda, 
-                verbose=logger.verbose
-            )
-            logger.log(f"Current Lambda is {Lambda} req/s")
-            # set logger for methods
-            if len(Heu_method) > 0:
-                Heu_method["parameters"]["log"] = lambda_logger
-            RG_method["parameters"]["log"] = lambda_logger
-            # initialize multiprocessing
-            MP = MultiProcessing(RG_method)
-            feasible_found, solutions, result = MP.run(system_file)
-            # feasibility, starting_points, result, S = Random_Greedy_run(json_object, method1)
-            if not feasible_found:
-                logger.err("No feasible solution is found by RG")
-            else:
-                if Heu_method != {}:
-                    Heu_method["parameters"]["starting_point"] = solutions
-                    MP = MultiProcessing(Heu_method)
-                    feasible_found, solutions, result = MP.run(system_file)
-            # print result
-            if result.solution is None:
-                lambda_logger.log("No solution is found.")
-            else:
-                generate_output_json(system_file, Lambda, result, logger)
-            if log_directory != "":
-                log_file_lambda.close()
+        # run the algorithms for all Lambdas (the system is parsed once)
+        path = pathlib.Path(system_file).parent.resolve()
+        sweep = LambdaSweep(
+            json_object, system_file, RG_method, Heu_method, logger,
+            log_directory=log_directory, output_directory=str(path),
+            warm_start=warm_start, scheduling=scheduling,
+            time_budget=time_budget
+        )
+        sweep.run(Lambda_list)
 
 
 if __name__ == '__main__':
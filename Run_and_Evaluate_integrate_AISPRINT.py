@@ -3,206 +3,13 @@ from external import space4ai_logger, space4ai_parser
 import pdb
 from classes.System import System
 from classes.AlgorithmPool import AlgPool
+from classes.MultiProcessing import MultiProcessing, _get_context
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mpp
 import sys
 import os
 import json
 import argparse
-import numpy as np
-import multiprocessing as mpp
-from multiprocessing import Pool
-import functools
-from classes.Solution import Result, EliteResults
-import time
-
-#####################################
-
-class MultiProcessing:
-
-    ## @var starting_point
-    # Some starting point(s) as initial solution(s)
-
-    ## @var cpuCore
-    # The Object of Logger.Logger type
-
-    ## @var cpuCore
-    # The number of cpu cores in the current machine
-
-    ## MultiProcessing class constructor
-    #   @param self The object pointer
-    #   @param method A dictionary includes the name of algorithm and all the required parameters
-    def __init__(self, method):
-        self.method = method
-        self.cpuCore = int(mpp.cpu_count())
-        if "starting_point" in self.method["parameters"]:
-            self.StartingPoints = self.method["parameters"]["starting_point"]
-        else:
-            self.StartingPoints = None
-        self._core_params = self._get_core_params()
-        self.logger = self.method["parameters"]["log"]
-
-    ## Function to get a list whose n-th element stores a tuple with the number
-    # of iterations to be performed by the n-th cpu core and the seed it should
-    # use for random numbers generation
-    #   @param iteration Total number of iterations to be performed
-    #   @param seed Seed for random number generation
-    #   @param cpuCore Total number of cpu cores
-    #   @param logger Current logger
-    #   @return The list of parameters required by each core (number of
-    #           iterations, seed and logger)
-    def _get_core_params(self):
-        iteration = self.method["parameters"]["max_steps"]
-        Max_time = self.method["parameters"]["max_time"]
-        seed = self.method["parameters"]["seed"]
-        logger = self.method["parameters"]["log"]
-        core_params = []
-        local_itr = int(iteration / self.cpuCore)
-        remainder_itr = iteration % self.cpuCore
-        local_Max_time = Max_time / self.cpuCore
-        if self.StartingPoints:
-            local_StartingPoints = int(len(self.StartingPoints) / self.cpuCore)
-            remainder_StartingPoints = len(self.StartingPoints) % self.cpuCore
-        next_idx = 0
-        for r in range(self.cpuCore):
-            if logger.out_stream != sys.stdout:
-                if self.cpuCore > 1 and logger.verbose > 0:
-                    log_file = ".".join(logger.out_stream.name.split(".")[:-1])
-                    log_file += "_" + str(r) + ".log"
-                else:
-                    log_file = logger.out_stream.name
-            else:
-                log_file = ""
-            r_seed = r * r * self.cpuCore * self.cpuCore * seed
-            if r < remainder_itr:
-                current_local_itr = local_itr + 1
-            else:
-                current_local_itr = local_itr
-
-            if self.StartingPoints:
-                if r < remainder_StartingPoints:
-                    current_local_StartingPoints = local_StartingPoints + 1
-                else:
-                    current_local_StartingPoints = local_StartingPoints
-                starting_points = self.StartingPoints[next_idx: next_idx + current_local_StartingPoints]
-                next_idx = next_idx + current_local_StartingPoints
-                core_params.append((current_local_itr, local_Max_time, r_seed, log_file, starting_points))
-            else:
-                core_params.append((current_local_itr, local_Max_time, r_seed, log_file))
-        return core_params
-
-    ## Method to run the algorithem on a specific core
-    #   @param core_params The core params
-    #   @param S The object of System.system
-    #   @param method The dictionary includes the name and all required parameters of the method
-    #   @return A list of results
-    def run_alg(self, core_params, system_file, method):
-        with open(system_file, "r") as a_file:
-            json_object = json.load(a_file)
-        S = System(system_json=json_object, log=self.method["parameters"]["log"])
-        method["parameters"]["system"] = S
-        method["parameters"]["seed"] = core_params[2]
-        core_logger = method["parameters"]["log"]
-        if core_params[3] != "":
-            log_file = open(core_params[3], "a")
-            core_logger.out_stream = log_file
-            method["parameters"]["log"] = core_logger
-        core_logger.log("Seed: " + str(core_params[2]))
-        core_logger.log("Iteration number: " + str(core_params[0]))
-        if self.StartingPoints:
-            elite_sol = EliteResults(
-                1, 
-                space4ai_logger.Logger(
-                    name="SPACE4AI-D",
-                    out_stream=self.logger.out_stream,
-                    verbose=self.logger.verbose
-                )
-            )
-            elite_sol.elite_results.add(Result())
-            if self.method["name"] in list(
-                    i for i in AlgPool.algorithms if AlgPool.algorithms[i] == AlgPool.algorithms["GA"]):
-                if len(core_params[4]) > 0:
-                    method["parameters"]["initial_state"] = core_params[4]
-                    method["parameters"]["max_steps"] = core_params[0]
-                    method["parameters"]["max_time"] = core_params[1]
-                    algorithm = AlgPool.create(method["name"], **method["parameters"])
-                    result = algorithm.run_algorithm()
-                    elite_sol.add(result[0])
-            else:
-                for initial_state in core_params[4]:
-                    method["parameters"]["initial_state"] = initial_state
-                    method["parameters"]["max_steps"] = int(core_params[0] / len(core_params[4]))
-                    method["parameters"]["max_time"] = core_params[1] / len(core_params[4])
-                    algorithm = AlgPool.create(method["name"], **method["parameters"])
-                    result = algorithm.run_algorithm()
-                    elite_sol.add(result[0])
-            results = elite_sol.elite_results[0], elite_sol
-        else:
-
-            method["parameters"]["max_steps"] = core_params[0]
-            method["parameters"]["max_time"] = core_params[1]
-            algorithm = AlgPool.create(method["name"], **method["parameters"])
-            results = algorithm.run_algorithm()
-
-        return results
-
-    ## Method to run the algorithems in multi-processing manner
-    #   @param json_object The json object of system json file
-    #   @return 1) A boolean to show if the best solution is feasible
-    #           2) A list of k_best solutions
-    #           3) The result of the best solution
-    #           4) The system object
-    def run(self, system_file):
-        #if self.method["name"] == "LS":
-
-         #   results = self.run_alg(self._core_params[1], system_file, self.method)
-          #  pdb.set_trace()
-        solutions = []
-        feasible_found = False
-        elite_sol = []
-        start = time.time()
-        #if __name__ == "__main__":
-        with Pool(processes=self.cpuCore) as pool:
-            partial_gp = functools.partial(self.run_alg, system_file=system_file, method=self.method)
-            full_result = pool.map(partial_gp, self._core_params)
-        print("Multiprocessing ends.")
-            #S = full_result[0][1]
-        first_unfeasible = False
-            # get final list combining the results of all threads
-        for tid in range(self.cpuCore):
-            if feasible_found:
-                if full_result[tid][1].elite_results[0].performance[0]:
-                    elite_sol.merge(full_result[tid][1], True)
-            else:
-                if full_result[tid][1].elite_results[0].performance[0]:
-                    feasible_found = True
-                    elite_sol = EliteResults(full_result[tid][1].K)
-                    elite_sol.elite_results.add(Result())
-                    elite_sol.add(full_result[tid][1].elite_results[0])
-                else:
-                    if not first_unfeasible:
-                        elite_sol = EliteResults(full_result[tid][1].K)
-                        elite_sol.elite_results.add(Result())
-                        elite_sol.add(full_result[tid][1].elite_results[0], feasible_found)
-                        first_unfeasible = True
-                    else:
-                        elite_sol.merge(full_result[tid][1], False)
-            # if len(elite_sol.elite_results)<K:
-            #    K=len(elite_sol.elite_results)
-
-        if feasible_found:
-            for sol in elite_sol.elite_results:
-                if sol.cost < np.inf:
-                    solutions.append(sol.solution)
-        else:
-            for sol in elite_sol.elite_results:
-                if sol.violation_rate < np.inf:
-                    solutions.append(sol.solution)
-
-        return feasible_found, solutions, elite_sol.elite_results[0]
-
-
-######################################################
-
-
 
 
 ## Function to create a directory given its name (if the directory already
@@ -266,6 +73,49 @@ def generate_output_json(Lambda, result, S, onFile = True):
     result.print_result(S, solution_file=output_json)
 
 
+## Function to find the highest feasible Lambda of the optimal placement on
+# a given deployment (possibly run by a worker process)
+#   @param application_dir The application directory
+#   @param dep_name The name of the deployment
+#   @param BS_method The binary search method
+#   @param upper_bound_lambda The maximum Lambda
+#   @param epsilon The gap between highest feasible Lambda and lowest 
+#                  unfeasible Lambda
+#   @param Y_hat The assignment matrix of the optimal placement
+#   @param log_file Name of the log file of the run ("" if the standard 
+#                   output is used)
+#   @param verbose The verbosity level of the logger
+#   @return Tuple storing the name of the deployment, the highest feasible 
+#           Lambda and the binding constraint
+def find_max_lambda(application_dir, dep_name, BS_method, upper_bound_lambda, 
+                    epsilon, Y_hat, log_file, verbose):
+    # the log file of the run is opened again by the worker process
+    if log_file != "":
+        out_stream = open(log_file, "a")
+    else:
+        out_stream = sys.stdout
+    parser_json_alt_generator = space4ai_parser.ParserYamlToJson(
+        application_dir, "s4aid", 
+        alternative_deployment=dep_name,
+        log=space4ai_logger.Logger(
+            name="S4AIParser",
+            out_stream=out_stream,
+            verbose=verbose
+        )
+    )
+    system_file = parser_json_alt_generator.make_system_file()
+    parameters = dict(BS_method["parameters"])
+    parameters["system"] = System(system_file=system_file)
+    parameters["system_file"] = system_file
+    algorithm = AlgPool.create(BS_method["name"], **parameters)
+    result, highest_feasible_lambda = algorithm.run_algorithm(upper_bound_lambda, epsilon, Y_hat=Y_hat)
+    output_json_max_lambda = application_dir + "/space4ai-r/Output_max_Lambda_" + dep_name + ".json"
+    result.print_result(algorithm.system, output_json_max_lambda)
+    if out_stream != sys.stdout:
+        out_stream.close()
+    return dep_name, highest_feasible_lambda, algorithm.binding_constraint
+
+
 def main(application_dir):
     logger = space4ai_logger.Logger(name="SPACE4AI-D")
     parser_json_generator = space4ai_parser.ParserYamlToJson(
@@ -291,6 +141,14 @@ def main(application_dir):
     else:
         logger.err("{} does not exist.".format("VerboseLevel"))
         sys.exit(1)
+    # check how the work and the time budget of each run should be shared 
+    # among the cpu cores (see MultiProcessing.MultiProcessing)
+    scheduling = "dynamic"
+    if "Scheduling" in input_json.keys():
+        scheduling = input_json["Scheduling"]
+    time_budget = "deadline"
+    if "TimeBudget" in input_json.keys():
+        time_budget = input_json["TimeBudget"]
     if "Methods" in input_json.keys():
         Methods = input_json["Methods"]
         RG_list = list(i for i in AlgPool.algorithms if AlgPool.algorithms[i] == AlgPool.algorithms["RG"])
@@ -338,6 +196,16 @@ def main(application_dir):
         else:
             logger.err("epsilon is mandatory parameter for BS")
             sys.exit(1)
+        # check if the maximum Lambda should be computed through the 
+        # capacity analysis of the solution
+        analytic = True
+        if "analytic" in BS:
+            analytic = BS["analytic"]
+        # get the number of deployments to be analyzed in parallel (if 
+        # None, all the cores of the current machine are used)
+        workers = None
+        if "workers" in BS:
+            workers = BS["workers"]
     else:
         logger.err("Binary Search is a mandatory method and the name can be one of this list: {}.".format(BS_list))
         sys.exit(1)
@@ -371,6 +239,12 @@ def main(application_dir):
             else:
                 logger.err(" startingPointNumber should be specified")
                 sys.exit(1)
+            # number and kind of the workers exploring the neighborhood of each 
+            # solution (optional)
+            if "neighborhoodWorkers" in Heu:
+                Heu_method["parameters"]["neighborhood_workers"] = Heu["neighborhoodWorkers"]
+            if "neighborhoodExecutor" in Heu:
+                Heu_method["parameters"]["neighborhood_executor"] = Heu["neighborhoodExecutor"]
 #################### Special parameters #######################################
         ############ LS parameters #####################
             if Heu_method["name"] in list(i for i in AlgPool.algorithms if AlgPool.algorithms[i] == AlgPool.algorithms["LS"]):
@@ -442,23 +316,24 @@ def main(application_dir):
     #system_file = create_pure_json(system_file)
     with open(system_file, "r") as a_file:
         json_object = json.load(a_file)
+    # initialize the system shared by all workers
+    S = System(system_json=json_object, log=logger)
 
-    MP = MultiProcessing(RG_method)
-    feasible_found, solutions, result = MP.run(system_file)
+    MP = MultiProcessing(RG_method, scheduling, time_budget)
+    feasible_found, solutions, result = MP.run(system_file, S)
     #feasibility, starting_points, result, S = Random_Greedy_run(json_object, method1)
     if not feasible_found:
         logger.err("No feasible solution is found by RG")
     else:
         if Heu_method != {}:
             Heu_method["parameters"]["starting_point"] = solutions
-            MP = MultiProcessing(Heu_method)
-            feasible_found, solutions, result = MP.run(system_file)
+            MP = MultiProcessing(Heu_method, scheduling, time_budget)
+            feasible_found, solutions, result = MP.run(system_file, S)
     output_json=application_dir+"/space4ai-d/Output.json"
     if result.solution is None:
         logger.log("No solution is found.")
     else:
         Y_hat = result.solution.Y_hat
-        S = System(system_json=json_object, log=logger)
         result.print_result(S, output_json)
         parser_yaml_generator = space4ai_parser.ParserJsonToYaml(
             application_dir, "s4aid", log = space4ai_logger.Logger(
@@ -482,24 +357,26 @@ def main(application_dir):
             dep_list=parser_json_generator.get_alternative_list(application_dir)
         else:
             dep_list = ["original_deployment"]
-        for dep_name in dep_list:
-
-            parser_json_alt_generator = space4ai_parser.ParserYamlToJson(
-                application_dir, "s4aid", 
-                alternative_deployment=dep_name,
-                log=space4ai_logger.Logger(
-                    name="S4AIParser",
-                    out_stream=logger.out_stream,
-                    verbose=logger.verbose
-                )
-            )
-            system_file = parser_json_alt_generator.make_system_file()
-            BS_method["parameters"]["system"] = System(system_file=system_file)
-            BS_method["parameters"]["system_file"] = system_file
-            algorithm = AlgPool.create(BS_method["name"], **BS_method["parameters"])
-            result, highest_feasible_lambda = algorithm.run_algorithm(upper_bound_lambda, epsilon, Y_hat=Y_hat)
-            output_json_max_lambda = application_dir + "/space4ai-r/Output_max_Lambda_" + dep_name + ".json"
-            result.print_result(algorithm.system, output_json_max_lambda)
+        BS_method["parameters"]["analytic"] = analytic
+        # the deployments are independent, thus they are analyzed by a pool 
+        # of worker processes and the results are collected as soon as they 
+        # are available
+        if workers is None:
+            workers = int(mpp.cpu_count())
+        workers = max(min(int(workers), len(dep_list)), 1)
+        log_file = ""
+        if logger.out_stream != sys.stdout:
+            log_file = logger.out_stream.name
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=_get_context()) as executor:
+            jobs = [executor.submit(find_max_lambda, application_dir, dep_name,
+                                    BS_method, upper_bound_lambda, epsilon,
+                                    Y_hat, log_file, logger.verbose) \
+                    for dep_name in dep_list]
+            for job in as_completed(jobs):
+                dep_name, highest_feasible_lambda, binding_constraint = job.result()
+                logger.log("Maximum Lambda for {}: {} (binding constraint: {} {})".format(
+                    dep_name, highest_feasible_lambda, *binding_constraint))
 
         ################### find highest Lambda #######################
 
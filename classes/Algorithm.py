@@ -2,6 +2,7 @@ from external import space4ai_logger
 
 from abc import ABC, abstractmethod
 from classes.Solution import Configuration, Result, EliteResults
+from classes.EvaluationCache import EvaluationCache
 import numpy as np
 import copy
 import sys
@@ -51,9 +52,13 @@ class RandomGreedy(BaseAlgorithm):
     #   @param max_steps Maximum iterations needed to run the algorithm
     #   @param k_best The number of top best solutions that the algorithm must returns
     #   @param log Object of Logger.Logger type
+    #   @param deadline Absolute time (as returned by time.time) when the 
+    #                   algorithm must stop, shared by the runs performed in 
+    #                   parallel (default: None)
     def __init__(
             self, system, seed, max_time=1, max_steps=1, k_best=1, 
-            log=space4ai_logger.Logger(name="SPACE4AI-D-RandomGreedy")
+            log=space4ai_logger.Logger(name="SPACE4AI-D-RandomGreedy"),
+            deadline=None
         ):
         super().__init__("RandomGreedy")
         self.system = system
@@ -62,6 +67,8 @@ class RandomGreedy(BaseAlgorithm):
         self.max_iterations = max_steps
         self.k_best = k_best
         self.logger = log
+        self.evaluation_cache = EvaluationCache()
+        self.deadline = deadline
         np.random.seed(seed)
 
 
@@ -342,7 +349,7 @@ class RandomGreedy(BaseAlgorithm):
             self.logger.log("Random solution is generated")
             result.solution = Configuration(y_hat, self.logger)
             self.logger.log("Start check feasibility: {}".format(time.time()))
-            performance = result.check_feasibility(self.system)
+            performance = result.check_feasibility(self.system, cache=self.evaluation_cache)
             self.logger.log("End check feasibility: {}".format(time.time()))
 
             # if the solution is feasible, compute the corresponding cost
@@ -351,15 +358,16 @@ class RandomGreedy(BaseAlgorithm):
                 self.logger.log("Solution is feasible")
                 # compute cost
                 self.logger.log("Compute cost", 3)
-                result.objective_function(self.system)
+                result.objective_function(self.system, self.evaluation_cache)
                 # update the cluster size of cloud resources
                 self.logger.log("Update cluster size", 3)
                 new_result = copy.deepcopy(result)
                 for j in range(self.system.FaaS_start_index):
-                    new_result.reduce_cluster_size(j,self.system)
+                    new_result.reduce_cluster_size(j, self.system,
+                                                   self.evaluation_cache)
                 # compute the updated cost
                 self.logger.log("Compute new cost", 3)
-                new_result.objective_function(self.system)
+                new_result.objective_function(self.system, self.evaluation_cache)
                 # update the list of VM numbers according to the new solution
                 y_bar = new_result.solution.get_y_bar()
                 for j in range(self.system.FaaS_start_index):
@@ -395,7 +403,10 @@ class RandomGreedy(BaseAlgorithm):
         iteration = 0
         start = time.time()
         lowest_violation = np.inf
-        while iteration < self.max_iterations or time.time() - start < self.max_time:
+        # at least one iteration is performed, even if the deadline is
+        # already expired
+        while (iteration < self.max_iterations or time.time() - start < self.max_time) and \
+                (iteration == 0 or self.deadline is None or time.time() < self.deadline):
             self.logger.log("Iteration {} --> time: {}, seed: {}".format(iteration, time.time(), self.seed))
             # perform a step
             result, new_result, random_param = self.step()
@@ -422,5 +433,7 @@ class RandomGreedy(BaseAlgorithm):
 
         random_params = [res_parts_random_list, VM_numbers_random_list,
                          CL_res_random_list]
+        self.logger.log(str(self.evaluation_cache), 3)
+        self.logger.log(str(self.system.compiled.pipeline), 3)
 
         return best_result_no_update, elite, random_params
@@ -0,0 +1,186 @@
+import hashlib
+import numpy as np
+
+
+## Assignment
+#
+# Class used to represent in a compact way the assignment of the
+# Graph.Component.Partition objects to the Resources.Resource objects.
+# Since each partition runs on (at most) one resource type, the assignment
+# is stored as two flat arrays providing, for each partition (sorted by
+# component), the index of the resource (-1 if the partition is not used)
+# and the number of resources. The list of 2D numpy arrays used by
+# Solution.Configuration (Y_hat) is built only when required
+class Assignment:
+
+    __slots__ = ("shapes", "offsets", "resource", "number")
+
+    ## @var shapes
+    # Tuple storing the shape (number of partitions, number of resources)
+    # of the assignment matrix of each Graph.Component
+
+    ## @var offsets
+    # 1D numpy array storing the index of the first partition of each
+    # Graph.Component (with the total number of partitions as last element)
+
+    ## @var resource
+    # 1D numpy array storing the index of the resource assigned to each
+    # partition (-1 if the partition is not used)
+
+    ## @var number
+    # 1D numpy array storing the number of resources assigned to each
+    # partition
+
+    ## Assignment class constructor
+    #   @param self The object pointer
+    #   @param shapes Tuple storing the shape of the assignment matrix of
+    #                 each Graph.Component
+    #   @param resource 1D numpy array storing the index of the resource
+    #                   assigned to each partition
+    #   @param number 1D numpy array storing the number of resources
+    #                 assigned to each partition
+    def __init__(self, shapes, resource, number):
+        self.shapes = shapes
+        self.offsets = np.cumsum([0] + [H for H, _ in shapes])
+        self.resource = resource
+        self.number = number
+
+    ## Method to build the compact representation of a list of 2D numpy
+    # arrays storing the number of resources assigned to each partition
+    #   @param Y_hat List of 2D numpy arrays storing the number of
+    #                Resources.Resource assigned to each
+    #                Graph.Component.Partition
+    #   @return An Assignment object (None if some partition is assigned
+    #           to more than one resource type)
+    @staticmethod
+    def from_Y_hat(Y_hat):
+        shapes = tuple(y.shape for y in Y_hat)
+        Y = np.concatenate(Y_hat)
+        J = Y.shape[1]
+        rows, cols = np.nonzero(Y)
+        if len(rows) != len(np.unique(rows)) or (Y < 0).any():
+            return None
+        dtype = np.int16 if J < np.iinfo(np.int16).max else np.int32
+        resource = np.full(len(Y), -1, dtype=dtype)
+        number = np.zeros(len(Y), dtype=np.int32)
+        resource[rows] = cols
+        number[rows] = Y[rows, cols]
+        return Assignment(shapes, resource, number)
+
+    ## Method to build the list of 2D numpy arrays storing the number of
+    # resources assigned to each partition
+    #   @param self The object pointer
+    #   @return List of 2D numpy arrays
+    def to_Y_hat(self):
+        Y_hat = []
+        for i, (H, J) in enumerate(self.shapes):
+            y = np.full((H, J), 0, dtype=int)
+            resource = self.resource[self.offsets[i]:self.offsets[i + 1]]
+            number = self.number[self.offsets[i]:self.offsets[i + 1]]
+            used = resource >= 0
+            y[np.nonzero(used)[0], resource[used]] = number[used]
+            Y_hat.append(y)
+        return Y_hat
+
+    ## Method to copy the object
+    #   @param self The object pointer
+    #   @return A new Assignment object
+    def copy(self):
+        return Assignment(self.shapes, self.resource.copy(),
+                          self.number.copy())
+
+    ## Method to get the list of assignments
+    #   @param self The object pointer
+    #   @return 1D numpy arrays storing, for each assignment (sorted by
+    #           component and partition), the partition index, the resource
+    #           index and the number of resources
+    def entries(self):
+        rows = np.nonzero(self.resource >= 0)[0]
+        return rows, self.resource[rows].astype(int), \
+            self.number[rows].astype(int)
+
+    ## Method to get the resource assigned to a partition
+    #   @param self The object pointer
+    #   @param i Index of the Graph.Component
+    #   @param h Index of the Graph.Component.Partition
+    #   @return Tuple storing the resource index (-1 if the partition is
+    #           not used) and the number of resources
+    def get(self, i, h):
+        p = self.offsets[i] + h
+        return int(self.resource[p]), int(self.number[p])
+
+    ## Method to assign a partition to a resource
+    #   @param self The object pointer
+    #   @param i Index of the Graph.Component
+    #   @param h Index of the Graph.Component.Partition
+    #   @param j Index of the Resources.Resource
+    #   @param n Number of resources (if 0, the partition is not used)
+    def set(self, i, h, j, n):
+        p = self.offsets[i] + h
+        self.resource[p] = j if n > 0 else -1
+        self.number[p] = n
+
+    ## Method to apply a list of moves to the assignment (in place)
+    #   @param self The object pointer
+    #   @param moves List of tuples (component index, partition index,
+    #                source resource index, destination resource index,
+    #                number of resources), each of them meaning that the
+    #                partition is removed from the source resource and
+    #                assigned to the given number of destination resources
+    #   @return True if the moves were applied, False if the result cannot
+    #           be represented in compact form (the assignment is then left
+    #           in an undefined state)
+    def apply(self, moves):
+        for i, h, source, destination, number in moves:
+            p = self.offsets[i] + h
+            if self.resource[p] not in (-1, source, destination):
+                return False
+            if number > 0:
+                self.resource[p] = destination
+            elif self.resource[p] in (source, destination):
+                self.resource[p] = -1
+            self.number[p] = number if self.resource[p] >= 0 else 0
+        return True
+
+    ## Method to build an assignment whose first components are taken from
+    # the current one and the remaining ones from another assignment
+    #   @param self The object pointer
+    #   @param other The other Assignment object
+    #   @param i Index of the first Graph.Component taken from other
+    #   @return A new Assignment object
+    def splice(self, other, i):
+        p = self.offsets[i]
+        resource = np.concatenate((self.resource[:p], other.resource[p:]))
+        number = np.concatenate((self.number[:p], other.number[p:]))
+        return Assignment(self.shapes[:i] + other.shapes[i:], resource,
+                          number)
+
+    ## Method to get the maximum number of used resources of each type
+    #   @param self The object pointer
+    #   @return 1D numpy array whose j-th element denotes the maximum number
+    #           of used resources of type j
+    def get_y_bar(self):
+        J = max([0] + [J for _, J in self.shapes])
+        y_bar = np.zeros(J, dtype=int)
+        used = self.resource >= 0
+        np.maximum.at(y_bar, self.resource[used], self.number[used])
+        return y_bar
+
+    ## Method to compute a 128-bit fingerprint of the assignment
+    #   @param self The object pointer
+    #   @return The fingerprint (bytes)
+    def get_fingerprint(self):
+        fingerprint = hashlib.blake2b(digest_size=16)
+        fingerprint.update(np.array(self.shapes, dtype=np.int64).tobytes())
+        fingerprint.update(self.resource.astype(np.int64).tobytes())
+        fingerprint.update(self.number.astype(np.int64).tobytes())
+        return fingerprint.digest()
+
+    ## Equality operator
+    #   @param self The object pointer
+    #   @param other The rhs of the comparison
+    #   @return True if the two Assignment objects are equal
+    def __eq__(self, other):
+        return self.shapes == other.shapes and \
+            np.array_equal(self.resource, other.resource) and \
+            np.array_equal(self.number, other.number)
@@ -5,12 +5,40 @@ from abc import abstractmethod
 import numpy as np
 import copy
 from classes.Solution import Configuration, Result
-from classes.PerformanceEvaluators import ServerFarmPE, EdgePE
+from classes.EvaluationCache import EvaluationCache
+from classes.Move import Move
+import concurrent.futures
+import multiprocessing
 import sys
 import math
 import time
 
 
+## BaseHeuristics object used by the current process when it is a worker of
+# the process executor exploring the neighborhood of the solutions
+_worker_heuristics = None
+
+
+## Function to initialize the workers of the process executor, which inherit
+# (through fork) the BaseHeuristics object, together with its System.System
+#   @param heuristics A BaseHeuristics object
+def _init_neighborhood_worker(heuristics):
+    global _worker_heuristics
+    heuristics.neighborhood_workers = 0
+    heuristics.executor = None
+    _worker_heuristics = heuristics
+
+
+## Function to run a move operator in a worker of the process executor
+#   @param operator Name of the BaseHeuristics method implementing the move
+#                   operator
+#   @param *args Arguments of the move operator
+#   @return The list of neighbors and the number of objective function
+#           evaluations
+def _run_neighborhood_operator(operator, *args):
+    return getattr(_worker_heuristics, operator)(*args)
+
+
 ## Heuristics
 #
 # Abstract class used to represent heuristic methods
@@ -25,16 +53,53 @@ class BaseHeuristics(BaseAlgorithm):
     ## @var verbose
     # Boolean flag to represent if the verbose is needed for logging messages of heuristics
 
+    ## @var evaluation_cache
+    # Object of EvaluationCache.EvaluationCache type, storing the results of
+    # the configurations evaluated during the search
+
+    ## @var neighborhood_workers
+    # Number of workers running concurrently the move operators when 
+    # exploring the neighborhood of a solution (0 if they are run 
+    # sequentially)
+
+    ## @var neighborhood_executor
+    # Kind of workers running the move operators ("thread" or "process")
+
+    ## @var executor
+    # concurrent.futures.Executor object running the move operators (None 
+    # if not started yet)
+
+    ## @var deadline
+    # Absolute time (as returned by time.time) when the search must stop, 
+    # shared by the searches running in parallel (None if not set)
+
     ## BaseHeuristics class constructor
     #   @param self The object pointer
     #   @param system A System.System object
     #   @param keyword Keyword identifying the heuristic methods
     #   @param log Object of Logger.Logger type
+    #   @param neighborhood_workers Number of workers exploring the 
+    #                               neighborhood (default: 0, i.e., 
+    #                               sequential exploration)
+    #   @param neighborhood_executor Kind of workers exploring the 
+    #                                neighborhood, "thread" or "process" 
+    #                                (default: "thread"); process workers 
+    #                                can only be started by non-daemonic 
+    #                                callers, such as the workers of 
+    #                                MultiProcessing.MultiProcessing 
+    #                                (otherwise threads are used, see 
+    #                                BaseHeuristics.get_executor), and they 
+    #                                only pay off when the evaluation of the 
+    #                                neighbors is expensive (e.g., with ML 
+    #                                performance models)
+    #   @param deadline Absolute time when the search must stop (default: 
+    #                   None)
     #   @param **kwargs Additional keyword
     def __init__(
             self, system, keyword, 
             log=space4ai_logger.Logger(name="SPACE4AI-D-BaseHeuristics"), 
-            **kwargs
+            neighborhood_workers=0, neighborhood_executor="thread",
+            deadline=None, **kwargs
         ):
         super().__init__(keyword)
         self.system = system
@@ -42,6 +107,17 @@ class BaseHeuristics(BaseAlgorithm):
         self.model = self.find_model_to_sort_res()
         self.verbose = True
         self.counter_obj_evaluation = 0
+        self.evaluation_cache = EvaluationCache()
+        if neighborhood_executor not in ["thread", "process"]:
+            self.logger.err(
+                "Unknown neighborhood executor {} (it can be 'thread' or 'process')".\
+                    format(neighborhood_executor)
+            )
+            sys.exit(1)
+        self.neighborhood_workers = neighborhood_workers
+        self.neighborhood_executor = neighborhood_executor
+        self.executor = None
+        self.deadline = deadline
 
 
     ## Method to find the performance model of whole system
@@ -136,12 +212,12 @@ class BaseHeuristics(BaseAlgorithm):
         result = Result(self.logger)
         result.solution = Configuration(Y_hat, self.logger)
         self.logger.log("Start check feasibility: {}".format(time.time()))
-        performance = result.check_feasibility(self.system)
+        performance = result.check_feasibility(self.system, cache=self.evaluation_cache)
         self.logger.log("End check feasibility: {}".format(time.time()))
         if performance[0]:
             self.logger.log("Solution is feasible", 3)
             self.logger.log("Compute cost", 3)
-            result.objective_function(self.system)
+            result.objective_function(self.system, self.evaluation_cache)
 
         return result
 
@@ -198,6 +274,8 @@ class BaseHeuristics(BaseAlgorithm):
         counter_obj_evaluation = 0
         # call the method to get all partitions located in FaaS
         partitions_with_FaaS = self.get_partitions_with_FaaS(solution.Y_hat)
+        # get the assignment shared by all neighbors
+        base = Move.get_base(solution)
         # loop over list of partitions in partitions_with_FaaS list
         for comp_part_j in partitions_with_FaaS:
             # get all the alternative resources of the partition
@@ -206,20 +284,16 @@ class BaseHeuristics(BaseAlgorithm):
             Faas_res_idx = filter(lambda x: x >= self.system.FaaS_start_index, res_idx)
             # loop over alternative FaaS resources
             for j in Faas_res_idx:
-                # get a copy of current solution as a new temprary assignment matrix (Y_hat)
-                new_temp_Y_hat = copy.deepcopy(solution.Y_hat)
-                # assign the current partition to the new alternative FaaS in new Y_hat
-                new_temp_Y_hat[comp_part_j[0]][comp_part_j[1]][j] = 1
-                new_temp_Y_hat[comp_part_j[0]][comp_part_j[1]][comp_part_j[2]] = 0
-                # create a solution by new Y_hat
-                new_temp_solution = Configuration(new_temp_Y_hat, self.logger)
+                # assign the current partition to the new alternative FaaS
+                move = Move(base, [(comp_part_j[0], comp_part_j[1], comp_part_j[2], j, 1)],
+                            solution, self.logger)
                 # check the feasibility of new solution
-                performance = new_temp_solution.check_feasibility(self.system)
+                performance = move.check_feasibility(self.system, self.evaluation_cache)
                 # if the new solution is feasible, add it to the neighbor result list
                 if performance[0]:
                     result = Result(self.logger)
-                    result.solution = new_temp_solution
-                    result.cost = result.objective_function(self.system)
+                    result.solution = move.get_configuration()
+                    result.cost = result.objective_function(self.system, self.evaluation_cache)
                     counter_obj_evaluation += 1
                     result.performance = performance
                     new_feasible_results.append(result)
@@ -259,30 +333,23 @@ class BaseHeuristics(BaseAlgorithm):
 
     ## Method to sort all nodes increasingly except FaaS by utilization and cost
     #   @param self The object pointer
-    #   @param Y_hat Assignment matrix includes all components and partitions assigned to resources
+    #   @param solution Current solution
     #   @return 1) The sorted list of resources by utilization and cost, respectively.
     #           Each item of list includes the index, utilization and cost of the resource.
     #           The list is sorted by utilization, but for the nodes with same utilization, it is sorted by cost
     #           2) The sorted list of resources by cost and utilization, respectively.
     #           Each item of list includes the index, utilization and cost of the resource.
     #           The list is sorted by utilization, but for the nodes with same utilization, it is sorted by cost
-    def sort_nodes(self, Y_hat):
+    def sort_nodes(self, solution):
 
         # min_utilization=np.inf
         idx_min_U_node = []
+        # get the utilization of all resources
+        U = solution.get_utilization(self.system)
         # loop over all alternative resources
-        edge = EdgePE()
-        cloud = ServerFarmPE()
-        for j in range(self.system.cloud_start_index):
-            # compute the utilization of current node
-            utilization = edge.compute_utilization(j, Y_hat, self.system)
-            if not math.isnan(utilization) and utilization > 0:
-                # add the information of node to the list includes node index, utilization and cost
-                idx_min_U_node.append((j, utilization, self.system.resources[j].cost))
-
-        for j in range(self.system.cloud_start_index, self.system.FaaS_start_index):
-            # compute the utilization of current node
-            utilization = cloud.compute_utilization(j, Y_hat, self.system)
+        for j in range(self.system.FaaS_start_index):
+            # get the utilization of current node
+            utilization = float(U[j])
             if not math.isnan(utilization) and utilization > 0:
                 # add the information of node to the list includes node index, utilization and cost
                 idx_min_U_node.append((j, utilization, self.system.resources[j].cost))
@@ -309,25 +376,41 @@ class BaseHeuristics(BaseAlgorithm):
         #return random.sample(idx_min_U_node, k=len(idx_min_U_node))
         np.random.shuffle(idx_min_U_node)
         return idx_min_U_node
+
+    ## Method to get the list of nodes (except FaaS) explored by the move
+    # operators, sorted according to the performance model of the system
+    #   @param self The object pointer
+    #   @param solution Current solution
+    #   @param sorting_method indicate the sorting order of nodes.
+    #           If sorting_method=0, the list of nodes are sorted by utilization and cost respectively
+    #           otherwise the list of nodes are sorted by cost and utilization respectively.
+    #   @return The sorted list of nodes, as returned by sort_nodes (or 
+    #           shuffle_nodes if the system is based on ML models)
+    def get_sorted_nodes(self, solution, sorting_method=0):
+        if self.model == "QT":
+            # get a sorted list of nodes' index with their utilization and cost (except FaaS)
+            if sorting_method == 0:
+                return self.sort_nodes(solution)[0]
+            return self.sort_nodes(solution)[1]
+        # if the model is not based on M/G/1 queue, sort the resources randomly
+        return self.shuffle_nodes()
+
     ## Method to change the current solution by changing component placement
     #   @param self The object pointer
     #   @param solution Current solution
     #   @param sorting_method indicate the sorting order of nodes.
     #           If sorting_method=0, the list of nodes are sorted by utilization and cost respectively
     #           otherwise the list of nodes are sorted by cost and utilization respectively.
+    #   @param nodes_sorted_list List of nodes sorted as returned by
+    #                            get_sorted_nodes (default: None, i.e.,
+    #                            computed by the method)
     #   @return A list neigbors (new solutions) sorted by cost
-    def change_component_placement(self, solution, sorting_method=0):
+    def change_component_placement(self, solution, sorting_method=0, nodes_sorted_list=None):
         counter_obj_evaluation = 0
         neighbors = []
         new_sorted_results = None
-        if self.model == "QT":
-            # get a sorted list of nodes' index with their utilization and cost (except FaaS)
-            if sorting_method == 0:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[0]
-            else:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[1]
-        else:
-            nodes_sorted_list = self.shuffle_nodes()
+        if nodes_sorted_list is None:
+            nodes_sorted_list = self.get_sorted_nodes(solution, sorting_method)
         # get resource with maximum utilization as source node
         # first while loop is used for the case that if we cannot find any neighbors by starting with last node of the sorted list as a source node,
         # we try to search to find neigbors by starting from second last node in the list and etc. Continue untile finding neigbors
@@ -341,6 +424,9 @@ class BaseHeuristics(BaseAlgorithm):
             partitions = self.get_partitions_with_j(solution.Y_hat, idx_source_node)
             # get the list of nodes and computational layers in used
             active_res_idxs, active_camputationallayers = self.get_active_res_computationallayers(solution.Y_hat)
+            # get the assignment shared by all neighbors
+            base = Move.get_base(solution)
+            candidates = []
             # loop over partitions
             for part in partitions:
                 # get all alternative resources of the partitions
@@ -363,41 +449,46 @@ class BaseHeuristics(BaseAlgorithm):
                             self.system.resources[des_node_idx].CLname not in active_camputationallayers:
                         if des_node_idx in alternative_res_idxs:
 
-                            # get a copy of current solution as a new temprary assignment matrix (Y_hat)
-                            new_temp_Y_hat = copy.deepcopy(solution.Y_hat)
                             # get all partitions running on the destination node
                             partitions_min_U = self.get_partitions_with_j(solution.Y_hat, des_node_idx)
-                            # assign the current partition to the new alternative node in new Y_hat with maximume number of its instances
-                            new_temp_Y_hat[part[0]][part[1]][idx_source_node] = 0
-                            new_temp_Y_hat[part[0]][part[1]][des_node_idx] = self.system.resources[
-                                des_node_idx].number
+                            # assign the current partition to the new alternative node with maximume number of its instances
+                            move = Move(base, [(part[0], part[1], idx_source_node, des_node_idx,
+                                                self.system.resources[des_node_idx].number)],
+                                        solution, self.logger)
 
                             if len(partitions_min_U) > 0:
                                 # assign the maximume instance number of destination node to the partitions that are running on destination node
                                 for part_min in partitions_min_U:
-                                    new_temp_Y_hat[part_min[0]][part_min[1]][des_node_idx] = self.system.resources[
-                                        des_node_idx].number
-                            # creat a solution by new assignment (Y_hat)
-                            new_temp_solution = Configuration(new_temp_Y_hat, self.logger)
-                            # check if new solution is feasible
-                            performance = new_temp_solution.check_feasibility(self.system)
-                            if performance[0]:
-                                # creat new result
-                                result = Result(self.logger)
-                                result.solution = new_temp_solution
-                                # reduce cluster size of source and destination nodes
-                                result.reduce_cluster_size(idx_source_node, self.system)
-                                result.reduce_cluster_size(des_node_idx, self.system)
-                                # compute the cost
-                                result.objective_function(self.system)
-                                counter_obj_evaluation += 1
-                                #result.performance = performance
-                                # add new result in neigbor list
-                                neighbors.append(result)
+                                    move.add(part_min[0], part_min[1], des_node_idx, des_node_idx,
+                                             self.system.resources[des_node_idx].number)
+                            candidates.append((move, des_node_idx))
 
                     i += 1
                 # if not find:
                 #      print("There is no alternative node for partition "+str(part[1]) +" of component "+ str(part[0])+" in current solution." )
+            # predict in a single batch the response times required by the candidates
+            self.system.compiled.prefetch_predictions(
+                [c[0].get_configuration().get_assignment_data() for c in candidates]
+            )
+            # loop over candidate solutions
+            for move, des_node_idx in candidates:
+                # check if new solution is feasible
+                performance = move.check_feasibility(self.system, self.evaluation_cache)
+                if performance[0]:
+                    # creat new result
+                    result = Result(self.logger)
+                    result.solution = move.get_configuration()
+                    # reduce cluster size of source and destination nodes
+                    result.reduce_cluster_size(idx_source_node, self.system,
+                                               self.evaluation_cache)
+                    result.reduce_cluster_size(des_node_idx, self.system,
+                                               self.evaluation_cache)
+                    # compute the cost
+                    result.objective_function(self.system, self.evaluation_cache)
+                    counter_obj_evaluation += 1
+                    #result.performance = performance
+                    # add new result in neigbor list
+                    neighbors.append(result)
             # if some neighbors are founded, sort them by cost and return the list
             if len(neighbors) > 0:
                 new_sorted_results = sorted(neighbors, key=lambda x: x.cost)
@@ -418,21 +509,17 @@ class BaseHeuristics(BaseAlgorithm):
     #   @param sorting_method indicate the sorting order of nodes.
     #           If sorting_method=0, the list of nodes are sorted by utilization and cost respectively
     #           otherwise the list of nodes are sorted by cost and utilization respectively.
+    #   @param nodes_sorted_list List of nodes sorted as returned by
+    #                            get_sorted_nodes (default: None, i.e.,
+    #                            computed by the method)
     #   @return A list neigbors (new solutions) sorted by cost
-    def change_resource_type(self, solution, sorting_method=0):
+    def change_resource_type(self, solution, sorting_method=0, nodes_sorted_list=None):
 
         counter_obj_evaluation = 0
         neighbors = []
         new_sorted_results = None
-        if self.model == "QT":
-            # get a sorted list of nodes' index with their utilization and cost (except FaaS)
-            if sorting_method == 0:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[0]
-            else:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[1]
-        else:
-            # if the model is not based on M/G/1 queue, sort the resources randomly
-            nodes_sorted_list = self.shuffle_nodes()
+        if nodes_sorted_list is None:
+            nodes_sorted_list = self.get_sorted_nodes(solution, sorting_method)
         i = 1
         while len(neighbors) < 1 and i <= len(nodes_sorted_list):
             # get resource with maximum utilization/cost as source node
@@ -456,6 +543,9 @@ class BaseHeuristics(BaseAlgorithm):
                 # get the list of nodes and computational layers in used
                 active_res_idxs, active_camputationallayers = self.get_active_res_computationallayers(
                     solution.Y_hat)
+                # get the assignment shared by all neighbors
+                base = Move.get_base(solution)
+                candidates = []
                 # for each candidate nodes, move all partitions on it and create new solution
                 for des in candidate_nodes:
                     # Check some conditions to avoid violating the limitation of our problem that says:
@@ -466,34 +556,41 @@ class BaseHeuristics(BaseAlgorithm):
                     if des in active_res_idxs or \
                             self.system.resources[des].CLname not in active_camputationallayers or \
                             self.system.resources[des].CLname == self.system.resources[idx_source_node].CLname:
-                        new_temp_Y_hat = copy.deepcopy(solution.Y_hat)
                         # get all partitions running on the destination node
                         partitions_on_candidate = self.get_partitions_with_j(solution.Y_hat, des)
                         # assign the maximume instance number of destination node to the partitions that are running on source node
+                        move = Move(base, parent=solution, log=self.logger)
                         for part in partitions:
-                            new_temp_Y_hat[part[0]][part[1]][idx_source_node] = 0
-                            new_temp_Y_hat[part[0]][part[1]][des] = self.system.resources[des].number
+                            move.add(part[0], part[1], idx_source_node, des,
+                                     self.system.resources[des].number)
                         if len(partitions_on_candidate) > 0:
                             # assign the maximume instance number of destination node to the partitions that are running on destination node
                             for part_cand in partitions_on_candidate:
-                                new_temp_Y_hat[part[0]][part[1]][des] = self.system.resources[des].number
-                        # create new solution by new assignment
-                        new_temp_solution = Configuration(new_temp_Y_hat, self.logger)
-                        # check feasibility
-
-                        performance = new_temp_solution.check_feasibility(self.system)
-
-                        if performance[0]:
-                            # create a new result
-                            result = Result(self.logger)
-                            result.solution = new_temp_solution
-                            # reduce the cluster size of destination node
-                            result.reduce_cluster_size(des, self.system)
-                            result.objective_function(self.system)
-                            counter_obj_evaluation += 1
-                            #new_result.performance = performance
-                            # add the new result to the neigbor list
-                            neighbors.append(result)
+                                move.add(part[0], part[1], des, des,
+                                         self.system.resources[des].number)
+                        candidates.append((move, des))
+
+                # predict in a single batch the response times required by the candidates
+                self.system.compiled.prefetch_predictions(
+                    [c[0].get_configuration().get_assignment_data() for c in candidates]
+                )
+                # loop over candidate solutions
+                for move, des in candidates:
+                    # check feasibility
+                    performance = move.check_feasibility(self.system, self.evaluation_cache)
+
+                    if performance[0]:
+                        # create a new result
+                        result = Result(self.logger)
+                        result.solution = move.get_configuration()
+                        # reduce the cluster size of destination node
+                        result.reduce_cluster_size(des, self.system,
+                                                   self.evaluation_cache)
+                        result.objective_function(self.system, self.evaluation_cache)
+                        counter_obj_evaluation += 1
+                        #new_result.performance = performance
+                        # add the new result to the neigbor list
+                        neighbors.append(result)
 
                 if len(neighbors) > 0:
                     # sort neighbor list by cost and return the best one
@@ -515,20 +612,16 @@ class BaseHeuristics(BaseAlgorithm):
     #   @param sorting_method indicate the sorting order of nodes.
     #           If sorting_method=0, the list of nodes are sorted by utilization and cost respectively
     #           otherwise the list of nodes are sorted by cost and utilization respectively.
+    #   @param nodes_sorted_list List of nodes sorted as returned by
+    #                            get_sorted_nodes (default: None, i.e.,
+    #                            computed by the method)
     #   @return A list neigbors (new solutions) sorted by cost
-    def move_to_FaaS(self, solution, sorting_method=0):
+    def move_to_FaaS(self, solution, sorting_method=0, nodes_sorted_list=None):
         counter_obj_evaluation = 0
         neighbors = []
         new_sorted_results = None
-        if self.model == "QT":
-            # get a sorted list of nodes' index with their utilization and cost (except FaaS)
-            if sorting_method == 0:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[0]
-            else:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[1]
-        else:
-            # if the model is not based on M/G/1 queue, sort the resources randomly
-            nodes_sorted_list = self.shuffle_nodes()
+        if nodes_sorted_list is None:
+            nodes_sorted_list = self.get_sorted_nodes(solution, sorting_method)
 
         # sort FaaS by memory and cost respectively
         sorted_FaaS = self.system.sorted_FaaS_by_memory_cost
@@ -542,6 +635,8 @@ class BaseHeuristics(BaseAlgorithm):
 
             # get all partitions located in higest utilization node
             partitions = self.get_partitions_with_j(solution.Y_hat, idx_source_node)
+            # get the assignment shared by all neighbors
+            base = Move.get_base(solution)
             alternative_res_idxs_parts = []
             all_FaaS_compatible = True
             # get a list of alternative FaaS for partitions runing on source node
@@ -553,25 +648,21 @@ class BaseHeuristics(BaseAlgorithm):
                 alternative_res_idxs_parts.append(FaaS_alternatives)
 
             if all_FaaS_compatible and len(alternative_res_idxs_parts) > 0:
-                new_temp_Y_hat = copy.deepcopy(solution.Y_hat)
+                move = Move(base, parent=solution, log=self.logger)
                 for idx, part in enumerate(partitions):
                     idx_alternative = [sorted_FaaS_idx.index(j) for j in alternative_res_idxs_parts[idx]]
                     # get the FaaS with maximum memory/cost
                     des = sorted_FaaS_idx[max(idx_alternative)]
                     # alternative_res_idxs_parts[idx] sorted_FaaS
-                    new_temp_Y_hat[part[0]][part[1]][idx_source_node] = 0
-
-                    new_temp_Y_hat[part[0]][part[1]][des] = 1
-                # create new solution by new assignment
-                new_temp_solution = Configuration(new_temp_Y_hat, self.logger)
+                    move.add(part[0], part[1], idx_source_node, des, 1)
                 # check feasibility
-                performance = new_temp_solution.check_feasibility(self.system)
+                performance = move.check_feasibility(self.system, self.evaluation_cache)
 
                 if performance[0]:
                     # create a new result
                     new_result = Result(self.logger)
-                    new_result.solution = new_temp_solution
-                    new_result.cost = new_result.objective_function(self.system)
+                    new_result.solution = move.get_configuration()
+                    new_result.cost = new_result.objective_function(self.system, self.evaluation_cache)
                     counter_obj_evaluation += 1
                     new_result.performance = performance
                     # add the new result to the neigbor list
@@ -580,26 +671,22 @@ class BaseHeuristics(BaseAlgorithm):
 
                 for idx, part in enumerate(partitions):
                     if len(alternative_res_idxs_parts[idx]) > 0:
-                        new_temp_Y_hat = copy.deepcopy(solution.Y_hat)
-
                         idx_alternative = [sorted_FaaS_idx.index(j) for j in alternative_res_idxs_parts[idx]]
                         des = sorted_FaaS_idx[max(idx_alternative)]
                         # alternative_res_idxs_parts[idx] sorted_FaaS
-                        new_temp_Y_hat[part[0]][part[1]][idx_source_node] = 0
-
-                        new_temp_Y_hat[part[0]][part[1]][des] = 1
-                        # create new solution by new assignment
-                        new_temp_solution = Configuration(new_temp_Y_hat, self.logger)
+                        move = Move(base, [(part[0], part[1], idx_source_node, des, 1)],
+                                    solution, self.logger)
                         # check feasibility
-                        performance = new_temp_solution.check_feasibility(self.system)
+                        performance = move.check_feasibility(self.system, self.evaluation_cache)
 
                         if performance[0]:
                             # create a new result
                             result = Result(self.logger)
-                            result.solution = new_temp_solution
+                            result.solution = move.get_configuration()
                             # reduce the cluster size of destination node
-                            result.reduce_cluster_size(idx_source_node, self.system)
-                            result.objective_function(self.system)
+                            result.reduce_cluster_size(idx_source_node, self.system,
+                                                       self.evaluation_cache)
+                            result.objective_function(self.system, self.evaluation_cache)
                             counter_obj_evaluation += 1
                             #new_result.performance = performance
                             # add the new result to the neigbor list
@@ -621,25 +708,23 @@ class BaseHeuristics(BaseAlgorithm):
     #   @param sorting_method indicate the sorting order of nodes.
     #           If sorting_method=0, the list of nodes are sorted by utilization and cost respectively
     #           otherwise the list of nodes are sorted by cost and utilization respectively.
+    #   @param nodes_sorted_list List of nodes sorted as returned by
+    #                            get_sorted_nodes (default: None, i.e.,
+    #                            computed by the method)
     #   @return A list neigbors (new solutions) sorted by cost
-    def move_from_FaaS(self, solution, sorting_method=0):
+    def move_from_FaaS(self, solution, sorting_method=0, nodes_sorted_list=None):
         counter_obj_evaluation = 0
         neighbors = []
         new_sorted_results = None
         # get a sorted list of nodes' index with their utilization and cost (except FaaS)
-        if self.model == "QT":
-            # get a sorted list of nodes' index with their utilization and cost (except FaaS)
-            if sorting_method == 0:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[0]
-            else:
-                nodes_sorted_list = self.sort_nodes(solution.Y_hat)[1]
-        else:
-            # if the model is not based on M/G/1 queue, sort the resources randomly
-            nodes_sorted_list = self.shuffle_nodes()
+        if nodes_sorted_list is None:
+            nodes_sorted_list = self.get_sorted_nodes(solution, sorting_method)
         # call the method to get all partitions located in FaaS
         partitions_with_FaaS = self.get_partitions_with_FaaS(solution.Y_hat)
         # get the list of nodes and computational layers in used
         active_res_idxs, active_camputationallayers = self.get_active_res_computationallayers(solution.Y_hat)
+        # get the assignment shared by all neighbors
+        base = Move.get_base(solution)
         # loop over partitions
         for part in partitions_with_FaaS:
             # get all alternative resources of the partitions
@@ -661,31 +746,29 @@ class BaseHeuristics(BaseAlgorithm):
                         self.system.resources[des_node_idx].CLname not in active_camputationallayers:
                     if des_node_idx in alternative_res_idxs:
 
-                        # get a copy of current solution as a new temprary assignment matrix (Y_hat)
-                        new_temp_Y_hat = copy.deepcopy(solution.Y_hat)
                         # get all partitions running on the destination node
                         partitions_on_des = self.get_partitions_with_j(solution.Y_hat, des_node_idx)
-                        # assign the current partition to the new alternative node in new Y_hat with maximume number of its instances
-                        new_temp_Y_hat[part[0]][part[1]][part[2]] = 0
-                        new_temp_Y_hat[part[0]][part[1]][des_node_idx] = self.system.resources[des_node_idx].number
+                        # assign the current partition to the new alternative node with maximume number of its instances
+                        move = Move(base, [(part[0], part[1], part[2], des_node_idx,
+                                            self.system.resources[des_node_idx].number)],
+                                    solution, self.logger)
 
                         if len(partitions_on_des) > 0:
                             # assign the maximume instance number of destination node to the partitions that are running on destination node
                             for part_des in partitions_on_des:
-                                new_temp_Y_hat[part_des[0]][part_des[1]][des_node_idx] = self.system.resources[
-                                    des_node_idx].number
-                        # creat a solution by new assignment (Y_hat)
-                        new_temp_solution = Configuration(new_temp_Y_hat, self.logger)
+                                move.add(part_des[0], part_des[1], des_node_idx, des_node_idx,
+                                         self.system.resources[des_node_idx].number)
                         # check if new solution is feasible
-                        performance = new_temp_solution.check_feasibility(self.system)
+                        performance = move.check_feasibility(self.system, self.evaluation_cache)
                         if performance[0]:
                             # creat new result
                             result = Result(self.logger)
-                            result.solution = new_temp_solution
+                            result.solution = move.get_configuration()
                             # reduce cluster size of the destination node
-                            result.reduce_cluster_size(des_node_idx, self.system)
+                            result.reduce_cluster_size(des_node_idx, self.system,
+                                                       self.evaluation_cache)
                             # compute the cost
-                            result.objective_function(self.system)
+                            result.objective_function(self.system, self.evaluation_cache)
                             counter_obj_evaluation += 1
                             #new_result.performance = performance
                             # add new result in neigbor list
@@ -700,6 +783,70 @@ class BaseHeuristics(BaseAlgorithm):
         #     print("Any neighbors could not be found by moving from FaaS to edge/cloud for the current solution")
         return new_sorted_results, counter_obj_evaluation
 
+    ## Method to get the executor running the move operators, which is 
+    # started if not available. Process workers are forked from the current 
+    # process, so that they inherit the System.System object (including its 
+    # compiled form); since daemonic processes cannot have children, threads 
+    # are used in this case
+    #   @param self The object pointer
+    #   @return The concurrent.futures.Executor object
+    def get_executor(self):
+        if self.executor is None:
+            if self.neighborhood_executor == "process":
+                if not multiprocessing.current_process().daemon:
+                    self.executor = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=self.neighborhood_workers,
+                        mp_context=multiprocessing.get_context("fork"),
+                        initializer=_init_neighborhood_worker,
+                        initargs=(self,)
+                    )
+                    return self.executor
+                self.logger.warn(
+                    "Daemonic processes cannot start process workers; threads are used to explore the neighborhood"
+                )
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.neighborhood_workers
+            )
+        return self.executor
+
+    ## Method to shut down the executor running the move operators (if 
+    # started)
+    #   @param self The object pointer
+    def shutdown_executor(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    ## Method to run all the move operators concurrently through the 
+    # executor. The nodes explored by the operators are sorted (or 
+    # shuffled) in advance, in the same order as in the sequential 
+    # exploration, and the results are collected in the operators order, so 
+    # that the neighborhood does not depend on the number of workers
+    #   @param self The object pointer
+    #   @param solution Current solution
+    #   @return List of the pairs (neighbors, number of objective function 
+    #           evaluations) returned by the operators
+    def parallel_neighbors(self, solution):
+        # compute in advance the response times of the current solution 
+        # shared by the operators, so that they are never updated 
+        # concurrently
+        self.system.compiled.update_times(
+            solution.get_evaluation_state(self.system)
+        )
+        tasks = [("change_FaaS", (solution,))]
+        for operator in ["change_resource_type", "change_component_placement",
+                         "move_to_FaaS", "move_from_FaaS"]:
+            tasks.append((operator, (solution, 0, 
+                                     self.get_sorted_nodes(solution))))
+        executor = self.get_executor()
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            futures = [executor.submit(_run_neighborhood_operator, operator,
+                                       *args) for operator, args in tasks]
+        else:
+            futures = [executor.submit(getattr(self, operator), *args) \
+                       for operator, args in tasks]
+        return [future.result() for future in futures]
+
     ## Method to union and sort the set of neighbors came from three methods: change_resource_type, change_component_placement, change_FaaS
     #   @param self The object pointer
     #   @param solution Current solution
@@ -707,16 +854,24 @@ class BaseHeuristics(BaseAlgorithm):
     def union_neighbors(self, solution):
 
         neighborhood = []
-        # get the neighbors by changing FaaS configuration
-        neighborhood1, counter_obj_evaluation1 = self.change_FaaS(solution)
-        # get the neighbors by changing resource type
-        neighborhood2, counter_obj_evaluation2 = self.change_resource_type(solution)
-        # get the neigbors by changing component placement
-        neighborhood3, counter_obj_evaluation3 = self.change_component_placement(solution)
-        # get the neigbors by moveing to FaaS
-        neighborhood4, counter_obj_evaluation4 = self.move_to_FaaS(solution)
-        # get the neigbors by moveing from FaaS to edge/cloud
-        neighborhood5, counter_obj_evaluation5 = self.move_from_FaaS(solution)
+        if self.neighborhood_workers > 0:
+            (neighborhood1, counter_obj_evaluation1), \
+                (neighborhood2, counter_obj_evaluation2), \
+                (neighborhood3, counter_obj_evaluation3), \
+                (neighborhood4, counter_obj_evaluation4), \
+                (neighborhood5, counter_obj_evaluation5) = \
+                self.parallel_neighbors(solution)
+        else:
+            # get the neighbors by changing FaaS configuration
+            neighborhood1, counter_obj_evaluation1 = self.change_FaaS(solution)
+            # get the neighbors by changing resource type
+            neighborhood2, counter_obj_evaluation2 = self.change_resource_type(solution)
+            # get the neigbors by changing component placement
+            neighborhood3, counter_obj_evaluation3 = self.change_component_placement(solution)
+            # get the neigbors by moveing to FaaS
+            neighborhood4, counter_obj_evaluation4 = self.move_to_FaaS(solution)
+            # get the neigbors by moveing from FaaS to edge/cloud
+            neighborhood5, counter_obj_evaluation5 = self.move_from_FaaS(solution)
         counter_obj_evaluation = counter_obj_evaluation1 + counter_obj_evaluation2 + counter_obj_evaluation3 + \
                                  counter_obj_evaluation4 + counter_obj_evaluation5
         # mixe all neigbors
@@ -732,12 +887,14 @@ class BaseHeuristics(BaseAlgorithm):
             neighborhood.extend(neighborhood5)
         # sort the neighbors list by cost
         sorted_neighborhood = sorted(neighborhood, key=lambda x: x.cost)
-        # if two solution have the same cost, check if the solutions are the same and drop one of them
-        new_sorted_neighborhood = copy.deepcopy(sorted_neighborhood)
-        for neighbor_idx in range(len(sorted_neighborhood) - 1):
-            if sorted_neighborhood[neighbor_idx].cost == sorted_neighborhood[neighbor_idx + 1].cost:
-                if sorted_neighborhood[neighbor_idx].solution == sorted_neighborhood[neighbor_idx + 1].solution:
-                    new_sorted_neighborhood.remove(new_sorted_neighborhood[neighbor_idx])
+        # if the same solution is obtained more than once, keep only the 
+        # first occurrence (solutions are hashed by their fingerprint)
+        new_sorted_neighborhood = []
+        visited = set()
+        for neighbor in sorted_neighborhood:
+            if neighbor.solution not in visited:
+                visited.add(neighbor.solution)
+                new_sorted_neighborhood.append(neighbor)
 
         return new_sorted_neighborhood, counter_obj_evaluation
 
@@ -813,7 +970,7 @@ class BaseHeuristics(BaseAlgorithm):
                         self.system.graph.G[comp.name][part.Next]["data_size"] = part.data_size
         solution = Configuration(y_hat, self.logger)
 
-        feasible = solution.check_feasibility(self.system)
+        feasible = solution.check_feasibility(self.system, cache=self.evaluation_cache)
 
         if feasible:
             new_solution = solution
@@ -846,14 +1003,22 @@ class BinarySearch(BaseHeuristics):
     #   @param system_file A system json file
     #   @param solution_file A solution json file
     #   @param log Object of Logger.Logger type
+    #   @param analytic True if the maximum Lambda should be computed 
+    #                   through the capacity analysis of the solution (see 
+    #                   CompiledSystem.CompiledSystem.capacity_bounds), 
+    #                   relying on the binary search only for the 
+    #                   constraints that cannot be bounded analytically 
+    #                   (default: False)
     def __init__(
             self, system, system_file, solution_file, 
             log=space4ai_logger.Logger(name="SPACE4AI-D-BinarySearch"), 
-            **kwargs
+            analytic=False, **kwargs
         ):
         BaseHeuristics.__init__(self, system, "BinarySearch", log)
         self.system_file = system_file
         self.solution_file = solution_file
+        self.analytic = analytic
+        self.binding_constraint = None
 
 
     ## Method to increase the number of resources allocated to a partition to max number
@@ -867,19 +1032,78 @@ class BinarySearch(BaseHeuristics):
             partitions_with_j = self.get_partitions_with_j(solution.Y_hat, res_idx)
             # assign the maximum number of the resource to the partitions running on the resource
             for comp_part in partitions_with_j:
-                solution.Y_hat[comp_part[0]][comp_part[1], res_idx] = self.system.resources[res_idx].number
+                solution.set_number(comp_part[0], comp_part[1], res_idx,
+                                    self.system.resources[res_idx].number)
 
         return solution.Y_hat
 
+    ## Method to get the constraint violated by an unfeasible solution
+    #   @param self The object pointer
+    #   @param performance Tuple returned by Solution.Result.check_feasibility
+    #   @return Tuple storing the kind of the violated constraint and its 
+    #           name (the kind is "structural" if the response times have 
+    #           not been evaluated)
+    def get_violated_constraint(self, performance):
+        for LC in self.system.local_constraints:
+            i = LC.component_idx
+            if not performance[2][i][0]:
+                return "local", self.system.components[i].name
+        for GC, path_performance in zip(self.system.global_constraints, 
+                                        performance[1]):
+            if not path_performance[0]:
+                return "global", GC.path_name
+        return "structural", None
+
+
+    ## Method to compute the maximum Lambda through the capacity analysis 
+    # of the given solution
+    #   @param self The object pointer
+    #   @param result The Solution.Result object
+    #   @param upper_bound_lambda The maximum Lambda
+    #   @param epsilon The gap between highest feasible Lambda and lowes unfeasible Lambda
+    #   @return Tuple storing the highest feasible Lambda (None if it must 
+    #           be found through the binary search) and the upper bound of 
+    #           the binary search
+    #
+    # The closed-form bound is exact only when every constraint involves 
+    # QT-based components. If any constraint depends on ML or FaaS models, 
+    # whose demands are predicted from Lambda, the analysis only narrows 
+    # the upper bound and the scalar binary search (which rebuilds the 
+    # system for each candidate Lambda) is still performed, thus these 
+    # deployments get no speedup
+    def capacity_analysis(self, result, upper_bound_lambda, epsilon):
+        compiled = self.system.compiled
+        rows, cols, n = compiled.flatten(result.solution.Y_hat)
+        bounds, exact = compiled.capacity_bounds(rows, cols, n)
+        bounds.append((upper_bound_lambda, "upper_bound", None))
+        bound, kind, name = min(bounds, key=lambda b: b[0])
+        self.binding_constraint = (kind, name)
+        self.logger.log("Capacity analysis bound: {} ({} {})".format(
+            bound, kind, name), 3)
+        if exact:
+            # utilization bounds are not attained, thus the solution may 
+            # only be feasible slightly below the bound
+            for candidate in [bound, bound - epsilon / 2]:
+                if candidate < self.system.Lambda:
+                    break
+                S = self.system.with_lambda(candidate)
+                if result.check_feasibility(S)[0]:
+                    self.system = S
+                    return candidate, bound
+        if not exact:
+            self.logger.log("Constraints depending on ML/FaaS models: " + \
+                            "falling back to the binary search", 3)
+        return None, bound
+
+
     ## Method to run the algorithm
     #   @param self The object pointer
     #   @param upper_bound_lambda The maximum Lambda
     #   @param epsilon The gap between highest feasible Lambda and lowes unfeasible Lambda
     #   @param **parameters algorithm parameters
-    #   @return result and highest feasible lambda
+    #   @return result and highest feasible lambda (the binding constraint 
+    #           is stored in BinarySearch.binding_constraint)
     def run_algorithm(self, upper_bound_lambda, epsilon, Y_hat=None,  **parameters):
-        from classes.System import System
-
         initial_lambda = self.system.Lambda
         self.logger.log("Start binary search to find max feasible lambda under maximum configuration.", 3)
         if Y_hat is None:
@@ -889,6 +1113,13 @@ class BinarySearch(BaseHeuristics):
             result.solution = Configuration(Y_hat, self.logger)
         #Y_hat = self.increase_number_of_resource(result.solution)
         #Y_hat = result.solution.Y_hat
+        self.binding_constraint = ("upper_bound", None)
+        if self.analytic:
+            highest_feasible_lambda, upper_bound_lambda = \
+                self.capacity_analysis(result, upper_bound_lambda, epsilon)
+            if highest_feasible_lambda is not None:
+                result.objective_function(self.system)
+                return result, highest_feasible_lambda
         eps = np.inf
         lowest_unfeasible_lambda = upper_bound_lambda
         highest_feasible_lambda = self.system.Lambda
@@ -899,7 +1130,7 @@ class BinarySearch(BaseHeuristics):
             if performance[0]:
                 next_lambda = (lowest_unfeasible_lambda + self.system.Lambda) / 2
                 highest_feasible_lambda = self.system.Lambda
-                self.system = System(system_file=self.system_file, Lambda=next_lambda, log=self.logger)
+                self.system = self.system.with_lambda(next_lambda)
 
             else:
                 if self.system.Lambda == initial_lambda:
@@ -908,11 +1139,13 @@ class BinarySearch(BaseHeuristics):
                 else:
                     next_lambda = (highest_feasible_lambda + self.system.Lambda) / 2
                     lowest_unfeasible_lambda = self.system.Lambda
-                    self.system = System(system_file=self.system_file, Lambda=next_lambda, log=self.logger)
+                    self.binding_constraint = \
+                        self.get_violated_constraint(performance)
+                    self.system = self.system.with_lambda(next_lambda)
 
             eps = abs(lowest_unfeasible_lambda - highest_feasible_lambda)
 
-        self.system = System(system_file=self.system_file, Lambda=highest_feasible_lambda, log=self.logger)
+        self.system = self.system.with_lambda(highest_feasible_lambda)
         result.check_feasibility(self.system)
         result.objective_function(self.system)
         return result, highest_feasible_lambda
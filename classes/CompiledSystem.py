@@ -0,0 +1,1005 @@
+from classes.PerformanceEvaluators import QTPerformanceEvaluator, SystemPerformanceEvaluator
+from classes.PerformancePredictors import predict_batch
+from classes.PerformanceModels import EvaluationContext
+from classes.Assignment import Assignment
+from classes.FeasibilityPipeline import FeasibilityPipeline
+import numpy as np
+import sys
+from uuid import uuid4
+
+
+## CompiledSystem
+#
+# Class to store a flattened, array-based view of a System.System object,
+# built once at load time, together with the vectorized routines used to
+# evaluate the feasibility of a Solution.Configuration. All the partitions
+# of all components are stacked row-wise, so that the row of partition h in
+# component i is given by CompiledSystem.comp_offset[i] + h
+class CompiledSystem:
+
+    ## @var system
+    # The System.System object the arrays are extracted from
+
+    ## @var I
+    # Number of Graph.Component objects
+
+    ## @var P
+    # Total number of Graph.Component.Partition objects
+
+    ## @var J
+    # Number of Resources.Resource objects
+
+    ## @var comp_offset
+    # 1D numpy array storing the index of the first row of each component
+
+    ## @var part_comp
+    # 1D numpy array storing, for each row, the index of the corresponding
+    # Graph.Component
+
+    ## @var part_Lambda
+    # 1D numpy array storing the load factor of each partition
+
+    ## @var early_exit
+    # 1D numpy array storing the early exit probability of each partition
+
+    ## @var data_size
+    # 1D numpy array storing the amount of data transferred by each
+    # partition to the subsequent one
+
+    ## @var demand
+    # 2D numpy array (P x J) storing the demand of each partition on each
+    # resource
+
+    ## @var memory
+    # 2D numpy array (P x J) storing the memory requirement of each
+    # partition on each resource
+
+    ## @var colocation
+    # 2D boolean numpy array (P x J) which is True if the performance model
+    # of the partition on the resource allows co-location
+
+    ## @var qt_model
+    # 2D boolean numpy array (P x J) which is True if the performance of the
+    # partition on the resource is evaluated through a queueing model
+
+    ## @var ml_model
+    # 2D boolean numpy array (P x J) which is True if the performance of the
+    # partition on the edge/cloud resource relies on a predictor
+
+    ## @var tabulated
+    # 2D boolean numpy array (P x J) which is True if the response time of
+    # the partition on the edge/cloud resource is given by
+    # System.System.prediction_tables
+
+    ## @var has_tables
+    # True if at least one partition relies on tabulated predictions
+
+    ## @var prediction_table
+    # 3D numpy array (P x J x N) storing the tabulated response time of each
+    # partition on each resource, indexed by the number of resources
+
+    ## @var table_size
+    # 2D numpy array (P x J) storing the maximum number of resources for
+    # which the response time has been tabulated
+
+    ## @var mean_time
+    # 2D numpy array (P x J) storing the mean response time used instead of
+    # the tabulated prediction when required by the evaluation context
+
+    ## @var local_mean
+    # 1D boolean numpy array which is True for the partitions whose mean
+    # response time is used when evaluating local constraints
+
+    ## @var gc_mean
+    # List storing, for each Constraints.GlobalConstraint, a 1D boolean
+    # numpy array which is True for the positions in the path whose
+    # components use the mean response time
+
+    ## @var resource_memory
+    # 1D numpy array storing the memory available on each resource
+
+    ## @var resource_cost
+    # 1D numpy array storing the cost of each resource
+
+    ## @var faas_cost
+    # 2D numpy array (P x J) storing the cost of running each partition on
+    # each FaaS resource (see System.System.faas_cost_coefficients)
+
+    ## @var edge_src
+    # 1D numpy array storing the index of the source component of each
+    # edge in the application DAG
+
+    ## @var edge_dst
+    # 1D numpy array storing the index of the destination component of each
+    # edge in the application DAG
+
+    ## @var gc_edges
+    # List of the DAG edges (pairs of component names) traversed by the
+    # paths of all Constraints.GlobalConstraint objects
+
+    ## @var compiled_id
+    # Unique identifier of the object, used to recognize the evaluation
+    # states it built
+
+    ## @var PE
+    # Object of PerformanceEvaluators.SystemPerformanceEvaluator type, used
+    # to compute network delays
+
+    ## @var pipeline
+    # Object of FeasibilityPipeline.FeasibilityPipeline type, running the
+    # structural feasibility checks and collecting the statistics of all
+    # checks
+
+    ## @var local_stage
+    # FeasibilityPipeline.FeasibilityStage object storing the statistics
+    # of the local constraints check
+
+    ## @var global_stage
+    # FeasibilityPipeline.FeasibilityStage object storing the statistics
+    # of the global constraints check
+
+
+    ## CompiledSystem class constructor
+    #   @param self The object pointer
+    #   @param S A System.System object
+    def __init__(self, S):
+        self.system = S
+        self.I = len(S.components)
+        self.J = len(S.resources)
+        self.PE = SystemPerformanceEvaluator(S.logger)
+        self.compiled_id = uuid4().hex
+        self.compile_partitions(S)
+        self.compile_predictions(S)
+        self.compile_resources(S)
+        self.compile_graph(S)
+        self.compile_pipeline()
+
+
+    ## Method to stack the information of all partitions of all components
+    # into flat numpy arrays
+    #   @param self The object pointer
+    #   @param S A System.System object
+    def compile_partitions(self, S):
+        n_parts = [len(c.partitions) for c in S.components]
+        self.P = sum(n_parts)
+        self.comp_offset = np.zeros(self.I + 1, dtype=int)
+        self.comp_offset[1:] = np.cumsum(n_parts)
+        self.part_comp = np.repeat(np.arange(self.I), n_parts)
+        self.part_Lambda = np.zeros(self.P)
+        self.early_exit = np.zeros(self.P)
+        self.data_size = np.zeros(self.P)
+        self.colocation = np.full((self.P, self.J), False)
+        self.qt_model = np.full((self.P, self.J), False)
+        # loop over all partitions
+        for i, c in enumerate(S.components):
+            for h, p in enumerate(c.partitions):
+                row = self.comp_offset[i] + h
+                self.part_Lambda[row] = p.part_Lambda
+                self.early_exit[row] = p.early_exit_probability
+                if isinstance(p.data_size, list):
+                    self.data_size[row] = p.data_size[0] \
+                        if len(p.data_size) > 0 else 0
+                else:
+                    self.data_size[row] = p.data_size
+                # loop over all the compatible resources
+                for j in np.nonzero(S.compatibility_matrix[i][h])[0]:
+                    model = S.performance_models[i][h][j]
+                    if model is not None:
+                        self.colocation[row, j] = model.allows_colocation
+                        self.qt_model[row, j] = isinstance(model,
+                                                           QTPerformanceEvaluator)
+        # stack demand and memory matrices
+        self.demand = np.concatenate(S.demand_matrix)
+        self.memory = np.concatenate(S.compatibility_matrix_memory)
+        compatible = np.concatenate(S.compatibility_matrix) > 0
+        self.ml_model = compatible & ~self.qt_model
+        self.ml_model[:, S.FaaS_start_index:] = False
+
+
+    ## Method to stack the tabulated predictions of the performance models
+    # and to identify the partitions that use the mean response time in the
+    # different evaluation contexts
+    #   @param self The object pointer
+    #   @param S A System.System object
+    def compile_predictions(self, S):
+        N = 0
+        for tables in S.prediction_tables:
+            for part_tables in tables:
+                for table in part_tables:
+                    if table is not None:
+                        N = max(N, len(table))
+        self.prediction_table = np.full((self.P, self.J, N + 1), np.nan)
+        self.table_size = np.zeros((self.P, self.J), dtype=int)
+        self.mean_time = np.full((self.P, self.J), np.nan)
+        self.local_mean = np.full(self.P, False)
+        local_context = EvaluationContext(EvaluationContext.LOCAL)
+        # loop over all partitions
+        for i, c in enumerate(S.components):
+            for h in range(len(c.partitions)):
+                row = self.comp_offset[i] + h
+                self.local_mean[row] = local_context.mean_time_required(i, h,
+                                                                        S)
+                for j, table in enumerate(S.prediction_tables[i][h]):
+                    if table is not None:
+                        self.prediction_table[row, j, 1:len(table) + 1] = table
+                        self.table_size[row, j] = len(table)
+                        self.mean_time[row, j] = \
+                            S.performance_models[i][h][j].mean_time
+        self.tabulated = self.table_size > 0
+        self.has_tables = bool(self.tabulated.any())
+        # positions in the global constraints paths using the mean time
+        self.gc_mean = [np.array([c != GC.path[-1] for c in GC.path]) \
+                        for GC in S.global_constraints]
+
+
+    ## Method to extract the resources characteristics
+    #   @param self The object pointer
+    #   @param S A System.System object
+    def compile_resources(self, S):
+        self.resource_memory = np.array([r.memory for r in S.resources],
+                                        dtype=float)
+        if hasattr(S, "faas_cost_coefficients"):
+            self.resource_cost = S.resource_cost
+            self.faas_cost = np.concatenate(S.faas_cost_coefficients)
+
+
+    ## Method to extract the application DAG edges
+    #   @param self The object pointer
+    #   @param S A System.System object
+    def compile_graph(self, S):
+        edges = [(S.dic_map_com_idx[u], S.dic_map_com_idx[v]) \
+                 for u, v in S.graph.G.edges]
+        self.edge_src = np.array([e[0] for e in edges], dtype=int)
+        self.edge_dst = np.array([e[1] for e in edges], dtype=int)
+        self.gc_edges = []
+        for GC in S.global_constraints:
+            for comp_index, next_index in zip(GC.path[:-1], GC.path[1:]):
+                self.gc_edges.append((S.components[comp_index].name,
+                                      S.components[next_index].name))
+
+
+    ## Method to build the pipeline of the feasibility checks
+    #   @param self The object pointer
+    def compile_pipeline(self):
+        self.pipeline = FeasibilityPipeline()
+        self.pipeline.add_stage("Co-location / Utilization constraints",
+                                self.performance_assignment_check)
+        self.pipeline.add_stage("Memory constraints",
+                                self.memory_constraints_check)
+        self.pipeline.add_stage("Cloud placement constraint",
+                                self.cloud_placement_check)
+        self.local_stage = self.pipeline.add_final_stage("Local constraints")
+        self.global_stage = self.pipeline.add_final_stage("Global constraints")
+
+
+    ## Method to convert a list of 2D numpy arrays storing the number of
+    # resources assigned to each partition (or its compact representation)
+    # into the list of assignments
+    #   @param self The object pointer
+    #   @param Y_hat List of 2D numpy arrays storing the number of
+    #                Resources.Resource assigned to each
+    #                Graph.Component.Partition, or Assignment.Assignment
+    #                object
+    #   @return 1D numpy arrays storing, for each assignment (sorted by
+    #           component, partition and resource), the row index, the
+    #           resource index and the number of resources
+    def flatten(self, Y_hat):
+        if isinstance(Y_hat, Assignment):
+            return Y_hat.entries()
+        Y = np.concatenate(Y_hat)
+        rows, cols = np.nonzero(Y > 0)
+        return rows, cols, Y[rows, cols]
+
+
+    ## Method to compute the utilization of all resources
+    #   @param self The object pointer
+    #   @param rows Row indices of the assignments
+    #   @param cols Resource indices of the assignments
+    #   @param n Number of resources of the assignments
+    #   @return 1D numpy array storing the utilization of each resource
+    def utilization(self, rows, cols, n):
+        weights = self.demand[rows, cols] * self.part_Lambda[rows] / n
+        return np.bincount(cols, weights=weights, minlength=self.J)
+
+
+    ## Method to compute the utilization, the number of assigned partitions
+    # (in total and not allowing co-location) and the used memory of all
+    # resources
+    #   @param self The object pointer
+    #   @param rows Row indices of the assignments
+    #   @param cols Resource indices of the assignments
+    #   @param n Number of resources of the assignments
+    #   @return Tuple of 1D numpy arrays storing the utilization, the number
+    #           of partitions, the number of partitions not allowing
+    #           co-location and the used memory of each resource
+    def resources_statistics(self, rows, cols, n):
+        U = self.utilization(rows, cols, n)
+        count = np.bincount(cols, minlength=self.J)
+        no_colocation = np.bincount(cols,
+                                    weights=~self.colocation[rows, cols],
+                                    minlength=self.J)
+        used_memory = np.bincount(cols, weights=self.memory[rows, cols],
+                                  minlength=self.J)
+        return U, count, no_colocation, used_memory
+
+
+    ## Method to build the evaluation state of a configuration from scratch
+    #   @param self The object pointer
+    #   @param Y_hat List of 2D numpy arrays storing the number of
+    #                Resources.Resource assigned to each
+    #                Graph.Component.Partition, or Assignment.Assignment
+    #                object
+    #   @return An EvaluationState object
+    def initial_state(self, Y_hat):
+        rows, cols, n = self.flatten(Y_hat)
+        state = EvaluationState(self, rows, cols, n)
+        state.U, state.count, state.no_colocation, state.used_memory = \
+            self.resources_statistics(rows, cols, n)
+        return state
+
+
+    ## Method to build the evaluation state of a configuration obtained by
+    # applying a list of moves to a parent configuration. Only the
+    # statistics of the resources involved in the moves are recomputed,
+    # while the response times of the components and the global paths
+    # which are not affected are inherited from the parent
+    #   @param self The object pointer
+    #   @param parent The EvaluationState of the parent configuration
+    #   @param moves List of tuples (component index, partition index,
+    #                source resource index, destination resource index,
+    #                number of resources), each of them meaning that the
+    #                partition is removed from the source resource and
+    #                assigned to the given number of destination resources
+    #   @return An EvaluationState object
+    def moved_state(self, parent, moves):
+        keys = parent.rows * self.J + parent.cols
+        n = parent.n
+        moved_rows = []
+        columns = []
+        for i, h, source, destination, number in moves:
+            row = self.comp_offset[i] + h
+            # remove the assignment to the source resource
+            keep = keys != row * self.J + source
+            keys = keys[keep]
+            n = n[keep]
+            # set the number of destination resources
+            key = row * self.J + destination
+            pos = np.searchsorted(keys, key)
+            if pos < len(keys) and keys[pos] == key:
+                keys = np.delete(keys, pos)
+                n = np.delete(n, pos)
+            if number > 0:
+                keys = np.insert(keys, pos, key)
+                n = np.insert(n, pos, number)
+            moved_rows.append(row)
+            columns.extend([source, destination])
+        state = EvaluationState(self, keys // self.J, keys % self.J, n)
+        # recompute the statistics of the resources involved in the moves
+        columns = np.unique(columns)
+        in_columns = np.isin(state.cols, columns)
+        U, count, no_colocation, used_memory = self.resources_statistics(
+            state.rows[in_columns], state.cols[in_columns], n[in_columns]
+        )
+        state.U = parent.U.copy()
+        state.U[columns] = U[columns]
+        state.count = parent.count.copy()
+        state.count[columns] = count[columns]
+        state.no_colocation = parent.no_colocation.copy()
+        state.no_colocation[columns] = no_colocation[columns]
+        state.used_memory = parent.used_memory.copy()
+        state.used_memory[columns] = used_memory[columns]
+        # components whose response time may change are those including
+        # the moved partitions and those evaluated through queueing models
+        # on the resources whose utilization changed
+        changed = np.full(self.I, False)
+        changed[self.part_comp[moved_rows]] = True
+        shared = in_columns & self.qt_model[state.rows, state.cols]
+        changed[self.part_comp[state.rows[shared]]] = True
+        state.times = parent.times.copy()
+        if self.has_tables:
+            state.local_times = parent.local_times.copy()
+            state.mean_times = parent.mean_times.copy()
+        else:
+            state.local_times = state.mean_times = state.times
+        state.stale_times = parent.stale_times | changed
+        # global paths traversing the changed components must be evaluated
+        # again
+        state.paths = [None if changed[GC.path].any() else path \
+                       for GC, path in zip(self.system.global_constraints,
+                                           parent.paths)]
+        state.hop_data = parent.hop_data
+        return state
+
+
+    ## Method to compute the cost of a configuration, given by the cost of
+    # the maximum number of used edge/cloud resources of each type and by
+    # the cost of the partitions executed on FaaS
+    #   @param self The object pointer
+    #   @param Y_hat List of 2D numpy arrays storing the number of
+    #                Resources.Resource assigned to each
+    #                Graph.Component.Partition, or Assignment.Assignment
+    #                object
+    #   @return The total cost
+    def cost(self, Y_hat):
+        S = self.system
+        rows, cols, n = self.flatten(Y_hat)
+        # cost of edge/cloud resources
+        y_bar = np.zeros(self.J, dtype=int)
+        np.maximum.at(y_bar, cols, n)
+        F = S.FaaS_start_index
+        costs = self.resource_cost[:F] * y_bar[:F] * S.T
+        # cost of FaaS (sorted by resource, to sum up all the terms in the
+        # same order as the original formulation)
+        FaaS = cols >= F
+        order = np.lexsort((rows[FaaS], cols[FaaS]))
+        rows, cols, n = rows[FaaS][order], cols[FaaS][order], n[FaaS][order]
+        faas_costs = self.faas_cost[rows, cols] * n
+        return sum(costs.tolist() + faas_costs.tolist())
+
+
+    ## Method to check if an evaluation state has been built by the current
+    # object (and can thus be used as parent of incremental evaluations)
+    #   @param self The object pointer
+    #   @param state An EvaluationState object (or None)
+    #   @return True if the state can be used
+    def is_valid_state(self, state):
+        return state is not None and state.compiled_id == self.compiled_id
+
+
+    ## Method to check that partitions are co-located only on resources
+    # whose performance models allow it, and that the utilization of
+    # shared resources does not exceed 1
+    #   @param self The object pointer
+    #   @param state An EvaluationState object
+    #   @return True if the assignment is feasible
+    def performance_assignment_check(self, state):
+        F = self.system.FaaS_start_index
+        shared = state.count[:F] > 1
+        return not np.any(shared & ((state.no_colocation[:F] > 0) | \
+                                    (state.U[:F] >= 1)))
+
+
+    ## Method to check that the memory requirements of the partitions
+    # assigned to each resource do not exceed its capacity
+    #   @param self The object pointer
+    #   @param state An EvaluationState object
+    #   @return True if the constraints are satisfied
+    def memory_constraints_check(self, state):
+        return not np.any(state.used_memory > self.resource_memory)
+
+
+    ## Method to check the cloud placement constraint on an evaluation
+    # state (see CompiledSystem.move_backward_check)
+    #   @param self The object pointer
+    #   @param state An EvaluationState object
+    #   @return True if the constraint is satisfied
+    def cloud_placement_check(self, state):
+        return self.move_backward_check(state.rows, state.cols)
+
+
+    ## Method to check that assignments never move back from cloud to edge,
+    # neither between consecutive partitions of a component nor between
+    # the last partition of a component and the first partition of its
+    # successors
+    #   @param self The object pointer
+    #   @param rows Row indices of the assignments
+    #   @param cols Resource indices of the assignments
+    #   @return True if the constraint is satisfied
+    def move_backward_check(self, rows, cols):
+        if len(rows) == 0:
+            return True
+        cloud = self.system.cloud_start_index
+        # resource of the first assignment of each partition
+        first_in_row = np.r_[True, rows[1:] != rows[:-1]]
+        r_res = cols[first_in_row]
+        r_comp = self.part_comp[rows[first_in_row]]
+        same_comp = r_comp[1:] == r_comp[:-1]
+        # consecutive partitions of the same component
+        if np.any(same_comp & (r_res[:-1] >= cloud) & (r_res[1:] < cloud)):
+            return False
+        # resource of the last partition of each component
+        last_res = np.full(self.I, -1)
+        is_last = np.r_[~same_comp, True]
+        last_res[r_comp[is_last]] = r_res[is_last]
+        # components with at least one predecessor running on cloud
+        pred_cloud = np.full(self.I, False)
+        pred_cloud[self.edge_dst[last_res[self.edge_src] >= cloud]] = True
+        is_first = np.r_[True, ~same_comp]
+        return not np.any(pred_cloud[r_comp[is_first]] & \
+                          (r_res[is_first] < cloud))
+
+
+    ## Method to check if some assignments rely on predictors whose
+    # result depends on the calling constraint and which have not been
+    # tabulated
+    #   @param self The object pointer
+    #   @param rows Row indices of the assignments
+    #   @param cols Resource indices of the assignments
+    #   @param n Number of resources of the assignments
+    #   @return True if at least one assignment relies on such a predictor
+    def uses_predictors(self, rows, cols, n):
+        ml = self.ml_model[rows, cols]
+        if not ml.any():
+            return False
+        return bool(np.any(ml & (n > self.table_size[rows, cols])))
+
+
+    ## Method to get the response time of a component in the given
+    # evaluation context, which is computed at most once for each
+    # evaluation state (through array operations whenever possible)
+    #   @param self The object pointer
+    #   @param state An EvaluationState object
+    #   @param solution The Solution.Configuration object the state refers to
+    #   @param i Index of the Graph.Component
+    #   @param context A PerformanceModels.EvaluationContext object
+    #                  (default: None)
+    #   @return The response time
+    def response_time(self, state, solution, i, context=None):
+        if state.uses_predictors is None:
+            state.uses_predictors = self.uses_predictors(state.rows,
+                                                         state.cols, state.n)
+        # get the kind of response time required by the context
+        kind = EvaluationContext.REPORT
+        if context is not None:
+            if context.kind == EvaluationContext.GLOBAL:
+                if i in context.path and i != context.path[-1]:
+                    kind = EvaluationContext.GLOBAL
+            elif context.kind == EvaluationContext.LOCAL:
+                first, last = self.comp_offset[i], self.comp_offset[i + 1]
+                if self.local_mean[first:last].any():
+                    kind = EvaluationContext.LOCAL
+        if not state.uses_predictors:
+            self.update_times(state)
+            if kind == EvaluationContext.GLOBAL:
+                return state.mean_times[i]
+            if kind == EvaluationContext.LOCAL:
+                return state.local_times[i]
+            return state.times[i]
+        if (kind, i) not in state.predicted_times:
+            state.predicted_times[(kind, i)] = self.PE.get_perf_evaluation(
+                self.system, solution.Y_hat, i, state.U, context
+            )
+        return state.predicted_times[(kind, i)]
+
+
+    ## Method to compute in a single batch the predictions required to
+    # evaluate a list of configurations through the predictors, so that
+    # the regressors are called once for each regressor file
+    #   @param self The object pointer
+    #   @param Y_hats List of assignment matrices (each of them given by a
+    #                 list of 2D numpy arrays storing the number of
+    #                 Resources.Resource assigned to each
+    #                 Graph.Component.Partition, or by an
+    #                 Assignment.Assignment object)
+    def prefetch_predictions(self, Y_hats):
+        if not self.ml_model.any():
+            return
+        S = self.system
+        requests = []
+        for Y_hat in Y_hats:
+            rows, cols, n = self.flatten(Y_hat)
+            ml = self.ml_model[rows, cols]
+            if ml.any() and isinstance(Y_hat, Assignment):
+                # features are computed from the full assignment matrices
+                Y_hat = Y_hat.to_Y_hat()
+            for row, j in zip(rows[ml], cols[ml]):
+                i = self.part_comp[row]
+                h = row - self.comp_offset[i]
+                model = S.performance_models[i][h][j]
+                features = model.get_features(c_idx=i, p_idx=h, r_idx=j,
+                                              S=S, Y_hat=Y_hat)
+                requests.append((model, features))
+        predict_batch(requests)
+
+
+    ## Method to compute in a single batch the predictions required to
+    # evaluate the configurations explored when reducing, one by one, the
+    # number of resources of the given type assigned to the partitions
+    #   @param self The object pointer
+    #   @param solution A Solution.Configuration object
+    #   @param j Index of the Resources.Resource whose number is reduced
+    def prefetch_cluster_reduction(self, solution, j):
+        if not self.ml_model[:, j].any():
+            return
+        Y_hats = []
+        temp = solution.Y_hat
+        while max(y[:, j].max() for y in temp) > 1:
+            temp = [y.copy() for y in temp]
+            for y in temp:
+                y[y[:, j] > 1, j] -= 1
+            Y_hats.append(temp)
+        self.prefetch_predictions(Y_hats)
+
+
+    ## Method to evaluate the response time of all components, given the
+    # response times of the partitions evaluated through queueing models,
+    # through tabulated predictions (or given by the demand matrix for FaaS)
+    #   @param self The object pointer
+    #   @param rows Row indices of the assignments
+    #   @param cols Resource indices of the assignments
+    #   @param n Number of resources of the assignments
+    #   @param U 1D numpy array storing the utilization of each resource
+    #   @param mean 1D boolean numpy array which is True for the
+    #               assignments using the mean response time instead of the
+    #               tabulated prediction (default: None)
+    #   @return 1D numpy array with the response times of all components
+    def component_times(self, rows, cols, n, U, mean=None):
+        times = self.demand[rows, cols]
+        qt = self.qt_model[rows, cols]
+        times[qt] = times[qt] / (1 - U[cols[qt]])
+        ml = self.tabulated[rows, cols]
+        if ml.any():
+            times[ml] = self.prediction_table[rows[ml], cols[ml], n[ml]]
+            if mean is not None:
+                ml = ml & mean
+                times[ml] = self.mean_time[rows[ml], cols[ml]]
+        comp = self.part_comp[rows]
+        # assignments following another one in the same component are
+        # weighted by the probability of no early exit of all the previous
+        # ones and include the network delay when the resource changes
+        follows = np.r_[False, comp[1:] == comp[:-1]]
+        factors = 1 - self.early_exit[rows]
+        weights = np.ones(len(rows))
+        starts = np.nonzero(~follows)[0]
+        pos = np.arange(len(rows)) - starts[np.cumsum(~follows) - 1]
+        for k in range(1, pos.max() + 1 if len(pos) > 0 else 1):
+            idx = np.nonzero(pos == k)[0]
+            weights[idx] = weights[idx - 1] * factors[idx - 1]
+        e = np.nonzero(follows & np.r_[False, cols[1:] != cols[:-1]])[0]
+        if len(e) > 0:
+            times[e] = times[e] + self.PE.get_network_delays(
+                cols[e - 1], cols[e], self.system, self.data_size[rows[e - 1]])
+        terms = np.where(follows, weights * times, times)
+        return np.bincount(comp, weights=terms, minlength=self.I)
+
+
+    ## Method to update the response times of the components whose
+    # assignments changed since the last evaluation, both with the
+    # predicted response times and with the mean response times required
+    # when evaluating local and global constraints
+    #   @param self The object pointer
+    #   @param state An EvaluationState object (updated)
+    def update_times(self, state):
+        stale = state.stale_times
+        if stale.any():
+            selected = stale[self.part_comp[state.rows]]
+            rows = state.rows[selected]
+            cols = state.cols[selected]
+            n = state.n[selected]
+            times = self.component_times(rows, cols, n, state.U)
+            state.times[stale] = times[stale]
+            if self.has_tables:
+                state.local_times[stale] = times[stale]
+                state.mean_times[stale] = times[stale]
+                # components relying on tabulated predictions
+                comp = self.part_comp[rows]
+                ml_comp = np.full(self.I, False)
+                ml_comp[comp[self.tabulated[rows, cols]]] = True
+                if ml_comp.any():
+                    sub = ml_comp[comp]
+                    rows, cols, n = rows[sub], cols[sub], n[sub]
+                    local_times = self.component_times(rows, cols, n, state.U,
+                                                       self.local_mean[rows])
+                    mean_times = self.component_times(rows, cols, n, state.U,
+                                                      np.full(len(rows), True))
+                    state.local_times[ml_comp] = local_times[ml_comp]
+                    state.mean_times[ml_comp] = mean_times[ml_comp]
+            state.stale_times = np.full(self.I, False)
+
+
+    ## Method to check the feasibility of all Constraints.LocalConstraint
+    # objects, updating the corresponding slack values of the solution
+    #   @param self The object pointer
+    #   @param solution A Solution.Configuration object
+    #   @param times 1D numpy array with the response times of all components
+    #   @param components_performance List storing, for each component, the
+    #                                 feasibility of the local constraint
+    #                                 and the response time (updated)
+    #   @return True if all the local constraints are satisfied
+    def check_local_constraints(self, solution, times, components_performance):
+        feasible = True
+        for LC in self.system.local_constraints:
+            i = LC.component_idx
+            perf_evaluation = times[i]
+            LC_feasible = False
+            if not np.isnan(perf_evaluation):
+                solution.local_slack_value[i] = LC.max_res_time - perf_evaluation
+                if perf_evaluation <= LC.max_res_time and perf_evaluation > 0:
+                    LC_feasible = True
+            else:
+                solution.local_slack_value[i] = float('Inf')
+            components_performance[i] = (LC_feasible, perf_evaluation)
+            feasible = feasible and LC_feasible
+        return feasible
+
+
+    ## Method to check the feasibility of all Constraints.GlobalConstraint
+    # objects, updating the global slack value of the solution. The paths
+    # whose components did not change since the last evaluation are not
+    # evaluated again
+    #   @param self The object pointer
+    #   @param solution A Solution.Configuration object
+    #   @param state An EvaluationState object (updated)
+    #   @param paths_performance List storing, for each path, the feasibility
+    #                            of the global constraint and the response
+    #                            time (updated)
+    #   @return True if all the global constraints are satisfied
+    def check_global_constraints(self, solution, state, paths_performance):
+        # the data transferred between components may have changed since
+        # the last evaluation, in which case all paths are evaluated again
+        hop_data = self.hop_data()
+        if hop_data != state.hop_data:
+            state.paths = [None] * len(state.paths)
+            state.hop_data = hop_data
+        feasible = True
+        first = None
+        for GC_idx, GC in enumerate(self.system.global_constraints):
+            if state.paths[GC_idx] is None:
+                if first is None:
+                    # indices of the first and last assignment of each
+                    # component
+                    comp = self.part_comp[state.rows]
+                    first = np.searchsorted(comp, np.arange(self.I),
+                                            side="left")
+                    last = np.searchsorted(comp, np.arange(self.I),
+                                           side="right") - 1
+                path_times = np.where(self.gc_mean[GC_idx],
+                                      state.mean_times[GC.path],
+                                      state.times[GC.path])
+                state.paths[GC_idx] = self.evaluate_path(GC, path_times,
+                                                         state.cols,
+                                                         first, last)
+            GC_feasible, Sum, slack = state.paths[GC_idx]
+            solution.global_slack_value = slack
+            paths_performance.append((GC_feasible, Sum))
+            feasible = feasible and GC_feasible
+        return feasible
+
+
+    ## Method to evaluate the response time of the path of a
+    # Constraints.GlobalConstraint object
+    #   @param self The object pointer
+    #   @param GC A Constraints.GlobalConstraint object
+    #   @param path_times 1D numpy array with the response times of the
+    #                     components in the path
+    #   @param cols Resource indices of the assignments
+    #   @param first Index of the first assignment of each component
+    #   @param last Index of the last assignment of each component
+    #   @return Tuple storing the feasibility of the constraint, the response
+    #           time of the path and the corresponding slack value
+    def evaluate_path(self, GC, path_times, cols, first, last):
+        S = self.system
+        # check if the response time of all components is valid
+        if np.any(np.isinf(path_times) | np.isnan(path_times) | \
+                  (path_times <= 0)):
+            return False, float('Inf'), float('Inf')
+        Sum = sum(path_times.tolist())
+        # get the resources of the last and first partition of consecutive
+        # components
+        part1_resources = cols[last[GC.path[:-1]]]
+        part2_resources = cols[first[GC.path[1:]]]
+        data_sizes = []
+        for comp_index, next_index in zip(GC.path[:-1], GC.path[1:]):
+            comp1_key = S.components[comp_index].name
+            comp2_key = S.components[next_index].name
+            if not S.graph.G.has_edge(comp1_key, comp2_key):
+                S.logger.err("Components global constraints path error: component {} is not successor of component {} in the DAG.".\
+                             format(comp2_key, comp1_key))
+                sys.exit(1)
+            data_sizes.append(S.graph.G.get_edge_data(comp1_key,
+                                                      comp2_key)["data_size"])
+        # add the network delay between consecutive components executed on
+        # different resources
+        moved = np.nonzero(part1_resources != part2_resources)[0]
+        if len(moved) > 0:
+            network_delays = self.PE.get_network_delays(
+                part1_resources[moved], part2_resources[moved], S,
+                [data_sizes[k] for k in moved]
+            )
+            for network_delay in network_delays.tolist():
+                Sum += network_delay
+        return Sum <= GC.max_res_time, Sum, GC.max_res_time - Sum
+
+
+    ## Method to get the amount of data currently transferred along the DAG
+    # edges traversed by the global constraints
+    #   @param self The object pointer
+    #   @return List of data sizes
+    def hop_data(self):
+        G = self.system.graph.G
+        return [G.get_edge_data(u, v, default={}).get("data_size") \
+                for u, v in self.gc_edges]
+
+
+    ## Method to compute analytically the maximum incoming workload that a
+    # configuration can sustain. The utilization of all resources is linear
+    # in Lambda, while the response time of the partitions evaluated through
+    # queueing models is given by demand / (1 - U); the response time of a
+    # constraint only involving such partitions can thus be written as
+    # c + sum_j A_j / (1 - Lambda * u_j), which is increasing in Lambda and
+    # is bounded in closed form when a single resource is involved (and
+    # through a vectorized bisection otherwise). Constraints involving
+    # components evaluated through ML models or executed on FaaS are not
+    # bounded
+    #   @param self The object pointer
+    #   @param rows Row indices of the assignments
+    #   @param cols Resource indices of the assignments
+    #   @param n Number of resources of the assignments
+    #   @return Tuple storing the list of bounds, each of them given by a
+    #           tuple (maximum Lambda, kind of constraint, name), and a
+    #           boolean which is True if all the constraints have been
+    #           bounded
+    def capacity_bounds(self, rows, cols, n):
+        S = self.system
+        F = S.FaaS_start_index
+        # utilization of each resource per unit of incoming workload
+        u = self.utilization(rows, cols, n) / S.Lambda
+        # the utilization of shared resources must be lower than 1
+        count = np.bincount(cols, minlength=self.J)
+        bounds = [(float(1 / u[j]), "utilization", S.resources[j].name) \
+                  for j in np.nonzero((count[:F] > 1) & (u[:F] > 0))[0]]
+        # components whose response time depends on Lambda only through
+        # the utilization of the resources
+        qt = self.qt_model[rows, cols]
+        analytic = np.full(self.I, True)
+        analytic[self.part_comp[rows[~qt]]] = False
+        constraints = []
+        for LC in S.local_constraints:
+            if analytic[LC.component_idx]:
+                constraints.append((LC, "local",
+                                    S.components[LC.component_idx].name))
+        for GC in S.global_constraints:
+            if analytic[GC.path].all():
+                constraints.append((GC, "global", GC.path_name))
+        exact = len(constraints) == len(S.local_constraints) + \
+            len(S.global_constraints)
+        if len(constraints) == 0:
+            return bounds, exact
+        # evaluate the response times with all the utilizations equal to 0
+        # and with the utilization of each used resource equal to 1/2, so
+        # that each probe doubles the corresponding term A_j
+        used = np.unique(cols[qt])
+        probes = np.zeros((len(used) + 1, self.J))
+        probes[np.arange(1, len(used) + 1), used] = 0.5
+        comp = self.part_comp[rows]
+        first = np.searchsorted(comp, np.arange(self.I), side="left")
+        last = np.searchsorted(comp, np.arange(self.I), side="right") - 1
+        R = np.zeros((len(probes), len(constraints)))
+        for p, U in enumerate(probes):
+            times = self.component_times(rows, cols, n, U)
+            for k, (constraint, kind, _) in enumerate(constraints):
+                if kind == "local":
+                    R[p, k] = times[constraint.component_idx]
+                else:
+                    R[p, k] = self.evaluate_path(constraint,
+                                                 times[constraint.path],
+                                                 cols, first, last)[1]
+        A = np.maximum(R[1:] - R[0], 0)
+        u = u[used][:, np.newaxis]
+        dependent = (A > 0) & (u > 0)
+        # constant part of the response times and maximum response times
+        c = R[0] - np.where(dependent, A, 0).sum(axis=0)
+        T = np.array([constraint.max_res_time for constraint, _, _ in \
+                      constraints])
+        # Lambda must keep the utilization of the involved resources below 1
+        stable = np.where(dependent, 1 / np.where(u > 0, u, 1), np.inf)
+        Lambda = stable.min(axis=0)
+        Lambda[(c > T) | ((c == T) & dependent.any(axis=0))] = 0
+        single = (dependent.sum(axis=0) == 1) & (c < T)
+        if single.any():
+            Aj = A[:, single].max(axis=0)
+            uj = np.where(dependent[:, single], u, 0).max(axis=0)
+            Lambda[single] = np.maximum(1 - Aj / (T[single] - c[single]),
+                                        0) / uj
+        multiple = (dependent.sum(axis=0) > 1) & (c < T)
+        if multiple.any():
+            Am, dep = A[:, multiple], dependent[:, multiple]
+            Tm, cm = T[multiple], c[multiple]
+            low = np.zeros(multiple.sum())
+            high = Lambda[multiple]
+            for _ in range(100):
+                mid = (low + high) / 2
+                slack = np.maximum(1 - mid * u, np.finfo(float).tiny)
+                terms = np.where(dep, Am / slack, 0)
+                feasible = cm + terms.sum(axis=0) <= Tm
+                low = np.where(feasible, mid, low)
+                high = np.where(feasible, high, mid)
+            Lambda[multiple] = low
+        for k, (_, kind, name) in enumerate(constraints):
+            bounds.append((float(Lambda[k]), kind, name))
+        return bounds, exact
+
+
+## EvaluationState
+#
+# Class to store the intermediate results of the feasibility check of a
+# Solution.Configuration, which are reused to evaluate incrementally the
+# configurations obtained from it by moving a few partitions
+class EvaluationState:
+
+    ## @var compiled_id
+    # Identifier of the CompiledSystem object the state refers to
+
+    ## @var rows
+    # Row indices of the assignments
+
+    ## @var cols
+    # Resource indices of the assignments
+
+    ## @var n
+    # Number of resources of the assignments
+
+    ## @var U
+    # 1D numpy array storing the utilization of each resource
+
+    ## @var count
+    # 1D numpy array storing the number of partitions assigned to each
+    # resource
+
+    ## @var no_colocation
+    # 1D numpy array storing the number of partitions assigned to each
+    # resource whose performance model does not allow co-location
+
+    ## @var used_memory
+    # 1D numpy array storing the memory used on each resource
+
+    ## @var times
+    # 1D numpy array storing the response time of each component
+
+    ## @var local_times
+    # 1D numpy array storing the response time of each component when
+    # evaluating local constraints
+
+    ## @var mean_times
+    # 1D numpy array storing the response time of each component when
+    # it is not the last one in the path of a global constraint
+
+    ## @var stale_times
+    # 1D boolean numpy array which is True for the components whose
+    # response time must be (re)computed
+
+    ## @var paths
+    # List storing, for each Constraints.GlobalConstraint, a tuple with the
+    # feasibility, the response time and the slack value of the path (None
+    # if it must be (re)computed)
+
+    ## @var hop_data
+    # List of the data sizes of the DAG edges traversed by the global
+    # constraints when the paths were evaluated
+
+    ## @var uses_predictors
+    # True if some assignments rely on predictors which have not been
+    # tabulated (None if not computed yet)
+
+    ## @var predicted_times
+    # Dictionary storing the response times of the components computed
+    # through the predictors, indexed by the kind of
+    # PerformanceModels.EvaluationContext and by the component index
+
+
+    ## EvaluationState class constructor
+    #   @param self The object pointer
+    #   @param compiled A CompiledSystem object
+    #   @param rows Row indices of the assignments
+    #   @param cols Resource indices of the assignments
+    #   @param n Number of resources of the assignments
+    def __init__(self, compiled, rows, cols, n):
+        self.compiled_id = compiled.compiled_id
+        self.rows = rows
+        self.cols = cols
+        self.n = n
+        self.U = None
+        self.count = None
+        self.no_colocation = None
+        self.used_memory = None
+        self.times = np.zeros(compiled.I)
+        if compiled.has_tables:
+            self.local_times = np.zeros(compiled.I)
+            self.mean_times = np.zeros(compiled.I)
+        else:
+            self.local_times = self.mean_times = self.times
+        self.stale_times = np.full(compiled.I, True)
+        self.paths = [None] * len(compiled.system.global_constraints)
+        self.hop_data = None
+        self.uses_predictors = None
+        self.predicted_times = {}
@@ -1,6 +1,6 @@
 import sys
 
-from classes.PerformanceEvaluators import SystemPerformanceEvaluator
+from classes.PerformanceModels import EvaluationContext
 from abc import ABC, abstractmethod
 import numpy as np
 
@@ -60,10 +60,10 @@ class LocalConstraint(PerformanceConstraint):
 
         feasible = False
 
-        # evaluate the performance of component
-        PE = SystemPerformanceEvaluator(solution.logger)
-        perf_evaluation = PE.get_perf_evaluation(S, solution.Y_hat,
-                                                 self.component_idx)
+        # get the performance of component
+        context = EvaluationContext(EvaluationContext.LOCAL)
+        perf_evaluation = solution.get_response_time(S, self.component_idx,
+                                                     context)
         # check if the denumerator is equal to zero
         if not np.isnan(perf_evaluation):
             # update the slack value
@@ -119,14 +119,15 @@ class GlobalConstraint(PerformanceConstraint):
     def check_feasibility(self, S, solution):
 
         feasible = False
-        PE = SystemPerformanceEvaluator()
+        PE = S.compiled.PE
 
         # compute the response time of all components in the path
         performance_of_components = []
         perf_evaluation = 0
+        context = EvaluationContext(EvaluationContext.GLOBAL, self.path)
         for comp_index in self.path:
-            perf_evaluation = PE.get_perf_evaluation(S, solution.Y_hat,
-                                                     comp_index)
+            perf_evaluation = solution.get_response_time(S, comp_index,
+                                                         context)
             # check if the response time is valid
             if not perf_evaluation == float("inf") \
                     and not np.isnan(perf_evaluation) \
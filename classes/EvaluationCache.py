@@ -0,0 +1,118 @@
+from collections import OrderedDict
+import threading
+
+
+## EvaluationCache
+#
+# Class used to store, during a search, the results of the evaluation of the
+# Solution.Configuration objects explored so far, so that configurations
+# that are visited again are not evaluated from scratch. Results are indexed
+# by the configuration fingerprint, together with the System.System data
+# that may change during the search, and the least recently used ones are
+# removed when the maximum size is reached
+class EvaluationCache:
+
+    ## @var max_size
+    # Maximum number of stored evaluations
+
+    ## @var entries
+    # Ordered dictionary storing the CachedEvaluation objects, from the least
+    # to the most recently used
+
+    ## @var hits
+    # Number of evaluations retrieved from the cache
+
+    ## @var misses
+    # Number of evaluations not available in the cache
+
+    ## @var evictions
+    # Number of evaluations removed from the cache
+
+    ## @var lock
+    # Lock used to update the entries and the counters, so that the cache 
+    # can be shared by the threads exploring the neighborhood of a solution
+
+    ## EvaluationCache class constructor
+    #   @param self The object pointer
+    #   @param max_size Maximum number of stored evaluations (default: 10000)
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    ## Method to get the key identifying the evaluation of a configuration
+    #   @param self The object pointer
+    #   @param S A System.System object
+    #   @param solution A Solution.Configuration object
+    #   @return The key
+    def get_key(self, S, solution):
+        return (solution.get_fingerprint(), S.compiled.compiled_id,
+                tuple(S.compiled.hop_data()))
+
+    ## Method to get the evaluation corresponding to the given key, creating
+    # an empty one if it is not available
+    #   @param self The object pointer
+    #   @param key The key returned by get_key
+    #   @return The CachedEvaluation object
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            evaluation = CachedEvaluation()
+            self.entries[key] = evaluation
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return evaluation
+
+    ## Method to record whether a required result was available
+    #   @param self The object pointer
+    #   @param available True if the result was found in the cache
+    def record(self, available):
+        with self.lock:
+            if available:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    ## Operator to convert an EvaluationCache object into a string
+    #   @param self The object pointer
+    def __str__(self):
+        return "Evaluation cache: {} entries, {} hits, {} misses, {} evictions".\
+            format(len(self.entries), self.hits, self.misses, self.evictions)
+
+
+## CachedEvaluation
+#
+# Class used to store the results of the evaluation of a
+# Solution.Configuration
+class CachedEvaluation:
+
+    ## @var performance
+    # Tuple returned by Solution.Configuration.check_feasibility (None if
+    # not evaluated yet)
+
+    ## @var local_slack_value
+    # Slack values related to Constraints.LocalConstraints
+
+    ## @var global_slack_value
+    # Slack value related to Constraints.GlobalConstraints
+
+    ## @var evaluation_state
+    # Object of CompiledSystem.EvaluationState type
+
+    ## @var cost
+    # Cost of the configuration (None if not evaluated yet)
+
+    ## CachedEvaluation class constructor
+    #   @param self The object pointer
+    def __init__(self):
+        self.performance = None
+        self.local_slack_value = None
+        self.global_slack_value = None
+        self.evaluation_state = None
+        self.cost = None
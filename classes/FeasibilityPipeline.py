@@ -0,0 +1,156 @@
+import time
+
+
+## FeasibilityStage
+#
+# Class used to represent one of the checks performed to establish if a
+# Solution.Configuration is feasible, together with the statistics
+# collected on its cost and on the number of rejected configurations
+class FeasibilityStage:
+
+    ## @var name
+    # Name of the check (used in log messages)
+
+    ## @var check
+    # Function receiving a CompiledSystem.EvaluationState object and
+    # returning True if the configuration passes the check (None if the
+    # check is performed outside the pipeline)
+
+    ## @var calls
+    # Number of performed checks
+
+    ## @var rejections
+    # Number of configurations rejected by the check
+
+    ## @var elapsed
+    # Total time spent in the check (in seconds)
+
+    ## FeasibilityStage class constructor
+    #   @param self The object pointer
+    #   @param name Name of the check
+    #   @param check Function performing the check (default: None)
+    def __init__(self, name, check=None):
+        self.name = name
+        self.check = check
+        self.calls = 0
+        self.rejections = 0
+        self.elapsed = 0.
+
+    ## Method to update the statistics of the stage
+    #   @param self The object pointer
+    #   @param elapsed Time spent in the check
+    #   @param passed True if the configuration passed the check
+    def update(self, elapsed, passed):
+        self.calls += 1
+        self.elapsed += elapsed
+        if not passed:
+            self.rejections += 1
+
+    ## Method to run the check, updating the statistics
+    #   @param self The object pointer
+    #   @param state A CompiledSystem.EvaluationState object
+    #   @return True if the configuration passes the check
+    def run(self, state):
+        start = time.perf_counter()
+        passed = self.check(state)
+        self.update(time.perf_counter() - start, passed)
+        return passed
+
+    ## Method to compute the expected time required to reject a
+    # configuration through the current check (the rejection rate is
+    # smoothed, so that checks never rejecting anything are not discarded
+    # after few calls)
+    #   @param self The object pointer
+    #   @return The score (the lower, the earlier the check should be run)
+    def get_score(self):
+        if self.calls == 0:
+            return 0.
+        rejection_rate = (self.rejections + 1) / (self.calls + 2)
+        return self.elapsed / self.calls / rejection_rate
+
+    ## Operator to convert a FeasibilityStage object into a string
+    #   @param self The object pointer
+    def __str__(self):
+        rate = self.rejections / self.calls if self.calls > 0 else 0.
+        cost = self.elapsed / self.calls * 1e6 if self.calls > 0 else 0.
+        return "{}: {} checks, {} rejections ({:.1%}), {:.1f} us/check".\
+            format(self.name, self.calls, self.rejections, rate, cost)
+
+
+## FeasibilityPipeline
+#
+# Class used to run the structural checks on a Solution.Configuration
+# (which do not depend on each other, so that they can be executed in any
+# order) and to collect the statistics of all the feasibility checks. The
+# order of the structural checks is periodically updated, so that the
+# cheapest checks rejecting most configurations are executed first
+class FeasibilityPipeline:
+
+    ## @var stages
+    # List of FeasibilityStage objects, sorted in execution order
+
+    ## @var final_stages
+    # List of FeasibilityStage objects corresponding to the checks that are
+    # performed, in a fixed order, after the pipeline (statistics only)
+
+    ## @var reorder_interval
+    # Number of runs after which the stages are sorted again
+
+    ## @var runs
+    # Number of runs of the pipeline
+
+    ## FeasibilityPipeline class constructor
+    #   @param self The object pointer
+    #   @param reorder_interval Number of runs after which the stages are
+    #                           sorted again (default: 100)
+    def __init__(self, reorder_interval=100):
+        self.stages = []
+        self.final_stages = []
+        self.reorder_interval = reorder_interval
+        self.runs = 0
+
+    ## Method to add a stage to the pipeline
+    #   @param self The object pointer
+    #   @param name Name of the check
+    #   @param check Function receiving a CompiledSystem.EvaluationState
+    #                object and returning True if the configuration passes
+    #                the check
+    def add_stage(self, name, check):
+        self.stages.append(FeasibilityStage(name, check))
+
+    ## Method to add a stage which is performed after the pipeline
+    #   @param self The object pointer
+    #   @param name Name of the check
+    #   @return The FeasibilityStage object, whose statistics should be
+    #           updated by the caller
+    def add_final_stage(self, name):
+        self.final_stages.append(FeasibilityStage(name))
+        return self.final_stages[-1]
+
+    ## Method to run all the stages, stopping at the first failing one
+    #   @param self The object pointer
+    #   @param state A CompiledSystem.EvaluationState object
+    #   @param logger Object of Logger type, used to print general messages
+    #   @return True if the configuration passes all checks
+    def run(self, state, logger):
+        self.runs += 1
+        if self.runs % self.reorder_interval == 0:
+            self.reorder()
+        for stage in self.stages:
+            logger.log(stage.name + " check", 4)
+            if not stage.run(state):
+                return False
+        return True
+
+    ## Method to sort the stages by increasing expected time required to
+    # reject a configuration (a new list is built, so that the pipelines 
+    # running concurrently are not affected)
+    #   @param self The object pointer
+    def reorder(self):
+        self.stages = sorted(self.stages, key=lambda stage: stage.get_score())
+
+    ## Operator to convert a FeasibilityPipeline object into a string
+    #   @param self The object pointer
+    def __str__(self):
+        return "Feasibility checks ({} runs): ".format(self.runs) + \
+            "; ".join(str(stage) for stage in self.stages + self.final_stages)
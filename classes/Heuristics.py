@@ -5,7 +5,8 @@ from external.Solid.Solid.SimulatedAnnealing import SimulatedAnnealing
 from external.Solid.Solid.GeneticAlgorithm import GeneticAlgorithm
 
 from classes.BaseHeuristics import BaseHeuristics
-from classes.Solution import Configuration, Result
+from classes.Solution import Result
+from classes.Move import Move
 import numpy as np
 import copy
 import time
@@ -28,13 +29,15 @@ class Tabu_Search(BaseHeuristics, TabuSearch):
     #   @param tabu_size The size of Tabu list
     #   @param max_score Maximum score that the algorithm will stop when it has been reached
     #   @param log Object of Logger.Logger type
+    #   @param **kwargs Additional keyword (e.g., the parameters of the
+    #                   BaseHeuristics executor exploring the neighborhood)
     def __init__(
             self, system, max_time, max_steps, 
             initial_state, tabu_size, max_score=None, 
             log=space4ai_logger.Logger(name="SPACE4AI-D-Tabu_Search"), 
             **kwargs
         ):
-        BaseHeuristics.__init__(self, system, "TabuSearch", log)
+        BaseHeuristics.__init__(self, system, "TabuSearch", log, **kwargs)
         TabuSearch.__init__(self, initial_state, tabu_size, max_steps, max_time, max_score)
         self.method = "random"
 
@@ -52,7 +55,7 @@ class Tabu_Search(BaseHeuristics, TabuSearch):
     #   @return The cost of current solution
     def _score(self, solution):
         self.counter_obj_evaluation += 1
-        return solution.objective_function(self.system)
+        return solution.objective_function(self.system, self.evaluation_cache)
 
     ## Method to run TS or LS
     #   @param self The object pointer
@@ -64,18 +67,21 @@ class Tabu_Search(BaseHeuristics, TabuSearch):
     def run_algorithm(self, **kwargs):
         self.logger.log("Run Tabu Search", 3)
         best_solution, best_cost, current_cost_list, best_cost_list, time_list = self.run(self.verbose, self.method)
+        self.shutdown_executor()
+        self.logger.log(str(self.evaluation_cache), 3)
+        self.logger.log(str(self.system.compiled.pipeline), 3)
         # initialize results
         result = Result()
         result.solution = best_solution
         self.logger.log("Start check feasibility: {}".format(time.time()), 3)
-        feasible = result.check_feasibility(self.system)
+        feasible = result.check_feasibility(self.system, cache=self.evaluation_cache)
         self.logger.log("End check feasibility: {}".format(time.time()), 3)
 
         if feasible:
             self.logger.log("Solution is feasible", 3)
             # compute cost
             self.logger.log("Compute cost", 3)
-            result.objective_function(self.system)
+            result.objective_function(self.system, self.evaluation_cache)
             self.counter_obj_evaluation += 1
 
         return result, current_cost_list, best_cost_list, time_list
@@ -98,13 +104,15 @@ class Local_Search(BaseHeuristics, TabuSearch):
     #   @param initial_state The initial solution obtained by RG as the starting point of LS
     #   @param max_score Maximum score that the algorithm will stop when it has been reached
     #   @param log Object of Logger.Logger type
+    #   @param **kwargs Additional keyword (e.g., the parameters of the
+    #                   BaseHeuristics executor exploring the neighborhood)
     def __init__(
             self, system, max_time, max_steps, 
             initial_state, min_score=None, 
             log=space4ai_logger.Logger(name="SPACE4AI-D-Local_Search"), 
             **kwargs
         ):
-        BaseHeuristics.__init__(self, system, "LocalSearch", log)
+        BaseHeuristics.__init__(self, system, "LocalSearch", log, **kwargs)
         tabu_size = 1
         TabuSearch.__init__(self, initial_state, tabu_size, max_steps, max_time, min_score)
         self.method = "best"
@@ -123,7 +131,7 @@ class Local_Search(BaseHeuristics, TabuSearch):
     #   @return The cost of current solution
     def _score(self, solution):
         self.counter_obj_evaluation += 1
-        return solution.objective_function(self.system)
+        return solution.objective_function(self.system, self.evaluation_cache)
 
     ## Method to run TS or LS
     #   @param self The object pointer
@@ -136,18 +144,21 @@ class Local_Search(BaseHeuristics, TabuSearch):
 
         self.logger.log("Run Local Search", 3)
         best_solution, best_cost, current_cost_list, best_cost_list, time_list = self.run(self.verbose, self.method)
+        self.shutdown_executor()
+        self.logger.log(str(self.evaluation_cache), 3)
+        self.logger.log(str(self.system.compiled.pipeline), 3)
         # initialize results
         result = Result()
         result.solution = best_solution
         self.logger.log("Start check feasibility: {}".format(time.time()), 3)
-        feasible = result.check_feasibility(self.system)
+        feasible = result.check_feasibility(self.system, cache=self.evaluation_cache)
         self.logger.log("End check feasibility: {}".format(time.time()), 3)
 
         if feasible:
             self.logger.log("Solution is feasible", 3)
             # compute cost
             self.logger.log("Compute cost", 3)
-            result.objective_function(self.system)
+            result.objective_function(self.system, self.evaluation_cache)
             self.counter_obj_evaluation += 1
         else:
             new_result = copy.deepcopy(result)
@@ -170,13 +181,15 @@ class Simulated_Annealing(BaseHeuristics, SimulatedAnnealing):
     #   @param schedule 'exponential' or 'linear' annealing schedule
     #   @param min_energy Minimum energy that the algorithm will stop when it has been reached
     #   @param log Object of Logger.Logger type
+    #   @param **kwargs Additional keyword (e.g., the parameters of the
+    #                   BaseHeuristics executor exploring the neighborhood)
     def __init__(
             self, system, max_time, max_steps, initial_state,
             temp_begin, schedule_constant, schedule, min_energy=None, 
             log=space4ai_logger.Logger(name="SPACE4AI-D-Simulated_Annealing"), 
             **kwargs
         ):
-        BaseHeuristics.__init__(self, system, "SimulatedAnnealing", log)
+        BaseHeuristics.__init__(self, system, "SimulatedAnnealing", log, **kwargs)
         SimulatedAnnealing.__init__(self, initial_state, temp_begin, schedule_constant,
                                     max_steps, max_time, min_energy, schedule)
 
@@ -200,7 +213,7 @@ class Simulated_Annealing(BaseHeuristics, SimulatedAnnealing):
     #   @return The cost of current solution
     def _energy(self, solution):
         self.counter_obj_evaluation += 1
-        return solution.objective_function(self.system)
+        return solution.objective_function(self.system, self.evaluation_cache)
 
     ## Method to run SA
     #   @param self The object pointer
@@ -212,18 +225,21 @@ class Simulated_Annealing(BaseHeuristics, SimulatedAnnealing):
     def run_algorithm(self, **kwargs):
         self.logger.log("Run Simulated Annealing", 3)
         best_solution, best_cost, current_cost_list, best_cost_list, time_list  = self.run(self.verbose)
+        self.shutdown_executor()
+        self.logger.log(str(self.evaluation_cache), 3)
+        self.logger.log(str(self.system.compiled.pipeline), 3)
         # initialize results
         result = Result()
         result.solution = best_solution
         self.logger.log("Start check feasibility: {}".format(time.time()), 3)
-        feasible = result.check_feasibility(self.system)
+        feasible = result.check_feasibility(self.system, cache=self.evaluation_cache)
         self.logger.log("End check feasibility: {}".format(time.time()), 3)
 
         if feasible:
             self.logger.log("Solution is feasible", 3)
             # compute cost
             self.logger.log("Compute cost", 3)
-            result.objective_function(self.system)
+            result.objective_function(self.system, self.evaluation_cache)
             self.counter_obj_evaluation += 1
         else:
             new_result = copy.deepcopy(result)
@@ -254,7 +270,7 @@ class Genetic_Algorithm(BaseHeuristics, GeneticAlgorithm):
             log=space4ai_logger.Logger(name="SPACE4AI-D-Genetic_Algorithm"), 
             **kwargs
         ):
-        BaseHeuristics.__init__(self, system, "Genetic_Algorithm", log)
+        BaseHeuristics.__init__(self, system, "Genetic_Algorithm", log, **kwargs)
         GeneticAlgorithm.__init__(self, crossover_rate, mutation_rate,
                                   max_steps, max_time, min_fitness)
         self.starting_point = initial_state
@@ -272,7 +288,7 @@ class Genetic_Algorithm(BaseHeuristics, GeneticAlgorithm):
     def _fitness(self, member):
 
         self.counter_obj_evaluation += 1
-        return member.objective_function(self.system)
+        return member.objective_function(self.system, self.evaluation_cache)
 
     ## Method to mutate a member randomly
     #   @param self The object pointer
@@ -305,40 +321,58 @@ class Genetic_Algorithm(BaseHeuristics, GeneticAlgorithm):
     def _crossover(self, parent1, parent2):
         # get a partition point randomly
         partition = np.random.randint(0, len(self.population[0].Y_hat) - 1)
-        part1 = copy.deepcopy(parent1.Y_hat[0:partition])
-        part2 = copy.deepcopy(parent2.Y_hat[partition:])
-        children = self.mix_parts(partition, part1, part2)
-
-        part1 = copy.deepcopy(parent2.Y_hat[0:partition])
-        part2 = copy.deepcopy(parent1.Y_hat[partition:])
-        children.extend(self.mix_parts(partition, part1, part2))
+        # get the assignments the children are derived from, without
+        # copying the parents
+        base1 = self._splice(parent1, parent2, partition)
+        base2 = self._splice(parent2, parent1, partition)
+        children = [Move(base1, moves) for moves in self.mix_parts(
+            partition, parent1.Y_hat[0:partition], parent2.Y_hat[partition:]
+        )]
+        children.extend([Move(base2, moves) for moves in self.mix_parts(
+            partition, parent2.Y_hat[0:partition], parent1.Y_hat[partition:]
+        )])
         solutions = []
         for child in children:
-            # creat a solution by new child (Y_hat)
-            new_solution = Configuration(child)
             # check if new solution is feasible
-            performance = new_solution.check_feasibility(self.system)
+            performance = child.check_feasibility(self.system, self.evaluation_cache)
             if performance[0]:
-                solutions.append(new_solution)
+                solutions.append(child.get_configuration())
 
         return solutions
 
+    ## Method to build the assignment whose first components are taken
+    # from a solution and the remaining ones from another solution
+    #   @param self The object pointer
+    #   @param solution1 Solution providing the first components
+    #   @param solution2 Solution providing the remaining components
+    #   @param partition Index of the first component taken from solution2
+    #   @return Object of Assignment.Assignment type (or list of 2D numpy
+    #           arrays, if the solutions cannot be represented in compact
+    #           form)
+    def _splice(self, solution1, solution2, partition):
+        assignment1 = solution1.get_assignment()
+        assignment2 = solution2.get_assignment()
+        if assignment1 is not None and assignment2 is not None:
+            return assignment1.splice(assignment2, partition)
+        return solution1.Y_hat[0:partition] + solution2.Y_hat[partition:]
+
     ## Method to mix two parts of two different solutions
     #   @param self The object pointer
     #   @param part1 a part of a solution
     #   @param part2 a part of a solution
-    #   @return A list of solutions
+    #   @return A list of children, each of them given by the list of moves
+    #           to be applied to the union of the two parts
     def mix_parts(self, partition, part1, part2):
         act_res1, act_CL1 = self.get_active_res_computationallayers(part1)
         act_res2, act_CL2 = self.get_active_res_computationallayers(part2)
 
         intersec_CL = set(act_CL1).intersection(act_CL2)
-        child1 = copy.deepcopy(part1 + part2)
+        child1 = []
         children = []
         two_child = False
         if intersec_CL is not None:
             for cl in intersec_CL:
-                res_idxs = [compLayer.resources for compLayer in self.system.CLs if compLayer.name == cl][0]
+                res_idxs = self.system.CLs[self.system.dic_map_CL_idx[cl]].resources
                 if res_idxs[0] >= self.system.FaaS_start_index:
                     continue
                 res_part1 = set(res_idxs).intersection(act_res1).pop()
@@ -348,20 +382,18 @@ class Genetic_Algorithm(BaseHeuristics, GeneticAlgorithm):
                 else:
                     if not two_child:
                         two_child = True
-                        child2 = copy.deepcopy(part1 + part2)
+                        child2 = []
                     # get all partitions of part2 that are running on res_part2
                     partitions2 = self.get_partitions_with_j(part2, res_part2)
                     # get all partitions that are running on res_part1
                     partitions1 = self.get_partitions_with_j(part1, res_part1)
                     # to create child1,
                     for part in partitions2:
-                        child1[part[0] + partition][part[1]][res_part2] = 0
-                        child1[part[0] + partition][part[1]][res_part1] = part1[partitions1[0][0]][partitions1[0][1]][
-                            res_part1]
+                        child1.append((part[0] + partition, part[1], res_part2, res_part1,
+                                       part1[partitions1[0][0]][partitions1[0][1]][res_part1]))
                     for part in partitions1:
-                        child2[part[0]][part[1]][res_part1] = 0
-
-                        child2[part[0]][part[1]][res_part2] = part2[partitions2[0][0]][partitions2[0][1]][res_part2]
+                        child2.append((part[0], part[1], res_part1, res_part2,
+                                       part2[partitions2[0][0]][partitions2[0][1]][res_part2]))
 
         children.append(child1)
         if two_child:
@@ -379,18 +411,20 @@ class Genetic_Algorithm(BaseHeuristics, GeneticAlgorithm):
 
         self.logger.log("Run Genetic Algorithm", 3)
         best_member, best_fitness, population, best_sol_cost_list, time_list  = self.run(self.verbose)
+        self.logger.log(str(self.evaluation_cache), 3)
+        self.logger.log(str(self.system.compiled.pipeline), 3)
         # initialize results
         result = Result()
         result.solution = best_member
         self.logger.log("Start check feasibility: {}".format(time.time()), 3)
-        feasible = result.check_feasibility(self.system)
+        feasible = result.check_feasibility(self.system, cache=self.evaluation_cache)
         self.logger.log("End check feasibility: {}".format(time.time()), 3)
 
         if feasible:
             self.logger.log("Solution is feasible", 3)
             # compute cost
             self.logger.log("Compute cost", 3)
-            result.objective_function(self.system)
+            result.objective_function(self.system, self.evaluation_cache)
             self.counter_obj_evaluation += 1
         else:
             new_result = copy.deepcopy(result)
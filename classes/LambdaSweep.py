@@ -0,0 +1,395 @@
+from external import space4ai_logger
+
+from classes.System import System
+from classes.MultiProcessing import MultiProcessing, _get_context
+from classes.Solution import Result, EliteResults
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing as mpp
+import numpy as np
+import os
+import sys
+
+
+## Sweep run by the current worker process
+_sweep = None
+
+
+## Function to initialize the worker processes of a sweep
+#   @param sweep The LambdaSweep object
+def _init_sweep_worker(sweep):
+    global _sweep
+    _sweep = sweep
+
+
+## Function to run a phase of the sweep for a given Lambda in a worker
+# process
+#   @param Lambda The incoming workload
+#   @param phase The phase to be run ("RG" or "Heu")
+#   @param starting_points The starting points of the heuristic phase, or
+#                          the solutions of the previous Lambda used to
+#                          warm-start the random greedy phase (if None, the
+#                          random greedy phase starts cold)
+#   @return The results returned by LambdaSweep.run_phase
+def _run_phase(Lambda, phase, starting_points):
+    return _sweep.run_phase(Lambda, phase, starting_points)
+
+
+## LambdaSweep
+#
+# Class used to optimize the placement of a system for a list of incoming
+# workloads (Lambda). The system description is parsed and compiled once,
+# and the system corresponding to each Lambda is derived in memory by the
+# worker processes (see System.with_lambda), without modifying the system
+# configuration file. The random greedy and the
+# heuristic phase of each Lambda are independent jobs, scheduled on a single
+# pool of worker processes that persists for the whole sweep: the heuristic
+# phase of a Lambda is submitted as soon as its random greedy phase
+# terminates. If the Lambdas are less than the cpu cores, each job runs on
+# multiple cores through MultiProcessing.
+# With the warm start, the sorted Lambdas are split into contiguous chains,
+# one for each worker, and the Lambdas of each chain are run in order: the
+# best solutions of a Lambda, with the clusters size adapted to the next
+# one, are added to the solutions found by its random greedy phase, whose
+# budget is reduced according to the number of them that are feasible
+class LambdaSweep:
+
+    ## @var system_json
+    # Json object with the system description
+
+    ## @var system
+    # Object of System.System type, compiled when the first sweep starts,
+    # from which the system corresponding to each Lambda is derived
+
+    ## @var system_file
+    # Name of the file with the system description
+
+    ## @var methods
+    # Dictionary of the methods (a dictionary with the name of the
+    # algorithm and all the required parameters), indexed by phase ("RG"
+    # and, optionally, "Heu")
+
+    ## @var logger
+    # Object of Logger type, used to print general messages
+
+    ## @var log_directory
+    # Directory of the log files of each Lambda ("" if the standard output
+    # is used)
+
+    ## @var output_directory
+    # Directory of the output files of each Lambda ("" if the solutions are
+    # printed on the standard output)
+
+    ## @var warm_start
+    # True if each Lambda of a chain is warm-started from the best solutions
+    # of the previous one
+
+    ## @var min_rg_budget
+    # Minimum fraction of the random greedy budget (iterations and time)
+    # used for the warm-started Lambdas
+
+    ## @var scheduling
+    # Scheduling of the work of each job among its cpu cores ("static" or
+    # "dynamic")
+
+    ## @var time_budget
+    # Use of the time budget of each job ("split" among its cpu cores or
+    # shared "deadline")
+
+    ## @var cpuCore
+    # The number of cpu cores to be used
+
+    ## @var workers
+    # The number of worker processes of the current sweep
+
+    ## @var cores_per_job
+    # The number of cpu cores used by each job of the current sweep
+
+    ## @var results
+    # Dictionary of the best results of the last sweep, indexed by Lambda
+
+    ## LambdaSweep class constructor
+    #   @param self The object pointer
+    #   @param system_json Json object with the system description
+    #   @param system_file Name of the file with the system description
+    #   @param RG_method Dictionary with the name and all the required
+    #                    parameters of the random greedy method
+    #   @param Heu_method Dictionary with the name and all the required
+    #                     parameters of the heuristic method (empty if
+    #                     only the random greedy is run)
+    #   @param log Object of Logger type
+    #   @param log_directory Directory of the log files of each Lambda
+    #                        (default: "", i.e., the standard output)
+    #   @param output_directory Directory of the output files of each
+    #                           Lambda (default: "", i.e., the standard
+    #                           output)
+    #   @param cpu_cores The number of cpu cores to be used (if None, all
+    #                    the cores of the current machine are used)
+    #   @param warm_start True if each Lambda should be warm-started from
+    #                     the best solutions of the previous one (default:
+    #                     False)
+    #   @param min_rg_budget Minimum fraction of the random greedy budget
+    #                        used for the warm-started Lambdas (default: 0.1)
+    #   @param scheduling Scheduling of the work of each job among its cpu
+    #                     cores, "static" or "dynamic" (default: "dynamic",
+    #                     see MultiProcessing.MultiProcessing)
+    #   @param time_budget Use of the time budget of each job, "split" among
+    #                      its cpu cores or shared "deadline" (default:
+    #                      "deadline", see MultiProcessing.MultiProcessing)
+    def __init__(self, system_json, system_file, RG_method, Heu_method,
+                 log=space4ai_logger.Logger(name="SPACE4AI-D-LambdaSweep"),
+                 log_directory="", output_directory="", cpu_cores=None,
+                 warm_start=False, min_rg_budget=0.1, scheduling="dynamic",
+                 time_budget="deadline"):
+        self.system_json = system_json
+        self.system = None
+        self.system_file = system_file
+        self.methods = {"RG": RG_method}
+        if len(Heu_method) > 0:
+            self.methods["Heu"] = Heu_method
+        self.logger = log
+        self.log_directory = log_directory
+        self.output_directory = output_directory
+        if not 0 < min_rg_budget <= 1:
+            self.logger.err(
+                "min_rg_budget must be in (0, 1] (provided: {})".\
+                    format(min_rg_budget)
+            )
+            sys.exit(1)
+        self.warm_start = warm_start
+        self.min_rg_budget = min_rg_budget
+        if scheduling not in ["static", "dynamic"]:
+            self.logger.err(
+                "Unknown scheduling {} (it can be 'static' or 'dynamic')".\
+                    format(scheduling)
+            )
+            sys.exit(1)
+        if time_budget not in ["split", "deadline"]:
+            self.logger.err(
+                "Unknown time budget {} (it can be 'split' or 'deadline')".\
+                    format(time_budget)
+            )
+            sys.exit(1)
+        self.scheduling = scheduling
+        self.time_budget = time_budget
+        if cpu_cores is None:
+            self.cpuCore = int(mpp.cpu_count())
+        else:
+            self.cpuCore = int(cpu_cores)
+        self.workers = self.cpuCore
+        self.cores_per_job = 1
+        self.results = {}
+
+    ## Method to get the logger of a given Lambda
+    #   @param self The object pointer
+    #   @param Lambda The incoming workload
+    #   @return The object of Logger type
+    def get_logger(self, Lambda):
+        if self.log_directory != "":
+            log_file = "LOG_" + str(round(float(Lambda), 4)) + ".log"
+            out_stream = open(os.path.join(self.log_directory, log_file), "a")
+        else:
+            out_stream = sys.stdout
+        return space4ai_logger.Logger(
+            name=self.logger.name,
+            out_stream=out_stream,
+            verbose=self.logger.verbose
+        )
+
+    ## Method to get the system corresponding to a given Lambda, derived from
+    # the system compiled by the parent process. The system is derived again
+    # by each phase, since the phases of a Lambda may run on different
+    # workers, which would otherwise keep it until the end of the sweep
+    #   @param self The object pointer
+    #   @param Lambda The incoming workload
+    #   @param logger The logger of the given Lambda
+    #   @return The object of System.System
+    def get_system(self, Lambda, logger):
+        return self.system.with_lambda(Lambda, logger)
+
+    ## Method to adapt the solutions found for the previous Lambda to the
+    # system of the current one: each solution is checked again and, if it
+    # is not feasible, its clusters are enlarged (one resource type at a
+    # time) until it becomes feasible; then, the clusters of the feasible
+    # solutions are reduced as much as possible
+    #   @param self The object pointer
+    #   @param solutions The list of Solution.Configuration objects found
+    #                    for the previous Lambda
+    #   @param S The object of System.System of the current Lambda
+    #   @param logger The logger of the current Lambda
+    #   @return The list of the corresponding Solution.Result objects
+    def adapt_solutions(self, solutions, S, logger):
+        results = []
+        for solution in solutions:
+            result = Result(logger)
+            result.solution = solution
+            result.check_feasibility(S)
+            for j in range(S.FaaS_start_index):
+                if result.performance[0]:
+                    break
+                result.increase_cluster_size(j, S)
+            if result.performance[0]:
+                for j in range(S.FaaS_start_index):
+                    result.reduce_cluster_size(j, S)
+                result.objective_function(S)
+            else:
+                # update the violation rate
+                result.check_feasibility(S)
+            results.append(result)
+        return results
+
+    ## Method to select the best results, as done by MultiProcessing (the
+    # feasible ones sorted by cost, if any, the others sorted by violation
+    # rate otherwise)
+    #   @param self The object pointer
+    #   @param results The list of Solution.Result objects
+    #   @param K The maximum number of results to be selected
+    #   @param logger The logger of the current Lambda
+    #   @return 1) A boolean to show if the best solution is feasible
+    #           2) A list of (at most) K best solutions
+    #           3) The result of the best solution
+    def select_results(self, results, K, logger):
+        feasible_found = any(result.performance[0] for result in results)
+        elite_sol = EliteResults(K, logger)
+        elite_sol.elite_results.add(Result(logger))
+        for result in results:
+            if result.performance[0] or not feasible_found:
+                elite_sol.add(result, feasible_found)
+        solutions = []
+        for sol in elite_sol.elite_results:
+            if feasible_found and sol.cost < np.inf:
+                solutions.append(sol.solution)
+            elif not feasible_found and sol.violation_rate < np.inf:
+                solutions.append(sol.solution)
+        return feasible_found, solutions, elite_sol.elite_results[0]
+
+    ## Method to run a phase for a given Lambda; if it is the last phase
+    # of the Lambda, the best solution is printed on the output file
+    #   @param self The object pointer
+    #   @param Lambda The incoming workload
+    #   @param phase The phase to be run ("RG" or "Heu")
+    #   @param starting_points The starting points of the heuristic phase,
+    #                          or the solutions of the previous Lambda used
+    #                          to warm-start the random greedy phase (if
+    #                          None, the random greedy phase starts cold)
+    #   @return 1) A boolean to show if the best solution is feasible
+    #           2) A list of k_best solutions
+    #           3) The result of the best solution
+    def run_phase(self, Lambda, phase, starting_points):
+        logger = self.get_logger(Lambda)
+        S = self.get_system(Lambda, logger)
+        method = dict(self.methods[phase])
+        method["parameters"] = dict(method["parameters"])
+        method["parameters"]["log"] = logger
+        warm_results = []
+        if phase == "RG" and starting_points is not None:
+            # adapt the solutions of the previous Lambda and reduce the
+            # random greedy budget accordingly
+            K = method["parameters"]["k_best"]
+            warm_results = self.adapt_solutions(starting_points, S, logger)
+            n_feasible = sum(result.performance[0] for result in warm_results)
+            fraction = max(self.min_rg_budget, 1 - n_feasible / K)
+            logger.log("Warm start: {} feasible solutions, {:.0%} of the RG budget".\
+                           format(n_feasible, fraction))
+            method["parameters"]["max_steps"] = max(
+                int(method["parameters"]["max_steps"] * fraction), 1
+            )
+            method["parameters"]["max_time"] *= fraction
+        elif starting_points is not None:
+            method["parameters"]["starting_point"] = starting_points
+        if self.cores_per_job > 1:
+            MP = MultiProcessing(method, self.scheduling, self.time_budget,
+                                 cpu_cores=self.cores_per_job)
+        else:
+            MP = MultiProcessing(method, "static", self.time_budget,
+                                 cpu_cores=1)
+        feasible_found, solutions, result = MP.run(self.system_file, S)
+        if len(warm_results) > 0:
+            # merge the random greedy and the warm-start solutions
+            for solution in solutions:
+                rg_result = Result(logger)
+                rg_result.solution = solution
+                if rg_result.check_feasibility(S)[0]:
+                    rg_result.objective_function(S)
+                warm_results.append(rg_result)
+            feasible_found, solutions, result = self.select_results(
+                warm_results, method["parameters"]["k_best"], logger
+            )
+        if phase == "Heu" or not feasible_found or "Heu" not in self.methods:
+            if result.solution is None:
+                logger.log("No solution is found.")
+            else:
+                output_json = ""
+                if self.output_directory != "":
+                    output_json = os.path.join(
+                        self.output_directory,
+                        "Lambda_" + str(round(float(Lambda), 4)) + ".json"
+                    )
+                result.print_result(S, solution_file=output_json)
+        if logger.out_stream != sys.stdout:
+            logger.out_stream.close()
+        return feasible_found, solutions, result
+
+    ## Method to run the sweep over a list of Lambdas
+    #   @param self The object pointer
+    #   @param Lambda_list The list of incoming workloads
+    #   @return The dictionary of the best results, indexed by Lambda
+    def run(self, Lambda_list):
+        self.results = {}
+        if self.system is None and len(Lambda_list) > 0:
+            self.system = System(system_json=self.system_json,
+                                 Lambda=float(Lambda_list[0]), log=self.logger)
+        self.workers = max(min(self.cpuCore, len(Lambda_list)), 1)
+        self.cores_per_job = max(int(self.cpuCore / max(len(Lambda_list), 1)), 1)
+        # get the Lambdas to be started immediately and, with the warm
+        # start, the Lambda following each one in its chain
+        next_Lambda = {}
+        starting_points = {}
+        if self.warm_start:
+            sorted_Lambdas = sorted(Lambda_list)
+            first_Lambdas = []
+            chain_length = int(len(sorted_Lambdas) / self.workers)
+            remainder = len(sorted_Lambdas) % self.workers
+            next_idx = 0
+            for w in range(self.workers):
+                chain = sorted_Lambdas[next_idx: next_idx + chain_length + (w < remainder)]
+                next_idx += len(chain)
+                first_Lambdas.append(chain[0])
+                for Lambda, following in zip(chain[:-1], chain[1:]):
+                    next_Lambda[Lambda] = following
+        else:
+            first_Lambdas = list(Lambda_list)
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=_get_context(),
+                                 initializer=_init_sweep_worker,
+                                 initargs=(self,)) as executor:
+            jobs = {}
+            for Lambda in first_Lambdas:
+                self.logger.log(f"Current Lambda is {Lambda} req/s")
+                job = executor.submit(_run_phase, Lambda, "RG", None)
+                jobs[job] = (Lambda, "RG")
+            while len(jobs) > 0:
+                done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                for job in done:
+                    Lambda, phase = jobs.pop(job)
+                    feasible_found, solutions, result = job.result()
+                    if phase == "RG" and not feasible_found:
+                        self.logger.err(
+                            "No feasible solution is found by RG (Lambda = {})".\
+                                format(Lambda)
+                        )
+                    elif phase == "RG" and "Heu" in self.methods:
+                        job = executor.submit(_run_phase, Lambda, "Heu", solutions)
+                        jobs[job] = (Lambda, "Heu")
+                        starting_points[Lambda] = solutions
+                        continue
+                    self.results[Lambda] = result
+                    # start the next Lambda of the chain (if any), from the
+                    # solutions of the last phase and the starting points
+                    # of the heuristic phase
+                    if Lambda in next_Lambda:
+                        solutions = solutions + starting_points.pop(Lambda, [])
+                        Lambda = next_Lambda[Lambda]
+                        self.logger.log(f"Current Lambda is {Lambda} req/s")
+                        job = executor.submit(_run_phase, Lambda, "RG", solutions)
+                        jobs[job] = (Lambda, "RG")
+        return self.results
@@ -0,0 +1,117 @@
+from external import space4ai_logger
+
+from classes.Assignment import Assignment
+from classes.Solution import Configuration
+import copy
+
+
+## Move
+#
+# Class used to represent a candidate Solution.Configuration (e.g., a
+# neighbor of the current solution) as the assignment it is derived from
+# plus the list of changes to be applied to it. The base assignment is
+# shared with the original configurations and never modified, so that
+# candidates can be generated without copying it. The new configuration is
+# built only when the candidate is evaluated, relying on the compact
+# Assignment.Assignment representation whenever possible: the full list of
+# 2D numpy arrays (Y_hat) is thus materialized only for the candidates that
+# are accepted and used afterwards
+class Move:
+
+    ## @var base
+    # Object of Assignment.Assignment type (or list of 2D numpy arrays)
+    # storing the assignment the candidate is derived from
+
+    ## @var moves
+    # List of tuples (component index, partition index, source resource
+    # index, destination resource index, number of resources) describing
+    # how the candidate is obtained from the base assignment
+
+    ## @var parent
+    # Solution.Configuration object corresponding to the base assignment
+    # (None if not available), used for the incremental evaluation of the
+    # candidate
+
+    ## @var logger
+    # Object of Logger type, passed to the new Solution.Configuration
+
+    ## @var configuration
+    # Solution.Configuration object corresponding to the candidate (None if
+    # not built yet)
+
+    ## Move class constructor
+    #   @param self The object pointer
+    #   @param base Object of Assignment.Assignment type (or list of 2D
+    #               numpy arrays), as returned by Move.get_base
+    #   @param moves List of moves (default: None, i.e., empty list)
+    #   @param parent Solution.Configuration object corresponding to the
+    #                 base assignment (optional)
+    #   @param log Object of Logger type
+    def __init__(
+            self, base, moves=None, parent=None,
+            log=space4ai_logger.Logger(name="SPACE4AI-D-Configuration")
+        ):
+        self.base = base
+        self.moves = [] if moves is None else moves
+        self.parent = parent
+        self.logger = log
+        self.configuration = None
+
+    ## Method to get the assignment that can be shared by all the candidates
+    # derived from a configuration
+    #   @param solution A Solution.Configuration object
+    #   @return Object of Assignment.Assignment type (or the list of 2D numpy
+    #           arrays if the configuration cannot be represented in compact
+    #           form)
+    @staticmethod
+    def get_base(solution):
+        assignment = solution.get_assignment()
+        if assignment is not None:
+            return assignment
+        return solution.Y_hat
+
+    ## Method to add a move to the candidate
+    #   @param self The object pointer
+    #   @param i Index of the Graph.Component
+    #   @param h Index of the Graph.Component.Partition
+    #   @param source Index of the source Resources.Resource
+    #   @param destination Index of the destination Resources.Resource
+    #   @param number Number of destination resources
+    def add(self, i, h, source, destination, number):
+        self.moves.append((i, h, source, destination, number))
+        self.configuration = None
+
+    ## Method to get the Solution.Configuration corresponding to the
+    # candidate, which is built (once) if not available
+    #   @param self The object pointer
+    #   @return The Solution.Configuration object
+    def get_configuration(self):
+        if self.configuration is None:
+            if isinstance(self.base, Assignment):
+                assignment = self.base.copy()
+                if assignment.apply(self.moves):
+                    self.configuration = Configuration(
+                        None, self.logger, assignment=assignment
+                    )
+                    return self.configuration
+                Y_hat = self.base.to_Y_hat()
+            else:
+                Y_hat = copy.deepcopy(self.base)
+            for i, h, source, destination, number in self.moves:
+                Y_hat[i][h][source] = 0
+                Y_hat[i][h][destination] = number
+            self.configuration = Configuration(Y_hat, self.logger)
+        return self.configuration
+
+    ## Method to check the feasibility of the candidate, incrementally with
+    # respect to the parent configuration if available
+    #   @param self The object pointer
+    #   @param S A System.System object
+    #   @param cache An EvaluationCache.EvaluationCache object storing the
+    #                configurations evaluated so far (optional)
+    #   @return The performance tuple returned by
+    #           Solution.Configuration.check_feasibility
+    def check_feasibility(self, S, cache=None):
+        return self.get_configuration().check_feasibility(
+            S, self.parent, self.moves, cache=cache
+        )
@@ -0,0 +1,563 @@
+from external import space4ai_logger
+
+from classes.System import System
+from classes.AlgorithmPool import AlgPool
+from classes.Solution import Result, EliteResults
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mpp
+import numpy as np
+import functools
+import json
+import os
+import sys
+import time
+
+
+## Budget shared by the workers of the dynamic scheduler, given by a tuple
+# (lock, unused iterations, unused time, number of units not started yet)
+_budget = None
+
+
+## System shared (read-only) by the workers, given by a tuple (system,
+# data sizes of the DAG edges) set by the parent process before the pool is
+# created, so that forked workers inherit it instead of rebuilding it
+_shared_system = None
+
+
+## Function to get the multiprocessing context used to create the pools of
+# workers (fork, if available, so that the shared system is inherited
+# copy-on-write). The pools are concurrent.futures.ProcessPoolExecutor
+# objects, whose workers are not daemonic and can therefore start the
+# process workers exploring the neighborhood of the solutions
+#   @return The multiprocessing context
+def _get_context():
+    if "fork" in mpp.get_all_start_methods():
+        return mpp.get_context("fork")
+    return mpp.get_context()
+
+
+## Function to get the system to be used by a worker: the system inherited
+# from the parent process (with the original data sizes of the DAG edges,
+# which the algorithms can modify, and the logger of the worker) or, if it
+# is not available, a new system loaded from the configuration file
+#   @param system_file Name of the file with the system description
+#   @param logger Logger of the worker
+#   @return The object of System.System
+def _get_system(system_file, logger):
+    if _shared_system is None:
+        with open(system_file, "r") as a_file:
+            json_object = json.load(a_file)
+        return System(system_json=json_object, log=logger)
+    S, data_sizes = _shared_system
+    _reset_system(S, data_sizes, logger)
+    return S
+
+
+## Function to restore the original data sizes of the DAG edges of a system
+# and to set its logger
+#   @param S The object of System.System
+#   @param data_sizes Dictionary of the original data sizes, indexed by edge
+#   @param logger Logger to be used by the system
+def _reset_system(S, data_sizes, logger):
+    for (u, v), data_size in data_sizes.items():
+        S.graph.G[u][v]["data_size"] = data_size
+    S.logger = logger
+    S.compiled.PE.logger = logger
+
+
+## Function to initialize the workers of the dynamic scheduler
+#   @param budget The shared budget
+def _init_worker(budget):
+    global _budget
+    _budget = budget
+
+
+## Function to claim the share of the unused budget (returned by the units
+# that terminated early) which is assigned to a unit when it starts
+#   @return The additional number of iterations and time, and the number of
+#           units not started yet (including the current one)
+def _claim_budget():
+    lock, steps, max_time, pending = _budget
+    with lock:
+        n_pending = pending.value
+        extra_steps = int(steps.value / n_pending)
+        extra_time = max_time.value / n_pending
+        steps.value -= extra_steps
+        max_time.value -= extra_time
+        pending.value -= 1
+    return extra_steps, extra_time, n_pending
+
+
+## Function to return to the shared budget the iterations and time not used
+# by a unit
+#   @param unused_steps Number of unused iterations
+#   @param unused_time Unused time
+def _release_budget(unused_steps, unused_time):
+    lock, steps, max_time, pending = _budget
+    with lock:
+        steps.value += max(unused_steps, 0)
+        max_time.value += max(unused_time, 0)
+
+
+## MultiProcessing
+#
+# Class used to run an algorithm on all the cpu cores of the current
+# machine. With the static scheduling, the iterations, the time and the
+# starting points are split in advance among the cores. With the dynamic
+# scheduling, the work is divided into units (a starting point, or a group
+# of starting points for the genetic algorithm, or a seed for the algorithms
+# without starting points) that the workers pull from a shared queue as soon
+# as they are idle; the iterations and the time not used by the units that
+# terminate early are redistributed among the units not started yet.
+# The time budget can be split among the cores (so that the total cpu time
+# is equal to the required duration) or given by a deadline shared by all
+# workers (so that the run lasts for the required duration, with all cores
+# busy). With a single core and the static scheduling, the algorithm runs in
+# the current process. The cpu cores not used by the workers (when there are
+# fewer units than cores) are left to the workers exploring the neighborhood
+# of the solutions, if required by the method
+class MultiProcessing:
+
+    ## @var method
+    # Dictionary includes the name of algorithm and all the required
+    # parameters
+
+    ## @var StartingPoints
+    # Some starting point(s) as initial solution(s)
+
+    ## @var logger
+    # The Object of Logger.Logger type
+
+    ## @var cpuCore
+    # The number of cpu cores to be used (by default, all the cores of the
+    # current machine)
+
+    ## @var scheduling
+    # Scheduling of the work among the cpu cores ("static" or "dynamic")
+
+    ## @var time_budget
+    # Use of the time budget ("split" among the cores or shared
+    # "deadline")
+
+    ## @var deadline
+    # Absolute time (as returned by time.time) when the current run must
+    # stop (None if not set)
+
+    ## @var workers
+    # Number of worker processes of the current run
+
+    ## @var worker_statistics
+    # Dictionary storing, for each worker process of the last run, the
+    # number of completed units and the time spent running them
+
+    ## MultiProcessing class constructor
+    #   @param self The object pointer
+    #   @param method A dictionary includes the name of algorithm and all the required parameters
+    #   @param scheduling Scheduling of the work among the cpu cores,
+    #                     "static" or "dynamic" (default: "dynamic")
+    #   @param time_budget Use of the time budget, "split" among the cores
+    #                      or shared "deadline" (default: "deadline")
+    #   @param cpu_cores The number of cpu cores to be used (if None, all
+    #                    the cores of the current machine are used)
+    def __init__(self, method, scheduling="dynamic", time_budget="deadline",
+                 cpu_cores=None):
+        self.method = method
+        if cpu_cores is None:
+            self.cpuCore = int(mpp.cpu_count())
+        else:
+            self.cpuCore = int(cpu_cores)
+        if "starting_point" in self.method["parameters"]:
+            self.StartingPoints = self.method["parameters"]["starting_point"]
+        else:
+            self.StartingPoints = None
+        self.logger = self.method["parameters"]["log"]
+        if scheduling not in ["static", "dynamic"]:
+            self.logger.err(
+                "Unknown scheduling {} (it can be 'static' or 'dynamic')".\
+                    format(scheduling)
+            )
+            sys.exit(1)
+        self.scheduling = scheduling
+        if time_budget not in ["split", "deadline"]:
+            self.logger.err(
+                "Unknown time budget {} (it can be 'split' or 'deadline')".\
+                    format(time_budget)
+            )
+            sys.exit(1)
+        self.time_budget = time_budget
+        self.deadline = None
+        self.workers = self.cpuCore
+        self._core_params = self._get_core_params()
+        self.worker_statistics = {}
+
+    ## Method to get the name of the log file of the r-th core (or unit)
+    #   @param self The object pointer
+    #   @param r Index of the core (or unit)
+    #   @param n Total number of cores (or units)
+    #   @return The name of the log file ("" if the standard output is used)
+    def _get_log_file(self, r, n):
+        logger = self.method["parameters"]["log"]
+        if logger.out_stream != sys.stdout:
+            if n > 1 and logger.verbose > 0:
+                log_file = ".".join(logger.out_stream.name.split(".")[:-1])
+                log_file += "_" + str(r) + ".log"
+            else:
+                log_file = logger.out_stream.name
+        else:
+            log_file = ""
+        return log_file
+
+    ## Function to get a list whose n-th element stores a tuple with the number
+    # of iterations to be performed by the n-th cpu core and the seed it should
+    # use for random numbers generation
+    #   @param iteration Total number of iterations to be performed
+    #   @param seed Seed for random number generation
+    #   @param cpuCore Total number of cpu cores
+    #   @param logger Current logger
+    #   @return The list of parameters required by each core (number of
+    #           iterations, seed and logger)
+    def _get_core_params(self):
+        iteration = self.method["parameters"]["max_steps"]
+        Max_time = self.method["parameters"]["max_time"]
+        seed = self.method["parameters"]["seed"]
+        core_params = []
+        local_itr = int(iteration / self.cpuCore)
+        remainder_itr = iteration % self.cpuCore
+        if self.time_budget == "split":
+            local_Max_time = Max_time / self.cpuCore
+        else:
+            local_Max_time = Max_time
+        if self.StartingPoints:
+            local_StartingPoints = int(len(self.StartingPoints) / self.cpuCore)
+            remainder_StartingPoints = len(self.StartingPoints) % self.cpuCore
+        next_idx = 0
+        for r in range(self.cpuCore):
+            log_file = self._get_log_file(r, self.cpuCore)
+            r_seed = r * r * self.cpuCore * self.cpuCore * seed
+            if r < remainder_itr:
+                current_local_itr = local_itr + 1
+            else:
+                current_local_itr = local_itr
+
+            if self.StartingPoints:
+                if r < remainder_StartingPoints:
+                    current_local_StartingPoints = local_StartingPoints + 1
+                else:
+                    current_local_StartingPoints = local_StartingPoints
+                starting_points = self.StartingPoints[next_idx: next_idx + current_local_StartingPoints]
+                next_idx = next_idx + current_local_StartingPoints
+                core_params.append((current_local_itr, local_Max_time, r_seed, log_file, starting_points))
+            else:
+                core_params.append((current_local_itr, local_Max_time, r_seed, log_file))
+        return core_params
+
+    ## Method to get the list of work units of the dynamic scheduling
+    #   @param self The object pointer
+    #   @return The list of parameters of each unit (index, initial number
+    #           of iterations, initial time, seed, log file and starting
+    #           points)
+    def _get_units(self):
+        iteration = self.method["parameters"]["max_steps"]
+        Max_time = self.method["parameters"]["max_time"]
+        seed = self.method["parameters"]["seed"]
+        # get the starting points of each unit
+        if not self.StartingPoints:
+            units_StartingPoints = [None] * self.cpuCore
+        elif self.method["name"] in list(
+                i for i in AlgPool.algorithms if AlgPool.algorithms[i] == AlgPool.algorithms["GA"]):
+            # the starting points are the initial population of the genetic
+            # algorithm, thus they are split as in the static scheduling
+            units_StartingPoints = [p[4] for p in self._core_params if len(p[4]) > 0]
+        else:
+            units_StartingPoints = [[sp] for sp in self.StartingPoints]
+        n_units = len(units_StartingPoints)
+        # the iterations are split among the units, while each worker runs
+        # for the time assigned to a core by the static scheduling (the time
+        # of the units is set when they start if the deadline is used)
+        n_workers = min(self.cpuCore, n_units)
+        local_Max_time = Max_time / self.cpuCore * n_workers / n_units
+        units = []
+        for u, starting_points in enumerate(units_StartingPoints):
+            local_itr = int(iteration / n_units)
+            if u < iteration % n_units:
+                local_itr += 1
+            u_seed = u * u * self.cpuCore * self.cpuCore * seed
+            log_file = self._get_log_file(u, n_units)
+            units.append((u, local_itr, local_Max_time, u_seed, log_file, starting_points))
+        return units
+
+    ## Method to get a copy of the method parameters used by the workers of
+    # the current run, where the number of workers exploring the
+    # neighborhood of the solutions (if required) is limited to the cpu
+    # cores assigned to each worker (no neighborhood workers are used if a
+    # single core is available)
+    #   @param self The object pointer
+    #   @return The dictionary includes the name and all required parameters of the method
+    def _get_worker_method(self):
+        method = dict(self.method)
+        method["parameters"] = dict(self.method["parameters"])
+        requested = method["parameters"].get("neighborhood_workers", 0)
+        if requested > 0:
+            cores = self.cpuCore // self.workers
+            neighborhood_workers = min(requested, cores) if cores > 1 else 0
+            if neighborhood_workers < requested:
+                self.logger.log(
+                    "{} neighborhood workers used for each of the {} workers ({} required)".\
+                        format(neighborhood_workers, self.workers, requested),
+                    1
+                )
+            method["parameters"]["neighborhood_workers"] = neighborhood_workers
+        return method
+
+    ## Method to run the algorithem on a specific core
+    #   @param core_params The core params
+    #   @param system_file Name of the file with the system description
+    #   @param method The dictionary includes the name and all required parameters of the method
+    #   @return A list of results
+    def run_alg(self, core_params, system_file, method):
+        method["parameters"]["seed"] = core_params[2]
+        method["parameters"]["deadline"] = self.deadline
+        core_logger = method["parameters"]["log"]
+        if core_params[3] not in ["", getattr(core_logger.out_stream, "name", "")]:
+            log_file = open(core_params[3], "a")
+            core_logger.out_stream = log_file
+            method["parameters"]["log"] = core_logger
+        core_logger.log("Seed: " + str(core_params[2]))
+        core_logger.log("Iteration number: " + str(core_params[0]))
+        S = _get_system(system_file, core_logger)
+        method["parameters"]["system"] = S
+        if self.StartingPoints:
+            elite_sol = EliteResults(
+                1,
+                space4ai_logger.Logger(
+                    name="SPACE4AI-D",
+                    out_stream=core_logger.out_stream,
+                    verbose=core_logger.verbose
+                )
+            )
+            elite_sol.elite_results.add(Result(core_logger))
+            if self.method["name"] in list(
+                    i for i in AlgPool.algorithms if AlgPool.algorithms[i] == AlgPool.algorithms["GA"]):
+                if len(core_params[4]) > 0:
+                    method["parameters"]["initial_state"] = core_params[4]
+                    method["parameters"]["max_steps"] = core_params[0]
+                    method["parameters"]["max_time"] = core_params[1]
+                    algorithm = AlgPool.create(method["name"], **method["parameters"])
+                    result = algorithm.run_algorithm()
+                    elite_sol.add(result[0])
+            else:
+                for sp_idx, initial_state in enumerate(core_params[4]):
+                    method["parameters"]["initial_state"] = initial_state
+                    method["parameters"]["max_steps"] = int(core_params[0] / len(core_params[4]))
+                    if self.deadline is None:
+                        method["parameters"]["max_time"] = core_params[1] / len(core_params[4])
+                    else:
+                        # share the remaining time among the remaining
+                        # starting points
+                        method["parameters"]["max_time"] = max(self.deadline - time.time(), 0) / \
+                            (len(core_params[4]) - sp_idx)
+                    algorithm = AlgPool.create(method["name"], **method["parameters"])
+                    result = algorithm.run_algorithm()
+                    elite_sol.add(result[0])
+            results = elite_sol.elite_results[0], elite_sol
+        else:
+
+            method["parameters"]["max_steps"] = core_params[0]
+            method["parameters"]["max_time"] = core_params[1]
+            algorithm = AlgPool.create(method["name"], **method["parameters"])
+            results = algorithm.run_algorithm()
+
+        return results
+
+    ## Method to run a unit of the dynamic scheduling, with its initial
+    # budget plus its share of the unused budget
+    #   @param self The object pointer
+    #   @param unit The unit params
+    #   @param system_file Name of the file with the system description
+    #   @param method The dictionary includes the name and all required parameters of the method
+    #   @return 1) The index of the unit
+    #           2) The results of the algorithm
+    #           3) The process identifier of the worker
+    #           4) The time spent running the unit
+    def run_unit(self, unit, system_file, method):
+        start = time.time()
+        u, local_itr, local_Max_time, u_seed, log_file, starting_points = unit
+        extra_steps, extra_time, n_pending = _claim_budget()
+        local_itr += extra_steps
+        if self.deadline is None:
+            local_Max_time += extra_time
+        else:
+            # share the remaining time among the units not started yet
+            local_Max_time = max(self.deadline - start, 0) * \
+                min(1, self.workers / n_pending)
+        method["parameters"]["seed"] = u_seed
+        method["parameters"]["deadline"] = self.deadline
+        core_logger = method["parameters"]["log"]
+        log_stream = None
+        if log_file != "":
+            # the workers run many units, thus the log file of each unit is
+            # closed when the unit terminates
+            log_stream = open(log_file, "a")
+            core_logger.out_stream = log_stream
+            method["parameters"]["log"] = core_logger
+        try:
+            core_logger.log("Seed: " + str(u_seed))
+            core_logger.log("Iteration number: " + str(local_itr))
+            S = _get_system(system_file, core_logger)
+            method["parameters"]["system"] = S
+            # at least one iteration is required if no time is available
+            method["parameters"]["max_steps"] = max(local_itr, 1)
+            method["parameters"]["max_time"] = local_Max_time
+            if starting_points is not None:
+                # units are reproducible regardless of the worker running them
+                np.random.seed(u_seed)
+                if self.method["name"] in list(
+                        i for i in AlgPool.algorithms if AlgPool.algorithms[i] == AlgPool.algorithms["GA"]):
+                    method["parameters"]["initial_state"] = starting_points
+                else:
+                    method["parameters"]["initial_state"] = starting_points[0]
+                elite_sol = EliteResults(
+                    1,
+                    space4ai_logger.Logger(
+                        name="SPACE4AI-D",
+                        out_stream=core_logger.out_stream,
+                        verbose=core_logger.verbose
+                    )
+                )
+                elite_sol.elite_results.add(Result(core_logger))
+                algorithm = AlgPool.create(method["name"], **method["parameters"])
+                result = algorithm.run_algorithm()
+                elite_sol.add(result[0])
+                results = elite_sol.elite_results[0], elite_sol
+                # return the budget not used by the algorithm, if it terminated
+                # early
+                unused_time = 0.
+                if self.deadline is None:
+                    unused_time = local_Max_time - (time.time() - start)
+                _release_budget(local_itr - algorithm.cur_steps, unused_time)
+            else:
+                algorithm = AlgPool.create(method["name"], **method["parameters"])
+                results = algorithm.run_algorithm()
+        finally:
+            if log_stream is not None:
+                log_stream.close()
+        return u, results, os.getpid(), time.time() - start
+
+    ## Method to run the units of the dynamic scheduling on a pool of
+    # workers, collecting the results in the units order
+    #   @param self The object pointer
+    #   @param system_file Name of the file with the system description
+    #   @return The list of results of all units
+    def run_dynamic(self, system_file):
+        units = self._get_units()
+        budget = (mpp.Lock(), mpp.Value("l", 0, lock=False),
+                  mpp.Value("d", 0., lock=False),
+                  mpp.Value("l", len(units), lock=False))
+        full_result = [None] * len(units)
+        self.worker_statistics = {}
+        self.workers = min(self.cpuCore, len(units))
+        method = self._get_worker_method()
+        start = time.time()
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=_get_context(),
+                                 initializer=_init_worker,
+                                 initargs=(budget,)) as executor:
+            partial_gp = functools.partial(self.run_unit, system_file=system_file, method=method)
+            futures = [executor.submit(partial_gp, unit) for unit in units]
+            for future in as_completed(futures):
+                u, results, pid, elapsed = future.result()
+                full_result[u] = results
+                units_count, busy = self.worker_statistics.get(pid, (0, 0.))
+                self.worker_statistics[pid] = (units_count + 1, busy + elapsed)
+        self.log_worker_statistics(time.time() - start)
+        return full_result
+
+    ## Method to print the utilization of the workers of the last run
+    #   @param self The object pointer
+    #   @param elapsed Total running time
+    def log_worker_statistics(self, elapsed):
+        for w, pid in enumerate(sorted(self.worker_statistics)):
+            units_count, busy = self.worker_statistics[pid]
+            utilization = busy / elapsed if elapsed > 0 else 0.
+            self.logger.log(
+                "Worker {}: {} units, busy {:.2f} s over {:.2f} s ({:.1%})".\
+                    format(w, units_count, busy, elapsed, utilization),
+                1
+            )
+
+    ## Method to run the algorithems in multi-processing manner
+    #   @param self The object pointer
+    #   @param system_file Name of the file with the system description
+    #   @param system The object of System.System, shared by all workers
+    #                 (if None, it is loaded from system_file once, before
+    #                 the workers are started)
+    #   @return 1) A boolean to show if the best solution is feasible
+    #           2) A list of k_best solutions
+    #           3) The result of the best solution
+    def run(self, system_file, system=None):
+        global _shared_system
+        solutions = []
+        feasible_found = False
+        elite_sol = []
+        self.deadline = None
+        if self.time_budget == "deadline" and self.method["parameters"]["max_time"] > 0:
+            self.deadline = time.time() + self.method["parameters"]["max_time"]
+        if system is None:
+            system = System(system_file=system_file, log=self.logger)
+        system_logger = system.logger
+        _shared_system = (
+            system,
+            {(u, v): d["data_size"] for u, v, d in system.graph.G.edges(data=True)}
+        )
+        try:
+            if self.scheduling == "static" and self.cpuCore == 1:
+                # the parameters are copied, as they are modified by run_alg
+                self.workers = 1
+                method = self._get_worker_method()
+                full_result = [self.run_alg(self._core_params[0], system_file, method)]
+            elif self.scheduling == "static":
+                self.workers = self.cpuCore
+                method = self._get_worker_method()
+                with ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=_get_context()) as executor:
+                    partial_gp = functools.partial(self.run_alg, system_file=system_file, method=method)
+                    full_result = list(executor.map(partial_gp, self._core_params))
+            else:
+                full_result = self.run_dynamic(system_file)
+        finally:
+            # the system is left as it was found, since the algorithm may
+            # have run in the current process
+            _reset_system(*_shared_system, system_logger)
+            _shared_system = None
+        self.logger.log("Multiprocessing ends.", 1)
+        first_unfeasible = False
+        # get final list combining the results of all threads
+        for tid in range(len(full_result)):
+            if feasible_found:
+                if full_result[tid][1].elite_results[0].performance[0]:
+                    elite_sol.merge(full_result[tid][1], True)
+            else:
+                if full_result[tid][1].elite_results[0].performance[0]:
+                    feasible_found = True
+                    elite_sol = EliteResults(full_result[tid][1].K)
+                    elite_sol.elite_results.add(Result())
+                    elite_sol.add(full_result[tid][1].elite_results[0])
+                else:
+                    if not first_unfeasible:
+                        elite_sol = EliteResults(full_result[tid][1].K)
+                        elite_sol.elite_results.add(Result())
+                        elite_sol.add(full_result[tid][1].elite_results[0], feasible_found)
+                        first_unfeasible = True
+                    else:
+                        elite_sol.merge(full_result[tid][1], False)
+
+        if feasible_found:
+            for sol in elite_sol.elite_results:
+                if sol.cost < np.inf:
+                    solutions.append(sol.solution)
+        else:
+            for sol in elite_sol.elite_results:
+                if sol.violation_rate < np.inf:
+                    solutions.append(sol.solution)
+
+        return feasible_found, solutions, elite_sol.elite_results[0]
@@ -78,14 +78,18 @@ class QTPerformanceEvaluator(BasePerformanceModel):
     #   @param S A System.System object
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
+    #   @param utilization 1D numpy array storing the utilization of all 
+    #                      Resources.Resource objects (optional)
     #   @param **kwargs Additional (unused) keyword arguments
     #   @return The dictionary of the required features
-    def get_features(self, *, c_idx, p_idx, r_idx, S, Y_hat, **kwargs):
+    def get_features(self, *, c_idx, p_idx, r_idx, S, Y_hat, 
+                     utilization=None, **kwargs):
         features = {"i": c_idx,
                     "h": p_idx,
                     "j": r_idx,
                     "Y_hat": Y_hat,
-                    "S": S}
+                    "S": S,
+                    "utilization": utilization}
         return features
     
     ## Method to compute the utilization of a specific 
@@ -113,10 +117,13 @@ class QTPerformanceEvaluator(BasePerformanceModel):
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
     #   @param S A System.System object
+    #   @param utilization 1D numpy array storing the utilization of all 
+    #                      Resources.Resource objects (if None, the 
+    #                      utilization of the current resource is computed)
     #   @param **kwargs Additional (unused) keyword arguments
     #   @return Response time
     @abstractmethod
-    def predict(self, *, i, h, j, Y_hat, S, **kwargs):
+    def predict(self, *, i, h, j, Y_hat, S, utilization=None, **kwargs):
         pass
     
 
@@ -166,11 +173,17 @@ class ServerFarmPE(QTPerformanceEvaluator):
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
     #   @param S A System.System object
+    #   @param utilization 1D numpy array storing the utilization of all 
+    #                      Resources.Resource objects (if None, the 
+    #                      utilization of the current resource is computed)
     #   @param **kwargs Additional (unused) keyword arguments
     #   @return Response time
-    def predict(self, *, i, h, j, Y_hat, S, **kwargs):
-        # compute the utilization
-        utilization = self.compute_utilization(j, Y_hat, S)
+    def predict(self, *, i, h, j, Y_hat, S, utilization=None, **kwargs):
+        # compute the utilization (if not available)
+        if utilization is None:
+            utilization = self.compute_utilization(j, Y_hat, S)
+        else:
+            utilization = utilization[j]
         # compute the response time
         r = 0.
         if Y_hat[i][h,j] > 0:
@@ -223,11 +236,17 @@ class EdgePE(QTPerformanceEvaluator):
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
     #   @param S A System.System object
+    #   @param utilization 1D numpy array storing the utilization of all 
+    #                      Resources.Resource objects (if None, the 
+    #                      utilization of the current resource is computed)
     #   @param **kwargs Additional (unused) keyword arguments
     #   @return Response time
-    def predict(self, *, i, h, j, Y_hat, S, **kwargs):
-        # compute utilization
-         utilization = self.compute_utilization(j, Y_hat, S)
+    def predict(self, *, i, h, j, Y_hat, S, utilization=None, **kwargs):
+        # compute utilization (if not available)
+         if utilization is None:
+             utilization = self.compute_utilization(j, Y_hat, S)
+         else:
+             utilization = utilization[j]
         # compute response time
          r = 0.
          if Y_hat[i][h,j] > 0:
@@ -261,8 +280,13 @@ class SystemPerformanceEvaluator:
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
     #   @param c_idx The index of the current component
+    #   @param utilization 1D numpy array storing the utilization of all 
+    #                      Resources.Resource objects (optional)
+    #   @param context A PerformanceModels.EvaluationContext object 
+    #                  describing the current evaluation (optional)
     #   @return Response time
-    def get_perf_evaluation(self, S, Y_hat, c_idx):
+    def get_perf_evaluation(self, S, Y_hat, c_idx, utilization=None, 
+                            context=None):
         
         # check if the memory constraints are satisfied
         self.logger.log("Evaluating component {}".format(c_idx), 5)
@@ -284,7 +308,9 @@ class SystemPerformanceEvaluator:
             if r_idx < S.FaaS_start_index:
                 PM = S.performance_models[c_idx][p_idx][r_idx]
                 features = PM.get_features(c_idx=c_idx, p_idx=p_idx,
-                                           r_idx=r_idx, S=S, Y_hat=Y_hat)
+                                           r_idx=r_idx, S=S, Y_hat=Y_hat,
+                                           utilization=utilization,
+                                           context=context)
                 p = PM.predict(**features)
                 self.logger.log("features: {}".format(features), 7)
             else:
@@ -321,12 +347,18 @@ class SystemPerformanceEvaluator:
     #   @param S A System.System object
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
+    #   @param utilization 1D numpy array storing the utilization of all 
+    #                      Resources.Resource objects (computed if None)
     #   @return 1D numpy array with the response times of all components
-    def compute_performance(self, S, Y_hat):
+    def compute_performance(self, S, Y_hat, utilization=None):
         I = len(Y_hat)
         response_times = np.full(I, np.inf)
+        # compute the utilization of all resources once
+        if utilization is None:
+            utilization = S.compiled.utilization(*S.compiled.flatten(Y_hat))
         for i in range(I):
-            response_times[i] = self.get_perf_evaluation(S, Y_hat, i)
+            response_times[i] = self.get_perf_evaluation(S, Y_hat, i, 
+                                                         utilization)
         return response_times
 
 
@@ -340,36 +372,48 @@ class SystemPerformanceEvaluator:
     #   @param data_size Amount of transferred data
     #   @return Network transfer time
     def get_network_delay(self, cpm1_resource, cpm2_resource, S, data_size):
+        network_delay = self.get_network_delays([cpm1_resource], 
+                                                [cpm2_resource], 
+                                                S, [data_size])
+        return float(network_delay[0])
+    
+    
+    ## Method to evaluate the network delays due to the transfer of data 
+    # between several pairs of resources, relying on the characteristics of 
+    # the network domains shared by the computational layers, which are 
+    # collected in System.System
+    #   @param self The object pointer
+    #   @param cpm1_resources Resource indices of the first components
+    #   @param cpm2_resources Resource indices of the second components
+    #   @param S A System.System object
+    #   @param data_sizes Amounts of transferred data
+    #   @return 1D numpy array of network transfer times
+    def get_network_delays(self, cpm1_resources, cpm2_resources, S, 
+                           data_sizes):
        
-        # get the names of the computational layers where the two resources 
+        # get the indices of the computational layers where the resources 
         # are located
-        CL1 = S.resources[cpm1_resource].CLname
-        CL2 = S.resources[cpm2_resource].CLname
-        
-        # get the lists of network domains containing the two computational 
-        # layers and compute their intersection
-        ND1 = list(filter(lambda NT: (CL1 in NT.computationallayers), S.network_technologies))
-        ND2 = list(filter(lambda NT: (CL2 in NT.computationallayers), S.network_technologies))
-        ND = list(set(ND1).intersection(ND2))
+        CL1 = S.resource_CL[cpm1_resources]
+        CL2 = S.resource_CL[cpm2_resources]
       
         # there must exist a common network domain, otherwise the components
         # cannot communicate with each other
-        if len(ND) == 0:
+        available = S.network_available[CL1, CL2]
+        if not available.all():
+            k = np.nonzero(~available)[0][0]
             self.logger.err("ERROR: no network domain available between {} and {}".\
-                           format(cpm1_resource, cpm2_resource))
+                           format(cpm1_resources[k], cpm2_resources[k]))
             sys.exit(1)
-        # if only one domain is common to the two layers, evaluate the 
-        # network delay on that domain
-        elif len(ND) == 1:
-            network_delay = ND[0].evaluate_performance(data_size)
-        else:
-            # else, the network transfer time is the minimum among the times 
-            # required with the different network domains
-            network_delay = float("inf")
-            for nd in ND:
-                new_network_delay = nd.evaluate_performance(data_size)
-                if new_network_delay < network_delay:
-                   network_delay = new_network_delay 
         
-        return network_delay
+        # the network transfer time is the minimum among the times required 
+        # with the different network domains (missing domains have infinite 
+        # access delay)
+        data_sizes = np.asarray(data_sizes, dtype=float)[:, np.newaxis]
+        network_delays = NetworkPerformanceEvaluator().predict(
+            access_delay=S.network_access_delay[CL1, CL2],
+            bandwidth=S.network_bandwidth[CL1, CL2],
+            data=data_sizes
+        )
+        
+        return network_delays.min(axis=1)
 
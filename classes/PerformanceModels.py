@@ -40,6 +40,15 @@ class BasePerformanceModel(ABC):
     def predict(self, **features):
         pass
     
+    ## Method to get the inputs required to tabulate the model predictions 
+    # for all the numbers of resources that can be assigned to a partition
+    #   @param self The object pointer
+    #   @param **attributes Attributes that are used to retrieve the inputs
+    #   @return List of inputs, the k-th one corresponding to k+1 resources 
+    #           (None if the predictions cannot be tabulated)
+    def get_table_inputs(self, **attributes):
+        return None
+    
     ## Operator to convert a BasePerformanceModel object into a string
     #   @param self The object pointer
     def __str__(self):
@@ -47,3 +56,56 @@ class BasePerformanceModel(ABC):
             format(self.keyword)
         return s
 
+
+
+## EvaluationContext
+#
+# Class used to describe why the response time of a Graph.Component object 
+# is being evaluated (i.e., to check a Constraints.LocalConstraint, to check 
+# a Constraints.GlobalConstraint or to report the solution), so that 
+# performance models can adapt their predictions accordingly
+class EvaluationContext:
+    
+    ## @var kind
+    # Type of evaluation (EvaluationContext.LOCAL, EvaluationContext.GLOBAL 
+    # or EvaluationContext.REPORT)
+    
+    ## @var path
+    # List of the indices of the Graph.Component objects in the path of the 
+    # Constraints.GlobalConstraint being evaluated (None otherwise)
+    
+    LOCAL = "local"
+    GLOBAL = "global"
+    REPORT = "report"
+    
+    ## EvaluationContext class constructor
+    #   @param self The object pointer
+    #   @param kind Type of evaluation (default: EvaluationContext.REPORT)
+    #   @param path List of the indices of the Graph.Component objects in 
+    #               the path of a Constraints.GlobalConstraint (default: None)
+    def __init__(self, kind=REPORT, path=None):
+        self.kind = kind
+        self.path = path
+    
+    ## Method to check if the mean response time of the given partition 
+    # should be used instead of its prediction, namely if the partition is 
+    # followed by other partitions of the same component (for local 
+    # constraints) or if the component is not the last of the path (for 
+    # global constraints)
+    #   @param self The object pointer
+    #   @param c_idx Index of the Graph.Component object
+    #   @param p_idx Index of the Graph.Component.Partition object
+    #   @param S A System.System object
+    #   @return True if the mean response time is required
+    def mean_time_required(self, c_idx, p_idx, S):
+        if self.kind == EvaluationContext.GLOBAL:
+            return c_idx in self.path and c_idx != self.path[-1]
+        if self.kind == EvaluationContext.LOCAL:
+            for LC in S.local_constraints:
+                if c_idx == LC.component_idx:
+                    for dep in S.components[c_idx].deployments:
+                        if p_idx in dep.partitions_indices and \
+                                len(dep.partitions_indices) > 1 and \
+                                p_idx != dep.partitions_indices[-1]:
+                            return True
+        return False
@@ -1,9 +1,9 @@
 from classes.PerformanceModels import BasePerformanceModel
+from classes.PersistentCache import get_persistent_cache
 from abc import abstractmethod
 import importlib
 from math import log10
-import inspect
-import pdb
+import numpy as np
 
 ## BasePredictor
 #
@@ -19,6 +19,14 @@ class BasePredictor(BasePerformanceModel):
     ## @var predictor
     # Object that performs the prediction
     
+    ## @var columns
+    # Names of the inputs of the regressor used for prediction (None if the 
+    # predictor does not rely on a regressor)
+    
+    ## @var predictions
+    # Dictionary storing the predictions already computed by the regressor, 
+    # indexed by the tuple of its inputs
+    
     ## BasePredictor class constructor
     #   @param self The object pointer
     #   @param keyword Keyword identifying the model
@@ -28,6 +36,8 @@ class BasePredictor(BasePerformanceModel):
         super().__init__(keyword)
         self.module_name = module_name
         self.predictor = None
+        self.columns = None
+        self.predictions = {}
 
 
     ## Method to get a dictionary with the features required by the predict 
@@ -46,6 +56,77 @@ class BasePredictor(BasePerformanceModel):
     @abstractmethod
     def predict(self, **features):
         pass
+    
+    ## Method to get the inputs of the regressor corresponding to the given 
+    # features
+    #   @param self The object pointer
+    #   @param **features Model features
+    #   @return Tuple of regressor inputs (None if the predictor does not 
+    #           rely on a regressor)
+    def get_model_input(self, **features):
+        return None
+    
+    ## Method to predict the response time through the regressor, given its 
+    # inputs. Predictions are stored, so that the regressor is called only 
+    # once for each set of inputs
+    #   @param self The object pointer
+    #   @param model_input Tuple of regressor inputs
+    #   @return Predicted response time
+    def predict_from_input(self, model_input):
+        if model_input not in self.predictions:
+            pd = importlib.import_module("pandas")
+            data = pd.DataFrame(data=[list(model_input)], columns=self.columns)
+            self.predictions[model_input] = self.predictor.predict_from_df(
+                data, self.regressor_file
+            )
+        return self.predictions[model_input]
+
+
+## Function to compute in a batch the predictions required by a list of 
+# (predictor, features) pairs. The inputs of the predictors relying on the 
+# same regressor file are collected in a single DataFrame, so that only one 
+# call to the regressor is issued for each file, and the results are stored 
+# in the predictors
+#   @param requests List of tuples (BasePredictor object, dictionary of 
+#                   features returned by its get_features method)
+def predict_batch(requests):
+    inputs_requests = []
+    for model, features in requests:
+        if getattr(model, "columns", None) is None or \
+                features.get("mean_time_required"):
+            continue
+        inputs_requests.append((model, model.get_model_input(**features)))
+    predict_inputs_batch(inputs_requests)
+
+
+## Function to compute in a batch the predictions corresponding to a list of 
+# (predictor, regressor inputs) pairs, issuing only one call to the 
+# regressor for each regressor file. The results are stored in the 
+# predictors
+#   @param requests List of tuples (BasePredictor object, tuple of regressor 
+#                   inputs)
+def predict_inputs_batch(requests):
+    # group the inputs which are not available yet by regressor file
+    groups = {}
+    for model, model_input in requests:
+        if model_input not in model.predictions:
+            key = (model.regressor_file, tuple(model.columns))
+            groups.setdefault(key, []).append((model, model_input))
+    # predict all inputs of each group at once
+    if len(groups) > 0:
+        pd = importlib.import_module("pandas")
+    for (regressor_file, columns), pending in groups.items():
+        inputs = list(dict.fromkeys(model_input for _, model_input in pending))
+        data = pd.DataFrame(data=[list(x) for x in inputs], 
+                            columns=list(columns))
+        model = pending[0][0]
+        results = np.asarray(model.predictor.predict_from_df(data, 
+                                                             regressor_file))
+        # scatter the results back to the predictors
+        position = {model_input: k for k, model_input in enumerate(inputs)}
+        for model, model_input in pending:
+            k = position[model_input]
+            model.predictions[model_input] = results[k:k + 1]
 
 
 ## FaaSPredictor
@@ -71,27 +152,16 @@ class FaaSPredictor(BasePredictor):
     #   @param p_idx Index of the Graph.Component.Partition object
     #   @param r_idx Index of the Resources.Resource object
     #   @param S A System.System object
+    #   @param context A PerformanceModels.EvaluationContext object 
+    #                  describing the current evaluation (default: None)
     #   @param **kwargs Additional (unused) keyword arguments
     #   @return The dictionary of the required features
-    def get_features(self, *, c_idx, p_idx, r_idx, S, **kwargs):
-        ### New ###
+    def get_features(self, *, c_idx, p_idx, r_idx, S, context=None, 
+                     **kwargs):
+        # check if the mean time is required in the current context
         flag = False
-        current_frame = inspect.currentframe()
-        caller_frame = inspect.getouterframes(current_frame)
-        class_name = caller_frame[2].frame.f_locals["self"].__class__.__name__
-        if len(S.global_constraints) > 0 and class_name == S.global_constraints[0].__class__.__name__:
-            # pdb.set_trace()
-            if c_idx in caller_frame[2].frame.f_locals["self"].path and c_idx != \
-                    caller_frame[2].frame.f_locals["self"].path[-1]:
-                flag = True
-        elif len(S.local_constraints) > 0 and class_name == S.local_constraints[0].__class__.__name__:
-            for LC in S.local_constraints:
-                if c_idx == LC.component_idx:
-                    for dep in S.components[c_idx].deployments:
-                        if p_idx in dep.partitions_indices and len(dep.partitions_indices) > 1:
-                            if p_idx != dep.partitions_indices[-1]:
-                                flag = True
-                                break
+        if context is not None:
+            flag = context.mean_time_required(c_idx, p_idx, S)
         c = S.components[c_idx].name
         p = S.components[c_idx].partitions[p_idx].name
         r = S.resources[r_idx].name
@@ -128,6 +198,10 @@ class FaaSPredictorPacsltk(FaaSPredictor):
     ## @var predictor
     # Object that performs the prediction
     
+    ## @var cache
+    # PersistentCache.PersistentCache object storing the predictions 
+    # computed so far (possibly in previous runs or by other processes)
+    
     ## FaaSPredictorPacsltk class constructor
     #   @param self The object pointer
     #   @param **kwargs Additional (unused) keyword arguments
@@ -135,6 +209,7 @@ class FaaSPredictorPacsltk(FaaSPredictor):
         super().__init__("PACSLTK", "pacsltk.perfmodel")
         predictor_module = importlib.import_module(self.module_name)
         self.predictor = predictor_module.get_sls_warm_count_dist
+        self.cache = get_persistent_cache("pacsltk")
 
     ## Method to evaluate the object performance through the class predictor
     #   @param self The object pointer
@@ -148,9 +223,15 @@ class FaaSPredictorPacsltk(FaaSPredictor):
     #   @return Predicted response time
     def predict(self, *, arrival_rate, warm_service_time, cold_service_time,
                 time_out, **kwargs):
-        perf = self.predictor(arrival_rate, warm_service_time, 
-                              cold_service_time, time_out)
-        return perf[0]["avg_resp_time"]
+        inputs = (float(arrival_rate), float(warm_service_time), 
+                  float(cold_service_time), float(time_out))
+        avg_resp_time = self.cache.get(inputs)
+        if avg_resp_time is None:
+            perf = self.predictor(arrival_rate, warm_service_time, 
+                                  cold_service_time, time_out)
+            avg_resp_time = float(perf[0]["avg_resp_time"])
+            self.cache.put(inputs, avg_resp_time)
+        return avg_resp_time
 
 
 ## FaaSPredictorMLlib
@@ -178,10 +259,24 @@ class FaaSPredictorMLlib(FaaSPredictor):
         )
         self.regressor_file = regressor_file
         self.mean_time = meanTime
+        self.columns = "Lambda,warm_service_time,cold_service_time,expiration_time".split(",")
         predictor_module = importlib.import_module(self.module_name)
         self.predictor = predictor_module.Predictor(regressor_file,
                                                     "/tmp", False)
     
+    ## Method to get the inputs of the regressor corresponding to the given 
+    # features
+    #   @param self The object pointer
+    #   @param * Positional arguments are not accepted
+    #   @param arrival_rate Arrival rate of requests
+    #   @param **kwargs Additional (unused) keyword arguments
+    #   @return Tuple of regressor inputs
+    def get_model_input(self, *, arrival_rate, **kwargs):
+        warm_service_time = 2
+        cold_service_time = 3
+        time_out = 600
+        return (arrival_rate, warm_service_time, cold_service_time, time_out)
+    
     ## Method to evaluate the object performance through the class predictor
     #   @param self The object pointer
     #   @param * Positional arguments are not accepted
@@ -195,20 +290,9 @@ class FaaSPredictorMLlib(FaaSPredictor):
     def predict(self, *, arrival_rate, mean_time_required, **kwargs):
         if mean_time_required:
             return self.mean_time
-        pd = importlib.import_module("pandas")
-        warm_service_time = 2
-        cold_service_time = 3
-        time_out = 600
-        columns = "Lambda,warm_service_time,cold_service_time,expiration_time".split(",")
-        data = pd.DataFrame(data=[[arrival_rate, 
-                                   warm_service_time,
-                                   cold_service_time,
-                                   time_out]],
-                            columns=columns)
-        #columns = ["Lambda"]
-        #data = pd.DataFrame(data=[[arrival_rate]], columns=columns)
-
-        return self.predictor.predict_from_df(data, self.regressor_file)
+        return self.predict_from_input(
+            self.get_model_input(arrival_rate=arrival_rate)
+        )
     
     ## Operator to convert a FaaSPredictorMLlib object into a string
     #   @param self The object pointer
@@ -243,6 +327,7 @@ class CoreBasedPredictor(BasePredictor):
         self.regressor_file = regressor_file
         ### New ###
         self.mean_time = meanTime
+        self.columns = "cores,log(cores)".split(",")
         predictor_module = importlib.import_module(self.module_name)
         self.predictor = predictor_module.Predictor(regressor_file,
                                                     "/tmp", False)
@@ -257,32 +342,19 @@ class CoreBasedPredictor(BasePredictor):
     #   @param S A System.System object
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
+    #   @param context A PerformanceModels.EvaluationContext object 
+    #                  describing the current evaluation (default: None)
     #   @param **kwargs Additional (unused) keyword arguments
     #   @return The dictionary of the required features
-    def get_features(self, *, c_idx, p_idx, r_idx, S, Y_hat, **kwargs):
+    def get_features(self, *, c_idx, p_idx, r_idx, S, Y_hat, context=None,
+                     **kwargs):
         n_res = Y_hat[c_idx][p_idx, r_idx]
         cores_per_res = S.resources[r_idx].n_cores
         cores = n_res * cores_per_res
-        ### New ###
-        # Check if the component is a part of constraints
+        # check if the mean time is required in the current context
         flag = False
-        current_frame = inspect.currentframe()
-        caller_frame = inspect.getouterframes(current_frame)
-        class_name = caller_frame[2].frame.f_locals["self"].__class__.__name__
-        if len(S.global_constraints) > 0 and class_name == S.global_constraints[0].__class__.__name__:
-            #pdb.set_trace()
-            if c_idx in caller_frame[2].frame.f_locals["self"].path and c_idx != \
-                    caller_frame[2].frame.f_locals["self"].path[-1]:
-                flag = True
-
-        elif len(S.local_constraints) > 0 and class_name == S.local_constraints[0].__class__.__name__:
-            for LC in S.local_constraints:
-                if c_idx == LC.component_idx:
-                    for dep in S.components[c_idx].deployments:
-                        if p_idx in dep.partitions_indices and len(dep.partitions_indices) > 1:
-                            if p_idx != dep.partitions_indices[-1]:
-                                flag = True
-                                break
+        if context is not None:
+            flag = context.mean_time_required(c_idx, p_idx, S)
 
         features = {"cores": cores,
                     "log_cores": log10(cores),
@@ -300,10 +372,39 @@ class CoreBasedPredictor(BasePredictor):
         ### New ###
         if mean_time_required:
             return self.mean_time
-        pd = importlib.import_module("pandas")
-        columns = "cores,log(cores)".split(",")
-        data = pd.DataFrame(data=[[cores, log_cores]], columns=columns)
-        return self.predictor.predict_from_df(data, self.regressor_file)
+        return self.predict_from_input(
+            self.get_model_input(cores=cores, log_cores=log_cores)
+        )
+    
+    ## Method to get the inputs of the regressor corresponding to the given 
+    # features
+    #   @param self The object pointer
+    #   @param * Positional arguments are not accepted
+    #   @param cores Number of cores assigned to the object
+    #   @param log_cores Logarithm of the number of cores
+    #   @param **kwargs Additional (unused) keyword arguments
+    #   @return Tuple of regressor inputs
+    def get_model_input(self, *, cores, log_cores, **kwargs):
+        return (cores, log_cores)
+    
+    ## Method to get the inputs of the regressor for all the numbers of 
+    # resources that can be assigned to a partition
+    #   @param self The object pointer
+    #   @param * Positional arguments are not accepted
+    #   @param c_idx Index of the Graph.Component object
+    #   @param p_idx Index of the Graph.Component.Partition object
+    #   @param r_idx Index of the Resources.Resource object
+    #   @param S A System.System object
+    #   @param **kwargs Additional (unused) keyword arguments
+    #   @return List of tuples of regressor inputs, the k-th one 
+    #           corresponding to k+1 resources
+    def get_table_inputs(self, *, c_idx, p_idx, r_idx, S, **kwargs):
+        inputs = []
+        for n_res in range(1, S.resources[r_idx].number + 1):
+            cores = n_res * S.resources[r_idx].n_cores
+            inputs.append(self.get_model_input(cores=cores, 
+                                               log_cores=log10(cores)))
+        return inputs
     
     ## Operator to convert a FaaSPredictorMLlib object into a string
     #   @param self The object pointer
@@ -338,6 +439,7 @@ class LambdaBasedPredictor(BasePredictor):
         self.regressor_file = regressor_file
         ### New ###
         self.mean_time = meanTime
+        self.columns = "cores,observed_throughput".split(",")
         predictor_module = importlib.import_module(self.module_name)
         self.predictor = predictor_module.Predictor(regressor_file,
                                                     "/tmp", False)
@@ -352,33 +454,20 @@ class LambdaBasedPredictor(BasePredictor):
     #   @param S A System.System object
     #   @param Y_hat Matrix denoting the amount of Resources assigned to each 
     #                Graph.Component.Partition object
+    #   @param context A PerformanceModels.EvaluationContext object 
+    #                  describing the current evaluation (default: None)
     #   @param **kwargs Additional (unused) keyword arguments
     #   @return The dictionary of the required features
-    def get_features(self, *, c_idx, p_idx, r_idx, S, Y_hat, **kwargs):
+    def get_features(self, *, c_idx, p_idx, r_idx, S, Y_hat, context=None,
+                     **kwargs):
         n_res = Y_hat[c_idx][p_idx, r_idx]
         cores_per_res = S.resources[r_idx].n_cores
         cores = n_res * cores_per_res
         part_lambda = S.components[c_idx].partitions[p_idx].part_Lambda
-        ### New ###
-        # Check if the component is a part of constraints
+        # check if the mean time is required in the current context
         flag = False
-        current_frame = inspect.currentframe()
-        caller_frame = inspect.getouterframes(current_frame)
-        class_name = caller_frame[2].frame.f_locals["self"].__class__.__name__
-        if len(S.global_constraints) > 0 and class_name == S.global_constraints[0].__class__.__name__:
-            #pdb.set_trace()
-            if c_idx in caller_frame[2].frame.f_locals["self"].path and c_idx != \
-                    caller_frame[2].frame.f_locals["self"].path[-1]:
-                flag = True
-
-        elif len(S.local_constraints) > 0 and class_name == S.local_constraints[0].__class__.__name__:
-            for LC in S.local_constraints:
-                if c_idx == LC.component_idx:
-                    for dep in S.components[c_idx].deployments:
-                        if p_idx in dep.partitions_indices and len(dep.partitions_indices) > 1:
-                            if p_idx != dep.partitions_indices[-1]:
-                                flag = True
-                                break
+        if context is not None:
+            flag = context.mean_time_required(c_idx, p_idx, S)
 
         features = {"cores": cores,
                     "mean_time_required": flag,
@@ -396,10 +485,42 @@ class LambdaBasedPredictor(BasePredictor):
         ### New ###
         if mean_time_required:
             return self.mean_time
-        pd = importlib.import_module("pandas")
-        columns = "cores,observed_throughput".split(",")
-        data = pd.DataFrame(data=[[cores, observed_throughput]], columns=columns)
-        return self.predictor.predict_from_df(data, self.regressor_file)
+        return self.predict_from_input(
+            self.get_model_input(cores=cores, 
+                                 observed_throughput=observed_throughput)
+        )
+    
+    ## Method to get the inputs of the regressor corresponding to the given 
+    # features
+    #   @param self The object pointer
+    #   @param * Positional arguments are not accepted
+    #   @param cores Number of cores assigned to the object
+    #   @param observed_throughput Observed throughput
+    #   @param **kwargs Additional (unused) keyword arguments
+    #   @return Tuple of regressor inputs
+    def get_model_input(self, *, cores, observed_throughput, **kwargs):
+        return (cores, observed_throughput)
+    
+    ## Method to get the inputs of the regressor for all the numbers of 
+    # resources that can be assigned to a partition
+    #   @param self The object pointer
+    #   @param * Positional arguments are not accepted
+    #   @param c_idx Index of the Graph.Component object
+    #   @param p_idx Index of the Graph.Component.Partition object
+    #   @param r_idx Index of the Resources.Resource object
+    #   @param S A System.System object
+    #   @param **kwargs Additional (unused) keyword arguments
+    #   @return List of tuples of regressor inputs, the k-th one 
+    #           corresponding to k+1 resources
+    def get_table_inputs(self, *, c_idx, p_idx, r_idx, S, **kwargs):
+        part_lambda = S.components[c_idx].partitions[p_idx].part_Lambda
+        inputs = []
+        for n_res in range(1, S.resources[r_idx].number + 1):
+            cores = n_res * S.resources[r_idx].n_cores
+            inputs.append(self.get_model_input(
+                cores=cores, observed_throughput=part_lambda
+            ))
+        return inputs
     
     ## Operator to convert a FaaSPredictorMLlib object into a string
     #   @param self The object pointer
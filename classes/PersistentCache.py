@@ -0,0 +1,193 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+## Dictionary of the PersistentCache objects created so far, indexed by name
+_caches = {}
+
+
+## Function to get the PersistentCache object with the given name, which is
+# shared by all the objects of the current process that request it
+#   @param name Name of the cache
+#   @return The PersistentCache object
+def get_persistent_cache(name):
+    if name not in _caches:
+        _caches[name] = PersistentCache(name)
+    return _caches[name]
+
+
+## PersistentCache
+#
+# Class used to store on disk the results of expensive computations, indexed
+# by the content of their inputs. Results are stored in a SQLite database in
+# the directory specified by the SPACE4AI_D_CACHE_DIR environment variable
+# (default: ~/.cache/space4ai-d), so that they are shared by all processes
+# and runs; setting the variable to an empty string disables the disk
+# storage. When the number of stored results exceeds the value of the
+# SPACE4AI_D_CACHE_SIZE environment variable (default: 100000), the least
+# recently used ones are removed
+class PersistentCache:
+
+    ## @var name
+    # Name of the cache (used as table name)
+
+    ## @var path
+    # Path to the SQLite database (None if the disk storage is disabled)
+
+    ## @var max_entries
+    # Maximum number of results stored on disk
+
+    ## @var memory
+    # Dictionary storing the results already used by the current process
+
+    ## @var connections
+    # Dictionary storing the connections to the SQLite database opened by
+    # the threads of the current process, indexed by thread identifier
+    # (SQLite connections cannot be shared among threads)
+
+    ## @var pid
+    # Identifier of the process that opened the connections
+
+    ## @var insertions
+    # Number of results stored since the last size check
+
+    ## PersistentCache class constructor
+    #   @param self The object pointer
+    #   @param name Name of the cache
+    #   @param cache_dir Directory where the database is stored (default:
+    #                    None, i.e., given by SPACE4AI_D_CACHE_DIR)
+    #   @param max_entries Maximum number of results stored on disk
+    #                      (default: None, i.e., given by
+    #                      SPACE4AI_D_CACHE_SIZE)
+    def __init__(self, name, cache_dir=None, max_entries=None):
+        self.name = name
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                "SPACE4AI_D_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "space4ai-d")
+            )
+        if max_entries is None:
+            max_entries = int(os.environ.get("SPACE4AI_D_CACHE_SIZE", 100000))
+        self.max_entries = max_entries
+        self.path = None
+        if cache_dir != "" and max_entries > 0:
+            self.path = os.path.join(cache_dir, "cache.sqlite")
+        self.memory = {}
+        self.connections = {}
+        self.pid = None
+        self.insertions = 0
+
+    ## Method to get the state of the object to be pickled (the connections
+    # to the database cannot be shared among processes)
+    #   @param self The object pointer
+    #   @return Dictionary storing the object state
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["connections"] = {}
+        state["pid"] = None
+        return state
+
+    ## Method to compute the key corresponding to the given inputs
+    #   @param self The object pointer
+    #   @param inputs Tuple of inputs (whose representation identifies them)
+    #   @return The key
+    def get_key(self, inputs):
+        return hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+    ## Method to open (if required) the connection to the database of the
+    # current process and thread
+    #   @param self The object pointer
+    #   @return The connection (None if the disk storage is not available)
+    def connect(self):
+        if self.path is None:
+            return None
+        if self.pid != os.getpid():
+            # connections inherited from the parent process are not used
+            self.connections = {}
+            self.pid = os.getpid()
+        thread = threading.get_ident()
+        if thread not in self.connections:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                connection = sqlite3.connect(self.path, timeout=60)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS " + self.name +
+                    " (key TEXT PRIMARY KEY, value REAL, last_access REAL)"
+                )
+                connection.commit()
+                self.connections[thread] = connection
+            except (OSError, sqlite3.Error):
+                # fall back to the in-memory storage
+                self.path = None
+                return None
+        return self.connections[thread]
+
+    ## Method to get the result corresponding to the given inputs
+    #   @param self The object pointer
+    #   @param inputs Tuple of inputs
+    #   @return The stored result (None if not available)
+    def get(self, inputs):
+        if inputs in self.memory:
+            return self.memory[inputs]
+        connection = self.connect()
+        if connection is None:
+            return None
+        key = self.get_key(inputs)
+        try:
+            row = connection.execute(
+                "SELECT value FROM " + self.name + " WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE " + self.name + " SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            connection.commit()
+        except sqlite3.Error:
+            return None
+        self.memory[inputs] = row[0]
+        return row[0]
+
+    ## Method to store the result corresponding to the given inputs
+    #   @param self The object pointer
+    #   @param inputs Tuple of inputs
+    #   @param value Result (float)
+    def put(self, inputs, value):
+        self.memory[inputs] = value
+        connection = self.connect()
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO " + self.name + " VALUES (?, ?, ?)",
+                (self.get_key(inputs), float(value), time.time())
+            )
+            connection.commit()
+            # check the size of the database every few insertions
+            self.insertions += 1
+            if self.insertions >= max(1, self.max_entries // 100):
+                self.insertions = 0
+                self.evict(connection)
+        except sqlite3.Error:
+            pass
+
+    ## Method to remove the least recently used results when the number of
+    # stored results exceeds the maximum
+    #   @param self The object pointer
+    #   @param connection Connection to the database
+    def evict(self, connection):
+        count = connection.execute(
+            "SELECT COUNT(*) FROM " + self.name
+        ).fetchone()[0]
+        if count > self.max_entries:
+            connection.execute(
+                "DELETE FROM " + self.name + " WHERE key IN (SELECT key FROM "
+                + self.name + " ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,)
+            )
+            connection.commit()
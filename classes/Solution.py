@@ -1,6 +1,6 @@
 from external import space4ai_logger
 
-from classes.PerformanceEvaluators import SystemPerformanceEvaluator, ServerFarmPE, EdgePE
+from classes.Assignment import Assignment
 import numpy as np
 import itertools
 import json
@@ -12,13 +12,22 @@ import math
 import pathlib
 from operator import attrgetter
 import copy
+import hashlib
+import collections
+import time
 
 ## Configuration
 class Configuration:
     
     ## @var Y_hat
     # List of 2D numpy arrays storing the number of Resources.Resource 
-    # assigned to each Graph.Component.Partition
+    # assigned to each Graph.Component.Partition (built from the compact 
+    # assignment when first required, and kept beside it)
+    
+    ## @var assignment
+    # Object of Assignment.Assignment type storing the compact 
+    # representation of the configuration (None if the configuration is 
+    # only described by Y_hat)
     
     ## @var local_slack_value
     # Slack values related to Constraints.LocalConstraints
@@ -28,38 +37,144 @@ class Configuration:
     
     ## @var logger
     # Object of Logger type, used to print general messages
+    
+    ## @var evaluation_state
+    # Object of CompiledSystem.EvaluationState type, storing the 
+    # intermediate results of the last feasibility check
+    
+    ## @var _fingerprint
+    # Fingerprint of the configuration, computed when first required and 
+    # cleared when Y_hat is changed (None if not available)
    
 
     ## Configuration class constructor
     #   @param self The object pointer
     #   @param Y_hat List of 2D numpy arrays storing the number of 
     #                Resources.Resource assigned to each 
-    #                Graph.Component.Partition
+    #                Graph.Component.Partition (None if the compact 
+    #                assignment is given)
     #   @param log Object of Logger type
+    #   @param assignment Object of Assignment.Assignment type (optional)
     def __init__(
             self, Y_hat, 
-            log=space4ai_logger.Logger(name="SPACE4AI-D-Configuration")
+            log=space4ai_logger.Logger(name="SPACE4AI-D-Configuration"),
+            assignment=None
         ):
-        self.Y_hat = Y_hat
-        self.local_slack_value = np.full(len(self.Y_hat), np.inf, 
-                                         dtype = float)
+        self._Y_hat = Y_hat
+        self.assignment = assignment
+        I = len(Y_hat) if Y_hat is not None else len(assignment.shapes)
+        self.local_slack_value = np.full(I, np.inf, dtype = float)
         self.global_slack_value = None
         self.logger = log
+        self.evaluation_state = None
+        self._fingerprint = None
+    
+    ## Method to get the list of 2D numpy arrays storing the number of 
+    # Resources.Resource assigned to each Graph.Component.Partition (built 
+    # once from the compact assignment, which is kept). The arrays must not 
+    # be modified in place, since the compact assignment, the fingerprint 
+    # and the evaluation state would not be updated: changes go through 
+    # the setter or Configuration.set_number
+    #   @param self The object pointer
+    #   @return List of 2D numpy arrays
+    @property
+    def Y_hat(self):
+        if self._Y_hat is None:
+            self._Y_hat = self.assignment.to_Y_hat()
+        return self._Y_hat
+    
+    ## Method to set the list of 2D numpy arrays storing the number of 
+    # Resources.Resource assigned to each Graph.Component.Partition, which 
+    # clears the fingerprint and the evaluation state of the configuration
+    #   @param self The object pointer
+    #   @param Y_hat List of 2D numpy arrays
+    @Y_hat.setter
+    def Y_hat(self, Y_hat):
+        self._Y_hat = Y_hat
+        self.assignment = None
+        self._fingerprint = None
+        self.evaluation_state = None
+    
+    ## Method to set the number of Resources.Resource of a given type 
+    # assigned to a Graph.Component.Partition. The array of the component 
+    # is copied, since it may be shared with other configurations
+    #   @param self The object pointer
+    #   @param i Index of the Graph.Component
+    #   @param h Index of the Graph.Component.Partition
+    #   @param j Index of the Resources.Resource
+    #   @param number Number of resources
+    def set_number(self, i, h, j, number):
+        Y_hat = list(self.Y_hat)
+        Y_hat[i] = Y_hat[i].copy()
+        Y_hat[i][h, j] = number
+        self.Y_hat = Y_hat
+    
+    ## Method to get the compact representation of the configuration
+    #   @param self The object pointer
+    #   @return An Assignment.Assignment object (None if some partition is 
+    #           assigned to more than one resource type)
+    def get_assignment(self):
+        if self.assignment is not None:
+            return self.assignment
+        return Assignment.from_Y_hat(self._Y_hat)
+    
+    ## Method to get the data used to build the evaluation state of the 
+    # configuration, without building the list of 2D numpy arrays
+    #   @param self The object pointer
+    #   @return Either an Assignment.Assignment object or Y_hat
+    def get_assignment_data(self):
+        if self.assignment is not None:
+            return self.assignment
+        return self._Y_hat
     
     ## Method to define equality of two solution
     #   @param self The object pointer
     #   @param solution The other solution to compare with current object
     def __eq__(self,solution):
+        # compare the compact representations, if available
+        assignment1 = self.get_assignment()
+        if assignment1 is not None:
+            assignment2 = solution.get_assignment()
+            if assignment2 is not None:
+                return assignment1 == assignment2
         equality = []
         # compare the equality of assignment for each component
         for i, j in zip(self.Y_hat, solution.Y_hat):
             equality.append(np.array_equal(i, j))
         return all(equality)
     
+    ## Method to get a 128-bit fingerprint of the assignment, which is 
+    # equal for configurations that are equal according to __eq__. The 
+    # fingerprint is computed once and stored until Y_hat is changed
+    #   @param self The object pointer
+    #   @return The fingerprint (bytes)
+    def get_fingerprint(self):
+        if self._fingerprint is None:
+            assignment = self.get_assignment()
+            if assignment is not None:
+                self._fingerprint = assignment.get_fingerprint()
+            else:
+                shapes = np.array([y.shape for y in self._Y_hat], 
+                                  dtype=np.int64)
+                data = np.concatenate([np.ravel(y) for y in self._Y_hat])
+                fingerprint = hashlib.blake2b(digest_size=16)
+                fingerprint.update(shapes.tobytes())
+                fingerprint.update(data.astype(np.int64).tobytes())
+                self._fingerprint = fingerprint.digest()
+        return self._fingerprint
+    
+    ## Hash operator (consistent with the equality operator)
+    #   @param self The object pointer
+    #   @return The hash value
+    def __hash__(self):
+        return int.from_bytes(self.get_fingerprint()[:8], "little")
+    
     ## Method to get information about the used resources
     #   @param self The object pointer
     #   @return 1D numpy array whose j-th element is 1 if resource j is used
     def get_x(self):
+        if self.assignment is not None:
+            return np.array(self.assignment.get_y_bar() > 0, dtype = int)
         J = self.Y_hat[0].shape[1]
         x = np.full(J, 0, dtype = int)
         for i in range(len(self.Y_hat)):
@@ -81,12 +196,126 @@ class Configuration:
     #    @return 1D numpy array whose j-th element denotes the maximum number 
     #            of used resources of type j
     def get_y_bar(self):
+        if self.assignment is not None:
+            return self.assignment.get_y_bar()
         y_max = []
         for i in range(len(self.Y_hat)):
             y_max.append(np.array(self.Y_hat[i].max(axis=0), dtype=int))
         y_bar = [max(i) for i in itertools.zip_longest(*y_max, fillvalue=0)]
         return np.array(y_bar)
     
+    ## Method to get the configuration obtained by decreasing by one the 
+    # number of resources of the given type assigned to all the partitions 
+    # that use more than one of them
+    #   @param self The object pointer
+    #   @param j Index of the Resources.Resource
+    #   @return The new Solution.Configuration object and the list of 
+    #           tuples (component index, partition index, source resource 
+    #           index, destination resource index, number of resources) 
+    #           describing how it is obtained from the current one
+    def reduce_resources(self, j):
+        moves = []
+        assignment = self.get_assignment()
+        if assignment is not None:
+            assignment = assignment.copy()
+            p = np.nonzero((assignment.resource == j) & \
+                           (assignment.number > 1))[0]
+            assignment.number[p] -= 1
+            comp = np.searchsorted(assignment.offsets, p, side="right") - 1
+            for i, q, n in zip(comp.tolist(), p.tolist(), 
+                               assignment.number[p].tolist()):
+                moves.append((i, q - assignment.offsets[i], j, j, n))
+            return Configuration(None, assignment=assignment), moves
+        # create a copy of the current Y_hat matrix
+        temp = copy.deepcopy(self.Y_hat)
+        # loop over all components
+        for i in range(len(temp)):
+            # loop over all component partitions
+            for h in range(len(temp[i])):
+                # decrease the number of resources (if > 1)
+                if temp[i][h, j] > 1:
+                    temp[i][h, j] -= 1
+                    moves.append((i, h, j, j, temp[i][h, j]))
+        return Configuration(temp), moves
+    
+    ## Method to get the configuration obtained by increasing by one the 
+    # number of resources of the given type assigned to all the partitions 
+    # that use less than the given maximum number of them
+    #   @param self The object pointer
+    #   @param j Index of the Resources.Resource
+    #   @param max_number Maximum number of resources of the given type
+    #   @return The new Solution.Configuration object and the list of 
+    #           tuples (component index, partition index, source resource 
+    #           index, destination resource index, number of resources) 
+    #           describing how it is obtained from the current one
+    def increase_resources(self, j, max_number):
+        moves = []
+        assignment = self.get_assignment()
+        if assignment is not None:
+            assignment = assignment.copy()
+            p = np.nonzero((assignment.resource == j) & \
+                           (assignment.number < max_number))[0]
+            assignment.number[p] += 1
+            comp = np.searchsorted(assignment.offsets, p, side="right") - 1
+            for i, q, n in zip(comp.tolist(), p.tolist(), 
+                               assignment.number[p].tolist()):
+                moves.append((i, q - assignment.offsets[i], j, j, n))
+            return Configuration(None, assignment=assignment), moves
+        # create a copy of the current Y_hat matrix
+        temp = copy.deepcopy(self.Y_hat)
+        # loop over all components
+        for i in range(len(temp)):
+            # loop over all component partitions
+            for h in range(len(temp[i])):
+                # increase the number of resources (if < max_number)
+                if 0 < temp[i][h, j] < max_number:
+                    temp[i][h, j] += 1
+                    moves.append((i, h, j, j, temp[i][h, j]))
+        return Configuration(temp), moves
+    
+    ## Method to get the evaluation state of the current configuration, 
+    # which is built (once) if not available
+    #   @param self The object pointer
+    #   @param S A System.System object
+    #   @return A CompiledSystem.EvaluationState object
+    def get_evaluation_state(self, S):
+        if not S.compiled.is_valid_state(self.evaluation_state):
+            self.evaluation_state = S.compiled.initial_state(
+                self.get_assignment_data()
+            )
+        return self.evaluation_state
+    
+    ## Method to get the response time of a Graph.Component in the given 
+    # evaluation context, computed once per configuration
+    #   @param self The object pointer
+    #   @param S A System.System object
+    #   @param i Index of the Graph.Component
+    #   @param context A PerformanceModels.EvaluationContext object 
+    #                  (default: None)
+    #   @return The response time
+    def get_response_time(self, S, i, context=None):
+        return S.compiled.response_time(self.get_evaluation_state(S), self, 
+                                        i, context)
+    
+    ## Method to get the response times of all Graph.Component objects in 
+    # the given evaluation context, computed once per configuration
+    #   @param self The object pointer
+    #   @param S A System.System object
+    #   @param context A PerformanceModels.EvaluationContext object 
+    #                  (default: None)
+    #   @return 1D numpy array storing the response time of each component
+    def get_response_times(self, S, context=None):
+        return np.array([self.get_response_time(S, i, context) \
+                         for i in range(len(S.components))], dtype=float)
+    
+    ## Method to get the utilization of all Resources.Resource objects, 
+    # computed once per configuration
+    #   @param self The object pointer
+    #   @param S A System.System object
+    #   @return 1D numpy array storing the utilization of each resource
+    def get_utilization(self, S):
+        return self.get_evaluation_state(S).U
+    
    
     ## Method to check if the preliminary constraints are satisfied
     #   @param self The object pointer
@@ -135,26 +364,9 @@ class Configuration:
     #   @param S A System.System object
     #   @return True if the constraints are satisfied
     def memory_constraints_check(self, S):
-        
-        # create y from y_hat
-        y = self.get_y()
-       
-        # for each resource, check if the sum of the memory requirements of 
-        # all component partitions assigned to it is greater than the maximum 
-        # capacity of the resource
-        feasible = True
-        J = len(S.resources)
-        j = 0
-        while j < J and feasible:
-            memory = 0
-            for i, c in zip(y, S.compatibility_matrix_memory):
-                memory += (i[:,j] * np.array(c[:,j])).sum(axis=0)
-                #memory += (i[:,j] * np.array(list(h.memory for h in c.partitions))).sum(axis=0)
-                if memory > S.resources[j].memory:
-                    feasible = False
-            j += 1
-        
-        return feasible
+        return S.compiled.memory_constraints_check(
+            self.get_evaluation_state(S)
+        )
     
     
     ## Method to check that, if a Graph.Component.Partition object is executed
@@ -165,40 +377,8 @@ class Configuration:
     #   @param S A System.System object
     #   @return True if the constraint is satisfied
     def move_backward_check(self, S):
-        feasible = True
-        source_nodes= [node[0] for node in S.graph.G.in_degree if node[1]==0]
-        visited={node:False for node in S.graph.G.nodes}
-        Queue=source_nodes
-        while Queue:
-            last_part_res=-1
-            current_node=Queue.pop(0)
-            comp_idx=S.dic_map_com_idx[current_node]
-            comp_pred_list=list(S.graph.G.pred[current_node])
-            if len(comp_pred_list)>0:
-                for comp_pred in comp_pred_list:
-                    comp_pred_idx=S.dic_map_com_idx[comp_pred]
-                    if len(np.nonzero(self.Y_hat[comp_pred_idx])[0])>0:
-                        last_h_idx=np.nonzero(self.Y_hat[comp_pred_idx])[0][-1]
-                        last_h_res = np.nonzero(self.Y_hat[comp_pred_idx][last_h_idx,:])[0][0]
-                        if last_h_res >= S.cloud_start_index:
-                            last_part_res=last_h_res
-
-            # loop over all partitions in the deployment
-            for y in self.Y_hat[comp_idx]:
-                h = np.nonzero(y)
-                if np.size(h) > 0:
-                    if last_part_res >= S.cloud_start_index:
-                        if h[0][0] < S.cloud_start_index:
-                            feasible = False
-                    last_part_res = h[0][0]
-
-            visited[current_node]=True
-            for node in S.graph.G.neighbors(current_node):
-                if not visited[node]:
-                    if node not in Queue:
-                        Queue.append(node)
-
-        return feasible
+        rows, cols, n = S.compiled.flatten(self.Y_hat)
+        return S.compiled.move_backward_check(rows, cols)
     
     
     ## Method to check that only a single Graph.Component.Partition object 
@@ -210,116 +390,112 @@ class Configuration:
     #   @param S A System.System object
     #   @return True if the assignment is feasible
     def performance_assignment_check(self, S):
-        
-        feasible = True
-        
-        # matrix size
-        I = len(self.Y_hat)
-        
-        # loop over all resources
-        j = 0
-        while j < S.FaaS_start_index and feasible:
-            
-            # number of partitions assigned to the current resource
-            count_j = 0
-            colocation_allowed = True
-            
-            # loop over all components
-            i = 0
-            while i < I and feasible:
-                
-                # loop over all partitions
-                h = 0
-                while h < self.Y_hat[i].shape[0] and feasible:
-                    
-                    # check if the partition is deployed on resource j
-                    if self.Y_hat[i][h,j] > 0:
-                        
-                        # increment counter
-                        count_j += 1
-                        
-                        # check if the corresponding performance model allows
-                        # co-location
-                        if not S.performance_models[i][h][j].allows_colocation:
-                            colocation_allowed = False
-                            
-                            # if co-location is not allowed but more than one 
-                            # partition is deployed on j, the solution is not 
-                            # feasible
-                            if not colocation_allowed and count_j > 1:
-                                feasible = False
-                    h += 1
-                 
-                # if co-location is not allowed but more than one partition 
-                # is deployed on j, the solution is not feasible
-                if not colocation_allowed and count_j > 1:
-                    feasible = False
-                
-                i += 1
-                
-            # if more than one partition is deployed on j
-            if count_j > 1:
-                # if co-location is not allowed, the solution is not feasible
-                if not colocation_allowed:
-                    feasible = False
-                else:
-                    # otherwise, we must check the device utilization
-                    if j < S.cloud_start_index:
-                        model = EdgePE()
-                    else:
-                        model = ServerFarmPE()
-                    utilization = model.compute_utilization(j, self.Y_hat, S)
-                    if utilization >= 1:
-                        feasible = False
-            
-            j += 1
-                        
-        return feasible
+        return S.compiled.performance_assignment_check(
+            self.get_evaluation_state(S)
+        )
 
 
-    ## Method to check the feasibility of the current configuration
+    ## Method to check the feasibility of the current configuration. If 
+    # the configuration has been obtained by moving some partitions of an 
+    # already evaluated parent configuration, only the resources, 
+    # components and paths affected by the moves are evaluated again
     #   @param self The object pointer
     #   @param S A System.System object
-    def check_feasibility(self, S):
+    #   @param parent The parent Solution.Configuration object (optional)
+    #   @param moves List of tuples (component index, partition index, 
+    #                source resource index, destination resource index, 
+    #                number of resources) describing how the current 
+    #                configuration is obtained from the parent one
+    #   @param cache An EvaluationCache.EvaluationCache object storing the 
+    #                configurations evaluated so far (optional)
+    def check_feasibility(self, S, parent=None, moves=None, cache=None):
+
+        # retrieve the results of a previous evaluation, if available
+        evaluation = None
+        if cache is not None:
+            evaluation = cache.get(cache.get_key(S, self))
+            cache.record(evaluation.performance is not None)
+            if evaluation.performance is not None:
+                self.local_slack_value = evaluation.local_slack_value.copy()
+                self.global_slack_value = evaluation.global_slack_value
+                self.evaluation_state = evaluation.evaluation_state
+                feasible, paths_performance, components_performance = \
+                    evaluation.performance
+                return feasible, list(paths_performance), \
+                    list(components_performance)
 
         # define status of components and paths response times and constraints
         I = len(S.components)
         components_performance = [[True, np.infty]] * I
         paths_performance = []
         
-        # check if the assignments are compatible with the performance models 
-        # in terms of partitions co-location / resources utilization
-        self.logger.log("Co-location / Utilization constraints check", 4)
-        feasible = self.performance_assignment_check(S)
-       
-        if feasible:
-            # check if the memory constraints are satisfied
-            self.logger.log("Memory constraints check", 4)
-            feasible = self.memory_constraints_check(S)
+        # get the list of assignments and the statistics of all resources, 
+        # incrementally if the parent configuration has been evaluated
+        if parent is not None and moves is not None and \
+                S.compiled.is_valid_state(parent.evaluation_state):
+            state = S.compiled.moved_state(parent.evaluation_state, moves)
+        else:
+            state = S.compiled.initial_state(self.get_assignment_data())
+        self.evaluation_state = state
+        rows, cols = state.rows, state.cols
+        
+        # check the structural constraints (partitions co-location / 
+        # resources utilization, memory and cloud placement), in the order 
+        # that discards unfeasible configurations most quickly
+        feasible = S.compiled.pipeline.run(state, self.logger)
 
+        if feasible:
+            # the response time of partitions relying on predictors 
+            # depends on the constraint being evaluated, thus, if it
+            # has not been tabulated, it is evaluated by the 
+            # constraints themselves
+            start = time.perf_counter()
+            uses_predictors = S.compiled.uses_predictors(rows, cols,
+                                                         state.n)
+            state.uses_predictors = uses_predictors
+            if not uses_predictors:
+                S.compiled.update_times(state)
+            
+            # check if all local constraints are satisfied
+            self.logger.log("Local constraints check", 4)
+            if uses_predictors:
+                for LC in S.local_constraints:
+                    i = LC.component_idx
+                    components_performance[i] = LC.check_feasibility(S, self)
+                    feasible = feasible and components_performance[i][0]
+            else:
+                feasible = S.compiled.check_local_constraints(
+                    self, state.local_times, components_performance
+                )
+            S.compiled.local_stage.update(time.perf_counter() - start, 
+                                          feasible)
+            
             if feasible:
-                # check if the cloud placement constraint is satisfied
-                self.logger.log("Cloud placement constraint check", 4)
-                feasible = self.move_backward_check(S)
-
-                if feasible:
-                    # check if all local constraints are satisfied
-                    self.logger.log("Local constraints check", 4)
-                    for LC in S.local_constraints:
-                        i = LC.component_idx
-                        components_performance[i] = LC.check_feasibility(S, self)
-                        feasible = feasible and components_performance[i][0]
-                    
-                    if feasible:
-                        self.logger.log("Global constraints check", 4)
-                        # check global constraints
-                        for GC in S.global_constraints:
-                            paths_performance.append(GC.check_feasibility(S, self))
-                            feasible = feasible and paths_performance[-1][0]
+                self.logger.log("Global constraints check", 4)
+                # check global constraints
+                start = time.perf_counter()
+                if uses_predictors:
+                    for GC in S.global_constraints:
+                        paths_performance.append(GC.check_feasibility(S, self))
+                        feasible = feasible and paths_performance[-1][0]
+                else:
+                    feasible = S.compiled.check_global_constraints(
+                        self, state, paths_performance
+                    )
+                S.compiled.global_stage.update(time.perf_counter() - start, 
+                                               feasible)
 
         if not feasible:
             self.logger.log("Unfeasible", 4)
         
+        # store the results
+        if evaluation is not None:
+            evaluation.performance = (feasible, list(paths_performance), 
+                                      list(components_performance))
+            evaluation.local_slack_value = self.local_slack_value.copy()
+            evaluation.global_slack_value = self.global_slack_value
+            evaluation.evaluation_state = self.evaluation_state
+        
         return feasible, paths_performance, components_performance
 
     
@@ -329,6 +505,7 @@ class Configuration:
     #   @return Performances A list of tuple includs partition index, the corresponding resource index and performance
     def all_response_times(self, S):
         Performances=[]
+        utilization = self.get_utilization(S)
        
         for component_idx in range(len(self.Y_hat)):
             j=np.nonzero(self.Y_hat[component_idx])
@@ -341,7 +518,8 @@ class Configuration:
 
                     PM = S.performance_models[component_idx][p_idx][r_idx]
                     features = PM.get_features(c_idx=component_idx, p_idx=p_idx,
-                                               r_idx=r_idx, S=S, Y_hat=self.Y_hat)
+                                               r_idx=r_idx, S=S, Y_hat=self.Y_hat,
+                                               utilization=utilization)
                     p = PM.predict(**features)
                     self.logger.log("features: {}".format(features), 7)
                 else:
@@ -379,53 +557,21 @@ class Configuration:
     ## Method to compute the cost of a feasible solution
     #   @param self The object pointer
     #   @param S A System.System object
+    #   @param cache An EvaluationCache.EvaluationCache object storing the 
+    #                configurations evaluated so far (optional)
     #   @return total cost
-    def objective_function(self, S):
+    def objective_function(self, S, cache=None):
         
-        J = len(S.resources)
+        # retrieve the cost computed in a previous evaluation, if available
+        if cache is not None:
+            evaluation = cache.get(cache.get_key(S, self))
+            cache.record(evaluation.cost is not None)
+            if evaluation.cost is None:
+                evaluation.cost = self.objective_function(S)
+            return evaluation.cost
         
-        # get information about the used resources and the max number of 
-        # used resources of each type
-        x = self.get_x()   
-        y_bar = self.get_y_bar()
-        
-        # compute costs
-        costs = []
-        # compute cost of edge
-        for j in range(S.cloud_start_index):
-            costs.append(S.resources[j].cost * y_bar[j] * S.T)
-        #
-        # compute cost of VMs
-        for j in range(S.cloud_start_index, S.FaaS_start_index):
-            costs.append(S.resources[j].cost * y_bar[j] * S.T)
-        #
-        # compute the cost of FaaS and transition cost if not using SCAR
-        if S.FaaS_start_index < J:
-            key_list_comp = list(S.dic_map_com_idx.keys())
-            val_list_comp = list(S.dic_map_com_idx.values())
-            key_list_res = list(S.dic_map_res_idx.keys())
-            val_list_res = list(S.dic_map_res_idx.values())
-            for j in range(S.FaaS_start_index, J):
-                for i in range(len(self.Y_hat)):
-                    #part_indexes = np.nonzero(S.compatibility_matrix[i][:,j])[0]
-                    part_indexes = np.nonzero(self.Y_hat[i][:,j])[0]
-                    # get the name of component by its index
-                    comp=key_list_comp[val_list_comp.index(i)]
-                    for part_idx in part_indexes:
-                        # get the name of partition by the index of the partition and its related component 
-                        key_list_part = list(S.dic_map_part_idx[comp].keys())
-                        val_list_part = list(S.dic_map_part_idx[comp].values())
-                        part=key_list_part[val_list_part.index((i,part_idx))]
-                        # get the name of resource by its index
-                        res=key_list_res[val_list_res.index(j)]
-                        # compute the cost of the FaaS
-                        costs.append(S.resources[j].cost * \
-                                     self.Y_hat[i][part_idx][j] * \
-                                     S.faas_service_times[comp][part][res][0] * \
-                                     S.components[i].comp_Lambda * \
-                                     S.T)
-        
-        return sum(costs)
+        # compute the cost of edge/cloud resources and FaaS
+        return S.compiled.cost(self.get_assignment_data())
     
     
     ## Method to evaluate all performances and constraints
@@ -437,20 +583,11 @@ class Configuration:
         all_performances=self.all_response_times(S)
         all_constraint_evaluation=self.all_constraints_evaluation(S)
         feasible=True
-        edge=EdgePE()
-        cloud=ServerFarmPE()
+        U=self.get_utilization(S)
         utilizations=[]
 
-        for j in range(S.cloud_start_index):
-            utilization=edge.compute_utilization(j, self.Y_hat, S)
-            if not math.isnan(utilization) and utilization>0:
-                utilizations.append((j,utilization))
-                if utilization>=1:
-                    feasible=False
-        
-
-        for j in range(S.cloud_start_index,S.FaaS_start_index):
-            utilization=cloud.compute_utilization(j, self.Y_hat, S)
+        for j in range(S.FaaS_start_index):
+            utilization=float(U[j])
             if not math.isnan(utilization) and utilization>0:
                 utilizations.append((j,utilization))
                 if utilization>=1:
@@ -475,24 +612,28 @@ class Configuration:
         # compute response times of all components
        
         if not response_times:
-            PE = SystemPerformanceEvaluator(self.logger)
-            response_times = PE.compute_performance(S, self.Y_hat)
+            response_times = self.get_response_times(S)
         
         solution_string = '{"Lambda": ' + str(S.Lambda)
        
         # write components deployments and response times
         solution_string += ',  "components": {'
         I = len(self.Y_hat)
+        # index the response times of partitions and the local constraints 
+        # thresholds
+        partition_times = {}
+        for item in total_evaluation[1]:
+            partition_times.setdefault((item[0], item[1]), item)
+        thresholds = {}
+        for LC in S.local_constraints:
+            thresholds.setdefault(LC.component_idx, LC.max_res_time)
         for i in range(I):
-            component = S.components[i].name
+            component = S.component_names[i]
             component_string = ' "' + component + '": {'
             allocation = np.nonzero(self.Y_hat[i])
             first_h= allocation[0][0]
             # get deployment name
-            for dep in S.components[i].deployments:
-               if first_h in dep.partitions_indices:
-                   dep_name=dep.name
-                   break
+            dep_name = S.partition_deployments[i][first_h]
             component_string += ' "' + dep_name + '": {'
                 
             # loop over partitions
@@ -503,15 +644,13 @@ class Configuration:
                 j = allocation[1][idx]
                
                 # get partition name
-                partition = [key for key, (value1, value2) in \
-                             S.dic_map_part_idx[component].items() \
-                                 if value1 == i and value2 == h][0]
+                partition = S.partition_names[i][h]
                 component_string += ' "' + partition + '": {'
                 # get computational layer name
-                CL = S.resources[j].CLname
+                CL = S.resource_CLnames[j]
                 component_string += '"' + CL + '": {'
                 # get resource name and description
-                resource = S.resources[j].name
+                resource = S.resource_names[j]
                 description = S.description[resource]
                 if description == None:
                     description = "null"
@@ -536,11 +675,11 @@ class Configuration:
                                         str(transition_cost) + '}},')
                 
                 # get the response time of partitions
-                R=[item for item in total_evaluation[1] if item[0] == i and item[1] == h ]
-                if R[0][2]<0:
+                R = partition_times[(i, h)]
+                if R[2]<0:
                     component_string += ' "response_time": "inf" },'
                 else:
-                    component_string += ' "response_time": ' + str(R[0][2])+ '},'
+                    component_string += ' "response_time": ' + str(R[2])+ '},'
            
             component_string = component_string[:-1] + '},'
             # get response time and corresponding threshold
@@ -549,10 +688,8 @@ class Configuration:
             else:
                 component_string += ' "response_time": ' + str(response_times[i])
             component_string += ', "response_time_threshold": '
-            threshold = [LC.max_res_time for LC in S.local_constraints \
-                         if LC.component_idx == i]
-            if len(threshold) > 0:
-                component_string += str(threshold[0]) + '},'
+            if i in thresholds:
+                component_string += str(thresholds[i]) + '},'
             else:
                 component_string += '"inf"},'
             solution_string += component_string
@@ -604,29 +741,33 @@ class Configuration:
                  cost = None):
 
         if not response_times:
-            PE = SystemPerformanceEvaluator(self.logger)
-            response_times = PE.compute_performance(S, self.Y_hat)
+            response_times = self.get_response_times(S)
         
         solution_string = '{"Lambda": ' + str(S.Lambda)
 
         # write components deployments and response times
         solution_string += ',  "components": { '
         I = len(self.Y_hat)
+        # index the response times of partitions and the local constraints 
+        # thresholds
+        partition_times = {}
+        for item in total_evaluation[1]:
+            partition_times.setdefault((item[0], item[1]), item)
+        thresholds = {}
+        for LC in S.local_constraints:
+            thresholds.setdefault(LC.component_idx, LC.max_res_time)
         # get the list of components included in local constraint
         LCcomponent_idx=[(C[0],C[1]) for C in total_evaluation[2][0]]
 
         for i in range(I):
-            component = S.components[i].name
+            component = S.component_names[i]
             R_cons=[a_tuple[1] for a_tuple in LCcomponent_idx if a_tuple[0]==i]
             if (len(R_cons)>0 and not R_cons[0]) or total_evaluation[1][i][2] == np.infty:
                 component_string = ' "' + component + '": {'
                 allocation = np.nonzero(self.Y_hat[i])
                 first_h= allocation[0][0]
                 # get deployment name
-                for dep in S.components[i].deployments:
-                   if first_h in dep.partitions_indices:
-                       dep_name=dep.name
-                       break
+                dep_name = S.partition_deployments[i][first_h]
                 component_string += ' "' + dep_name + '": {'
                 # loop over partitions
                 for idx in range(len(allocation[0])):
@@ -634,16 +775,14 @@ class Configuration:
                     h = allocation[0][idx]
                     j = allocation[1][idx]
                     # get partition name
-                    partition = [key for key, (value1, value2) in \
-                                 S.dic_map_part_idx[component].items() \
-                                     if value1 == i and value2 == h][0]
+                    partition = S.partition_names[i][h]
                    
                     component_string += ' "' + partition + '": {'
                     # get computational layer name
-                    CL = S.resources[j].CLname
+                    CL = S.resource_CLnames[j]
                     component_string += '"' + CL + '": {'
                     # get resource name and description
-                    resource = S.resources[j].name
+                    resource = S.resource_names[j]
                     description = S.description[resource]
                     if description == None:
                         description = "null"
@@ -668,11 +807,11 @@ class Configuration:
                                             str(transition_cost) + '}},')
                     
                     # get the response time of partitions
-                    R=[item for item in total_evaluation[1] if item[0] == i and item[1] == h ]
-                    if R[0][2]<0:
+                    R = partition_times[(i, h)]
+                    if R[2]<0:
                         component_string += ' "response_time": "inf" },'
                     else:
-                        component_string += ' "response_time": ' + str(R[0][2])+ '},'
+                        component_string += ' "response_time": ' + str(R[2])+ '},'
            
           
                 component_string = component_string[:-1] + '},'    
@@ -682,10 +821,8 @@ class Configuration:
                 else:
                     component_string += ' "response_time": ' + str(response_times[i])
                 component_string += ', "response_time_threshold": '
-                threshold = [LC.max_res_time for LC in S.local_constraints \
-                             if LC.component_idx == i]
-                if len(threshold) > 0:
-                    component_string += str(threshold[0]) + '},'
+                if i in thresholds:
+                    component_string += str(thresholds[i]) + '},'
                 else:
                     component_string += '"inf"},'
                 solution_string += component_string
@@ -831,9 +968,10 @@ class Result:
     # cluster
     #   @param self The object pointer
     #   @param resource_idx The index of the Resources.VirtualMachine object
-    #   @param result The current Solution.Result object
-    #   @return The updated Solution.Result object
-    def reduce_cluster_size(self, resource_idx, system):
+    #   @param system A System.System object
+    #   @param cache An EvaluationCache.EvaluationCache object storing the 
+    #                configurations evaluated so far (optional)
+    def reduce_cluster_size(self, resource_idx, system, cache=None):
 
         # check if the resource index corresponds to an edge/cloud resource
         if resource_idx < system.FaaS_start_index:
@@ -844,6 +982,12 @@ class Result:
                 # get the max number of used resources
                 y_bar = self.solution.get_y_bar()
 
+                # predict in a single batch the response times required by 
+                # the configurations that may be explored
+                system.compiled.prefetch_cluster_reduction(
+                    self.solution, resource_idx
+                )
+
                 # update the current solution, always checking its feasibility
                 feasible = True
                 while feasible and y_bar[resource_idx].max() > 1:
@@ -851,22 +995,16 @@ class Result:
                     self.logger.log("y_bar[{}] = {}". \
                                     format(resource_idx, y_bar[resource_idx].max()), 7)
 
-                    # create a copy of the current Y_hat matrix
-                    temp = copy.deepcopy(self.solution.Y_hat)
-
-                    # loop over all components
-                    for i in range(len(self.solution.Y_hat)):
-                        # loop over all component partitions
-                        for h in range(len(self.solution.Y_hat[i])):
-                            # decrease the number of resources (if > 1)
-                            if temp[i][h, resource_idx] > 1:
-                                temp[i][h, resource_idx] -= 1
-
-                    # create a new solution with the updated Y_hat
-                    new_solution = Configuration(temp)
+                    # create a new solution decreasing the number of 
+                    # resources assigned to all partitions (if > 1)
+                    new_solution, moves = self.solution.reduce_resources(
+                        resource_idx
+                    )
 
                     # check if the new solution is feasible
-                    new_performance = new_solution.check_feasibility(system)
+                    new_performance = new_solution.check_feasibility(
+                        system, self.solution, moves, cache
+                    )
 
                     # if so, update the result
                     feasible = new_performance[0]
@@ -877,12 +1015,53 @@ class Result:
                         y_bar = self.solution.get_y_bar()
                         self.logger.log("feasible", 7)
 
+    ## Method to increase the number of Resources.VirtualMachine objects in 
+    # a cluster until the current Configuration becomes feasible (or the 
+    # maximum number of resources is reached)
+    #   @param self The object pointer
+    #   @param resource_idx The index of the Resources.VirtualMachine object
+    #   @param system A System.System object
+    #   @param cache An EvaluationCache.EvaluationCache object storing the 
+    #                configurations evaluated so far (optional)
+    def increase_cluster_size(self, resource_idx, system, cache=None):
+
+        # check if the resource index corresponds to an edge/cloud resource
+        if resource_idx < system.FaaS_start_index:
+
+            max_number = system.resources[resource_idx].number
+
+            # get the max number of used resources
+            y_bar = self.solution.get_y_bar()
+
+            # update the current solution until it becomes feasible
+            feasible = self.performance[0]
+            while not feasible and 0 < y_bar[resource_idx] < max_number:
+
+                self.logger.log("y_bar[{}] = {}". \
+                                format(resource_idx, y_bar[resource_idx]), 7)
+
+                # create a new solution increasing the number of resources 
+                # assigned to all partitions (if < max_number)
+                new_solution, moves = self.solution.increase_resources(
+                    resource_idx, max_number
+                )
+
+                # update the result, checking its feasibility
+                self.performance = new_solution.check_feasibility(
+                    system, self.solution, moves, cache
+                )
+                self.solution = new_solution
+                y_bar = self.solution.get_y_bar()
+                feasible = self.performance[0]
+
     ## Method to check the feasibility of the current Configuration
     #   @param self The object pointer
     #   @param S A System.System object
+    #   @param cache An EvaluationCache.EvaluationCache object storing the 
+    #                configurations evaluated so far (optional)
     #   @return performance
-    def check_feasibility(self, S):
-        self.performance = self.solution.check_feasibility(S)
+    def check_feasibility(self, S, cache=None):
+        self.performance = self.solution.check_feasibility(S, cache=cache)
         if not self.performance[0]:
             violation_ratio = 0
             if len(self.performance[1])>0:
@@ -900,9 +1079,11 @@ class Result:
     ## Method to compute the cost of the current Configuration
     #   @param self The object pointer
     #   @param S A System.System object
+    #   @param cache An EvaluationCache.EvaluationCache object storing the 
+    #                configurations evaluated so far (optional)
     #   @return total cost
-    def objective_function(self, S):
-        self.cost = self.solution.objective_function(S)
+    def objective_function(self, S, cache=None):
+        self.cost = self.solution.objective_function(S, cache)
         return self.cost
 
     
@@ -938,6 +1119,14 @@ class EliteResults:
     ## @var logger
     # Object of Logger type, used to print general messages
     
+    ## @var fingerprints
+    # Counter of the fingerprints of the Solution.Configuration objects 
+    # stored in the elite results list
+    
+    ## @var result_fingerprints
+    # Dictionary associating to the ID of each Solution.Result in the elite 
+    # results list the fingerprint of its Solution.Configuration
+    
     ## EliteSolutions class constructor
     #   @param self The object pointer
     #   @param K Maximum length of the elite results list
@@ -949,6 +1138,8 @@ class EliteResults:
         self.K = K
         self.elite_results = SortedList(key= attrgetter('cost','violation_rate'))#SortedList(key=lambda result: (result.cost, result.violation_rate))
         self.logger = log
+        self.fingerprints = collections.Counter()
+        self.result_fingerprints = {}
         
     
     ## Method to add a Solution.Result object to the elite results list, 
@@ -961,20 +1152,14 @@ class EliteResults:
         # check if the new result improves any elite result
         #if len(self.elite_results) == 0 or result.cost < self.elite_results[-1].cost:
         already_exist = False
-
-        for res in self.elite_results:
-            if (res.solution is not None) and (result.solution is not None) :
-                if result.solution == res.solution:
-                    already_exist = True
+        fingerprint = None
+        if result.solution is not None:
+            fingerprint = result.solution.get_fingerprint()
+            already_exist = self.fingerprints[fingerprint] > 0
         if feasible_sol_found:
             if not already_exist and result.cost < self.elite_results[-1].cost:
                 # add the new result to the list
-                self.elite_results.add(result)
-
-                # check if the total length exceeds than the maximum; if so,
-                # remove the last element
-                if len(self.elite_results) > self.K:
-                    self.elite_results.pop()
+                self.insert(result, fingerprint)
 
                 self.logger.log("Result improved - range: [{},{}]".\
                                 format(self.elite_results[0].cost,
@@ -982,18 +1167,33 @@ class EliteResults:
         else:
             if not already_exist and result.violation_rate < self.elite_results[-1].violation_rate:
             # add the new result to the list
-                self.elite_results.add(result)
-
-                # check if the total length exceeds than the maximum; if so,
-                # remove the last element
-                if len(self.elite_results) > self.K:
-                    self.elite_results.pop()
+                self.insert(result, fingerprint)
 
                 self.logger.log("Unfeasible result improved - range: [{},{}]".\
                                 format(self.elite_results[0].violation_rate,
                                        self.elite_results[-1].violation_rate), 2)
     
     
+    ## Method to insert a Solution.Result object in the elite results list,
+    # removing the last element if the total length exceeds the maximum
+    #   @param self The object pointer
+    #   @param result Solution.Result object to be added to the list
+    #   @param fingerprint Fingerprint of the result solution (None if the 
+    #                      result has no solution)
+    def insert(self, result, fingerprint):
+        self.elite_results.add(result)
+        if fingerprint is not None:
+            self.fingerprints[fingerprint] += 1
+            self.result_fingerprints[result.ID] = fingerprint
+        if len(self.elite_results) > self.K:
+            removed = self.elite_results.pop()
+            fingerprint = self.result_fingerprints.pop(removed.ID, None)
+            if fingerprint is not None:
+                self.fingerprints[fingerprint] -= 1
+                if self.fingerprints[fingerprint] == 0:
+                    del self.fingerprints[fingerprint]
+    
+    
     ## Method to merge two lists of elite results (inplace)
     #   @param self The object pointer
     #   @param other The EliteResults object to be merged (it remains 
@@ -8,6 +8,8 @@ from classes.NetworkTechnology import NetworkDomain
 from classes.PerformanceFactory import Pfactory
 from classes.PerformanceEvaluators import NetworkPerformanceEvaluator
 from classes.Constraints import LocalConstraint, GlobalConstraint
+from classes.CompiledSystem import CompiledSystem
+from classes.PerformancePredictors import predict_inputs_batch
 import json
 import sys
 import numpy as np
@@ -75,6 +77,32 @@ class System:
     # Dictionary associating to the name of each Resources.Resource object 
     # the corresponding index in System.resources
     
+    ## @var dic_map_CL_idx
+    # Dictionary associating to the name of each 
+    # Resources.ComputationalLayer object the corresponding index in 
+    # System.CLs
+    
+    ## @var component_names
+    # List storing the name of each Graph.Component object (indexed as 
+    # System.components)
+    
+    ## @var partition_names
+    # List of lists storing the name of each Graph.Component.Partition 
+    # object (indexed by component and partition)
+    
+    ## @var partition_deployments
+    # List of lists storing the name of the Graph.Component.Deployment 
+    # including each Graph.Component.Partition object (indexed by component 
+    # and partition)
+    
+    ## @var resource_names
+    # List storing the name of each Resources.Resource object (indexed as 
+    # System.resources)
+    
+    ## @var resource_CLnames
+    # List storing the name of the Resources.ComputationalLayer where each 
+    # Resources.Resource object is located
+    
     ## @var error
     # Object of Logger.Logger class, used to print error messages on sys.stderr
     
@@ -104,11 +132,40 @@ class System:
     # List of NetworkTechnology objects, characterized by a given access 
     # delay and bandwidth
     
+    ## @var resource_CL
+    # 1D numpy array storing, for each Resources.Resource object, the index 
+    # in System.CLs of the Resources.ComputationalLayer where it is located
+    
+    ## @var network_access_delay
+    # 3D numpy array storing, for each pair of Resources.ComputationalLayer 
+    # objects, the access delay of the network domains containing both of 
+    # them (padded with infinity)
+    
+    ## @var network_bandwidth
+    # 3D numpy array storing, for each pair of Resources.ComputationalLayer 
+    # objects, the bandwidth of the network domains containing both of them 
+    # (padded with ones)
+    
+    ## @var network_available
+    # 2D boolean numpy array which is True if the two 
+    # Resources.ComputationalLayer objects share at least a network domain
+    
     ## @var performance_models
     # List of 2D lists storing the performance model/evaluator initialized 
     # from the PerformanceFactory for each pair of Graph.Component.Partition 
     # and Resources.Resource object
     
+    ## @var prediction_tables
+    # List of 2D lists storing, for each pair of Graph.Component.Partition 
+    # and edge/cloud Resources.Resource object whose performance model can 
+    # be tabulated, the 1D numpy array of the response times predicted for 
+    # each number of resources (the k-th element corresponding to k+1 
+    # resources), and None otherwise
+    
+    ## @var compiled
+    # Object of CompiledSystem.CompiledSystem type, storing the array-based 
+    # representation of the system used to evaluate solutions
+    
     ## @var resources 
     # List of all the available Resources.Resource objects
     
@@ -120,6 +177,15 @@ class System:
     
     ## @var T
     # Time
+    
+    ## @var resource_cost
+    # 1D numpy array storing the cost of each Resources.Resource object
+    
+    ## @var faas_cost_coefficients
+    # List of 2D numpy arrays such that M[i][h,j] stores the cost of 
+    # running partition h of component i on the Resources.FaaS object j 
+    # (given by the resource cost times the warm service time, the component 
+    # load and the time horizon), and 0 for edge/cloud resources
   
     
     ## System class constructor: initializes all the System class members 
@@ -218,6 +284,7 @@ class System:
         # computational layers
         self.logger.log("Initializing resources and computational layers", 2)
         self.initialize_resources(data)
+        self.initialize_index_maps()
         
         # load Network Technology
         if "NetworkTechnology" in data.keys():
@@ -241,6 +308,7 @@ class System:
         else:
             self.logger.err("No NetworkTechnology available in configuration file", 1)
             sys.exit(1)
+        self.initialize_network_delays()
        
         # load dictionary of component-to-node compatibility 
         self.logger.log("Initializing compatibility matrix and performance-related components", 2)
@@ -284,6 +352,15 @@ class System:
         self.logger.log("Initializing time", 2)
         if "Time" in data.keys():
             self.T = float(data["Time"])
+            self.initialize_cost_coefficients()
+        
+        # tabulate the predictions of the performance models
+        self.logger.log("Initializing prediction tables", 2)
+        self.initialize_prediction_tables()
+        
+        # build the array-based representation used to evaluate solutions
+        self.logger.log("Compiling system", 2)
+        self.compiled = CompiledSystem(self)
        
  
     ## Method to initialize the components based on the dictionary of 
@@ -547,7 +624,7 @@ class System:
             # loop over components in the path
             for c in GC[p]["components"]:
                 if c in self.dic_map_com_idx.keys():
-                    C_list.append(list(self.dic_map_com_idx.keys()).index(c))
+                    C_list.append(self.dic_map_com_idx[c])
                 else:
                     self.logger.err("No match between components and path in global constraints")
                     sys.exit(1)
@@ -636,6 +713,122 @@ class System:
                     self.demand_matrix[comp_idx][part_idx, res_idx] = d
     
     
+    ## Method to tabulate, for all pairs of Graph.Component.Partition and 
+    # edge/cloud Resources.Resource objects whose performance model relies 
+    # on a regressor with discrete inputs, the response times predicted for 
+    # each number of resources. All the predictions are computed in a 
+    # single batch, with one regressor call for each regressor file
+    #   @param self The object pointer
+    def initialize_prediction_tables(self):
+        self.prediction_tables = []
+        requests = []
+        tabulated = []
+        # loop over all components and partitions
+        for comp_idx, comp in enumerate(self.components):
+            tables = [[None] * len(self.resources) for _ in comp.partitions]
+            self.prediction_tables.append(tables)
+            for part_idx in range(len(comp.partitions)):
+                # loop over the compatible edge/cloud resources
+                compatible = self.compatibility_matrix[comp_idx][part_idx]
+                for res_idx in np.nonzero(compatible[:self.FaaS_start_index])[0]:
+                    pm = self.performance_models[comp_idx][part_idx][res_idx]
+                    inputs = None
+                    if pm is not None:
+                        inputs = pm.get_table_inputs(c_idx=comp_idx, 
+                                                     p_idx=part_idx, 
+                                                     r_idx=res_idx, 
+                                                     S=self)
+                    if inputs is not None:
+                        requests += [(pm, x) for x in inputs]
+                        tabulated.append((comp_idx, part_idx, res_idx, inputs))
+        # predict all response times and fill the tables
+        predict_inputs_batch(requests)
+        for comp_idx, part_idx, res_idx, inputs in tabulated:
+            pm = self.performance_models[comp_idx][part_idx][res_idx]
+            self.prediction_tables[comp_idx][part_idx][res_idx] = np.array(
+                [np.asarray(pm.predictions[x], dtype=float).item() \
+                 for x in inputs]
+            )
+    
+    
+    ## Method to build the maps associating to the indices of components, 
+    # partitions and resources the corresponding names, so that they are 
+    # not recovered by scanning the dictionaries that map names to indices
+    #   @param self The object pointer
+    def initialize_index_maps(self):
+        self.component_names = [c.name for c in self.components]
+        self.partition_names = [[p.name for p in c.partitions] \
+                                for c in self.components]
+        self.partition_deployments = []
+        for c in self.components:
+            deployments = [None] * len(c.partitions)
+            # each partition is assigned to the first deployment including it
+            for dep in reversed(c.deployments):
+                for h in dep.partitions_indices:
+                    deployments[h] = dep.name
+            self.partition_deployments.append(deployments)
+        self.resource_names = [r.name for r in self.resources]
+        self.resource_CLnames = [r.CLname for r in self.resources]
+        self.dic_map_CL_idx = {cl.name: idx for idx, cl in enumerate(self.CLs)}
+    
+    
+    ## Method to collect, for each pair of Resources.ComputationalLayer 
+    # objects, the characteristics of the network domains that contain both 
+    # of them, so that network delays can be evaluated through array 
+    # operations
+    #   @param self The object pointer
+    def initialize_network_delays(self):
+        CL_idx = self.dic_map_CL_idx
+        self.resource_CL = np.array([CL_idx[r.CLname] for r in self.resources],
+                                    dtype=int)
+        # get the list of network domains shared by each pair of layers
+        shared = [[[] for _ in self.CLs] for _ in self.CLs]
+        for ND in self.network_technologies:
+            layers = set(CL_idx[cl] for cl in ND.computationallayers \
+                         if cl in CL_idx)
+            for CL1 in layers:
+                for CL2 in layers:
+                    shared[CL1][CL2].append(ND)
+        # store their access delay and bandwidth
+        K = max([1] + [len(ND) for row in shared for ND in row])
+        self.network_access_delay = np.full((len(self.CLs), len(self.CLs), K), 
+                                            np.inf)
+        self.network_bandwidth = np.ones((len(self.CLs), len(self.CLs), K))
+        self.network_available = np.full((len(self.CLs), len(self.CLs)), 
+                                         False)
+        for CL1, row in enumerate(shared):
+            for CL2, domains in enumerate(row):
+                for k, ND in enumerate(domains):
+                    self.network_access_delay[CL1, CL2, k] = ND.access_delay
+                    self.network_bandwidth[CL1, CL2, k] = ND.bandwidth
+                self.network_available[CL1, CL2] = len(domains) > 0
+    
+    
+    ## Method to compute the cost coefficients of all resources, so that 
+    # the cost of a solution can be evaluated through array operations
+    #   @param self The object pointer
+    def initialize_cost_coefficients(self):
+        self.resource_cost = np.array([r.cost for r in self.resources], 
+                                      dtype=float)
+        self.faas_cost_coefficients = []
+        # loop over all components and partitions
+        for comp_idx, comp in enumerate(self.components):
+            coefficients = np.zeros((len(comp.partitions), 
+                                     len(self.resources)))
+            for part_idx, part in enumerate(comp.partitions):
+                # loop over the compatible FaaS resources
+                compatible = self.compatibility_matrix[comp_idx][part_idx]
+                for res_idx in np.nonzero(compatible)[0]:
+                    if res_idx >= self.FaaS_start_index:
+                        res = self.resources[res_idx].name
+                        warm_service_time = \
+                            self.faas_service_times[comp.name][part.name][res][0]
+                        coefficients[part_idx, res_idx] = \
+                            self.resources[res_idx].cost * \
+                            warm_service_time * comp.comp_Lambda * self.T
+            self.faas_cost_coefficients.append(coefficients)
+    
+    
     ## Method to sort all input FaaS nodes increasingly by memory 
     #   @param self The object pointer
     #   @return 1) The sorted list of resources by memory and cost, respectively. 
@@ -666,6 +859,79 @@ class System:
 
         self.sorted_FaaS_by_cost_memory = sorted(idx_min_memory_node, key=lambda element: (element[2], element[1]))
        
+    ## Method to set the incoming workload of the system, propagating the 
+    # arrival rates through the DAG and updating only the structures that 
+    # depend on them (demands of FaaS resources, cost coefficients, 
+    # prediction tables and compiled representation), without loading 
+    # again the system description and the performance models
+    #   @param self The object pointer
+    #   @param Lambda The new incoming workload
+    def set_lambda(self, Lambda):
+        self.Lambda = float(Lambda)
+        # propagate the arrival rates (components are stored in topological 
+        # order, thus the rates of all predecessors are already updated)
+        for comp in self.components:
+            if self.graph.G.in_edges(comp.name):
+                comp.comp_Lambda = 0
+                for n, c, data in self.graph.G.in_edges(comp.name, data=True):
+                    prob = float(data["transition_probability"])
+                    ll = self.components[self.dic_map_com_idx[n]].comp_Lambda
+                    comp.comp_Lambda += prob * ll
+            else:
+                comp.comp_Lambda = self.Lambda
+            for dep in comp.deployments:
+                part_Lambda = comp.comp_Lambda
+                for part_idx in dep.partitions_indices:
+                    part = comp.partitions[part_idx]
+                    part.part_Lambda = part_Lambda
+                    part_Lambda *= (1 - part.early_exit_probability)
+        # update the demands of the compatible FaaS resources
+        for comp_idx, comp in enumerate(self.components):
+            for part_idx in range(len(comp.partitions)):
+                compatible = self.compatibility_matrix[comp_idx][part_idx]
+                for res_idx in np.nonzero(compatible)[0]:
+                    if res_idx >= self.FaaS_start_index:
+                        pm = self.performance_models[comp_idx][part_idx][res_idx]
+                        features = pm.get_features(c_idx=comp_idx, 
+                                                   p_idx=part_idx, 
+                                                   r_idx=res_idx, 
+                                                   S=self)
+                        self.demand_matrix[comp_idx][part_idx, res_idx] = \
+                            pm.predict(**features)
+        if hasattr(self, "T"):
+            self.initialize_cost_coefficients()
+        self.initialize_prediction_tables()
+        # the new compiled system invalidates the evaluations cached for 
+        # the previous workload
+        self.compiled = CompiledSystem(self)
+    
+    
+    ## Method to get a copy of the system with a different incoming 
+    # workload, sharing with the current system all the structures that do 
+    # not depend on Lambda (e.g., resources and performance models)
+    #   @param self The object pointer
+    #   @param Lambda The new incoming workload
+    #   @param log Object of Logger type used by the new system (if None, 
+    #              the logger of the current system is used)
+    #   @return The new System.System object
+    def with_lambda(self, Lambda, log=None):
+        S = copy.copy(self)
+        if log is not None:
+            S.logger = log
+        # copy the structures modified by set_lambda and the DAG, whose 
+        # data sizes can be modified by the algorithms
+        S.graph = copy.copy(self.graph)
+        S.graph.G = self.graph.G.copy()
+        S.components = []
+        for comp in self.components:
+            new_comp = copy.copy(comp)
+            new_comp.partitions = [copy.copy(p) for p in comp.partitions]
+            S.components.append(new_comp)
+        S.demand_matrix = [d.copy() for d in self.demand_matrix]
+        S.set_lambda(Lambda)
+        return S
+    
+    
     def read_solution_file(self,solution_file):
          with open(solution_file) as f:
             data = json.load(f)
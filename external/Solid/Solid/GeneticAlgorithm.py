@@ -25,6 +25,7 @@ class GeneticAlgorithm:
     max_steps = None
     min_fitness = None
     max_time=None
+    deadline = None
     def __init__(self, crossover_rate, mutation_rate, max_steps,max_time=None, min_fitness=None):
         """
 
@@ -74,6 +75,14 @@ class GeneticAlgorithm:
     def __repr__(self):
         return self.__str__()
 
+    def _before_deadline(self):
+        """
+        Checks the absolute time limit shared with other runs, if any
+
+        :return: True if no deadline is set or it has not been reached yet
+        """
+        return self.deadline is None or time.time() < self.deadline
+
     def _clear(self):
         """
         Resets the variables that are altered on a per-run basis of the algorithm
@@ -193,7 +202,8 @@ class GeneticAlgorithm:
         best_sol_cost_list.append(self.best_fitness)
         time_list.append(time.time())
         start=time.time()
-        while self.cur_steps<self.max_steps or time.time()-start<self.max_time:
+        while (self.cur_steps<self.max_steps or time.time()-start<self.max_time) and \
+                self._before_deadline():
             self.cur_steps += 1
 
             if verbose and ((self.cur_steps + 1) % 100 == 0):
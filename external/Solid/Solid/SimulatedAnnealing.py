@@ -17,6 +17,7 @@ class SimulatedAnnealing:
     cur_steps = 0
     max_steps = None
     max_time=None
+    deadline = None
 
     current_energy = None
     best_energy = None
@@ -87,6 +88,14 @@ class SimulatedAnnealing:
     def __repr__(self):
         return self.__str__()
 
+    def _before_deadline(self):
+        """
+        Checks the absolute time limit shared with other runs, if any
+
+        :return: True if no deadline is set or it has not been reached yet
+        """
+        return self.deadline is None or time.time() < self.deadline
+
     def _clear(self):
         """
         Resets the variables that are altered on a per-run basis of the algorithm
@@ -151,7 +160,8 @@ class SimulatedAnnealing:
         current_solution_cost_list.append(self.current_energy)
         time_list.append(time.time())
         start=time.time()
-        while self.cur_steps<self.max_steps or time.time()-start<self.max_time:
+        while (self.cur_steps<self.max_steps or time.time()-start<self.max_time) and \
+                self._before_deadline():
             self.cur_steps += 1
 
             if verbose and ((self.cur_steps + 1) % 100 == 0):
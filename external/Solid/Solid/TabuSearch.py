@@ -1,6 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from copy import deepcopy
-from collections import deque
+from collections import deque, Counter
 from numpy import argmin
 import numpy as np
 import time
@@ -16,6 +16,7 @@ class TabuSearch:
 
     tabu_size = None
     tabu_list = None
+    tabu_counts = None
 
     initial_state = None
     current = None
@@ -24,11 +25,12 @@ class TabuSearch:
     max_steps = None
     max_score = None
     max_time=None
+    deadline = None
 
     def __init__(self, initial_state, tabu_size, max_steps,max_time=None, max_score=None):
         """
 
-        :param initial_state: initial state, should implement __eq__ or __cmp__
+        :param initial_state: initial state, should implement __eq__ and __hash__
         :param tabu_size: number of states to keep in tabu list
         :param max_steps: maximum number of steps to run algorithm for
         :param max_score: score to stop algorithm once reached
@@ -62,6 +64,14 @@ class TabuSearch:
     def __repr__(self):
         return self.__str__()
 
+    def _before_deadline(self):
+        """
+        Checks the absolute time limit shared with other runs, if any
+
+        :return: True if no deadline is set or it has not been reached yet
+        """
+        return self.deadline is None or time.time() < self.deadline
+
     def _clear(self):
         """
         Resets the variables that are altered on a per-run basis of the algorithm
@@ -70,6 +80,7 @@ class TabuSearch:
         """
         self.cur_steps = 0
         self.tabu_list = deque(maxlen=self.tabu_size)
+        self.tabu_counts = Counter()
         self.current = deepcopy(self.initial_state)
         self.best = deepcopy(self.initial_state)
 
@@ -109,14 +120,23 @@ class TabuSearch:
         return neighbor
     
     def check_in_tabu_list(self,solution):
-        find=False
-        i=0
-        while not find and i<len(self.tabu_list):
-            if solution==self.tabu_list[i]:
-                find=True
-            i+=1
-       
-        return find
+        return self.tabu_counts[solution] > 0
+
+    def _add_to_tabu_list(self, state):
+        """
+        Appends a state to the tabu list, keeping the counter of the states
+        in the list (used for constant-time membership checks) up to date
+
+        :param state: a state
+        :return: None
+        """
+        if len(self.tabu_list) == self.tabu_list.maxlen:
+            evicted = self.tabu_list[0]
+            self.tabu_counts[evicted] -= 1
+            if self.tabu_counts[evicted] == 0:
+                del self.tabu_counts[evicted]
+        self.tabu_list.append(state)
+        self.tabu_counts[state] += 1
     def run(self, verbose=True,method="best"):
         """
         Conducts tabu search
@@ -133,7 +153,8 @@ class TabuSearch:
         current_solution_cost_list.append(self._score(self.current))
         time_list.append(time.time())
         start=time.time()
-        while self.cur_steps<self.max_steps or time.time()-start<self.max_time:
+        while (self.cur_steps<self.max_steps or time.time()-start<self.max_time) and \
+                self._before_deadline():
             self.cur_steps += 1
 
             if ((self.cur_steps + 1) % 100 == 0) and verbose:
@@ -156,7 +177,7 @@ class TabuSearch:
                 if self.check_in_tabu_list(neighborhood_best):
                 # if neighborhood_best in self.tabu_list:
                     if self._score(neighborhood_best) < self._score(self.best):
-                        self.tabu_list.append(neighborhood_best)
+                        self._add_to_tabu_list(neighborhood_best)
                         self.best = deepcopy(neighborhood_best)
 
                         break
@@ -165,7 +186,7 @@ class TabuSearch:
                         neighborhood.remove(neighborhood_best)
                         neighborhood_best = self._best(neighborhood,method)
                 else:
-                    self.tabu_list.append(neighborhood_best)
+                    self._add_to_tabu_list(neighborhood_best)
                     self.current = deepcopy(neighborhood_best)
                     
                    
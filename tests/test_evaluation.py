@@ -0,0 +1,236 @@
+import copy
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SPACE4AI_D_CACHE_DIR", tempfile.mkdtemp())
+
+from external import space4ai_logger
+from classes.System import System
+from classes.Algorithm import RandomGreedy
+from classes.Solution import Configuration
+from classes.Move import Move
+
+
+def make_system_json(rng):
+    """
+    Builds a synthetic system with four components in a chain (two of them
+    with a second, partitioned, deployment), two edge resources, two cloud
+    VM types and one FaaS configuration per partition
+    """
+    partitions = {
+        "c1": {"s1": ["h1"]},
+        "c2": {"s1": ["h1"], "s2": ["h2", "h3"]},
+        "c3": {"s1": ["h1"], "s2": ["h2", "h3"]},
+        "c4": {"s1": ["h1"]},
+    }
+    names = list(partitions)
+    components = {}
+    compatibility = {}
+    performance = {}
+    faas = {"transition_cost": 0.0}
+    for c_idx, c in enumerate(names):
+        following = names[c_idx + 1] if c_idx + 1 < len(names) else ""
+        components[c] = {}
+        compatibility[c] = {}
+        performance[c] = {}
+        for s, hs in partitions[c].items():
+            components[c][s] = {}
+            for k, h in enumerate(hs):
+                nxt = hs[k + 1] if k + 1 < len(hs) else following
+                components[c][s][h] = {
+                    "next": [nxt],
+                    "early_exit_probability": 0.2 if k == 0 and len(hs) > 1 else 0.0,
+                    "data_size": [float(rng.integers(1, 6))],
+                }
+                F = "F_{}_{}".format(c, h)
+                faas[F] = {"cost": float(rng.uniform(0.05, 0.5)),
+                           "memory": 100.0, "idle_time_before_kill": 600.0}
+                resources = ["E1", "E2"] if c == "c1" else \
+                    ["E1", "E2", "VM1", "VM2", F]
+                compatibility[c][h] = [{"resource": r, "memory": 50.0} \
+                                       for r in resources]
+                performance[c][h] = {}
+                for r in resources:
+                    if r.startswith("E"):
+                        performance[c][h][r] = {
+                            "model": "QTedge",
+                            "demand": float(rng.uniform(0.05, 0.5))
+                        }
+                    elif r.startswith("VM"):
+                        performance[c][h][r] = {
+                            "model": "QTcloud",
+                            "demand": float(rng.uniform(0.02, 0.2))
+                        }
+                    else:
+                        warm = float(rng.uniform(0.1, 0.5))
+                        performance[c][h][r] = {"model": "PACSLTK",
+                                                "demandWarm": warm,
+                                                "demandCold": warm * 1.2}
+    return {
+        "Components": components,
+        "EdgeResources": {"computationallayer1": {
+            "E1": {"cost": 4.0, "memory": 200.0, "number": 1, "n_cores": 1},
+            "E2": {"cost": 6.0, "memory": 300.0, "number": 1, "n_cores": 1},
+        }},
+        "CloudResources": {"computationallayer2": {
+            "VM1": {"cost": 0.8, "memory": 500.0, "number": 3, "n_cores": 1},
+            "VM2": {"cost": 1.2, "memory": 1000.0, "number": 2, "n_cores": 1},
+        }},
+        "FaaSResources": {"computationallayer3": faas},
+        "CompatibilityMatrix": compatibility,
+        "Performance": performance,
+        "Lambda": 0.5,
+        "LocalConstraints": {"c3": {"local_res_time": 2.0}},
+        "GlobalConstraints": {"p1": {"components": names,
+                                     "global_res_time": 4.0}},
+        "NetworkTechnology": {"ND1": {
+            "AccessDelay": 0.000277, "Bandwidth": 40.0,
+            "computationalLayers": ["computationallayer1",
+                                    "computationallayer2",
+                                    "computationallayer3"]
+        }},
+        "DirectedAcyclicGraph": {
+            c: {"next": [names[i + 1]], "transition_probability": [1.0]} \
+                for i, c in enumerate(names[:-1])
+        },
+        "Time": 1.0,
+    }
+
+
+def random_configurations(S, logger, n):
+    """
+    Returns the random configurations built by the random greedy from a
+    fixed seed
+    """
+    rg = RandomGreedy(S, seed=3, log=logger)
+    configurations = []
+    for _ in range(n):
+        Y_hat = rg.create_random_initial_solution()[0]
+        if Y_hat is not None:
+            configurations.append(Y_hat)
+    return configurations
+
+
+def test_compiled_evaluation():
+    logger = space4ai_logger.Logger(name="test", verbose=0)
+    S = System(system_json=make_system_json(np.random.default_rng(3)),
+               log=logger)
+    n_local = 0
+    n_global = 0
+    for Y_hat in random_configurations(S, logger, 400):
+        solution = Configuration(copy.deepcopy(Y_hat), logger)
+        feasible, paths_performance, components_performance = \
+            solution.check_feasibility(S)
+        # the response times are compared with the ones evaluated by the 
+        # constraints on the configurations that pass the structural checks
+        reference = Configuration(copy.deepcopy(Y_hat), logger)
+        for LC in S.local_constraints:
+            i = LC.component_idx
+            if components_performance[i][1] == np.inf:
+                continue
+            expected = LC.check_feasibility(S, reference)
+            assert components_performance[i][0] == expected[0]
+            assert np.isclose(components_performance[i][1], expected[1])
+            assert np.isclose(solution.local_slack_value[i],
+                              reference.local_slack_value[i])
+            n_local += 1
+        for path, GC in zip(paths_performance, S.global_constraints):
+            expected = GC.check_feasibility(S, reference)
+            assert path[0] == expected[0]
+            assert np.isclose(path[1], expected[1])
+            n_global += 1
+        if len(paths_performance) > 0:
+            assert np.isclose(solution.global_slack_value,
+                              reference.global_slack_value)
+    assert n_local > 0
+    assert n_global > 0
+
+
+def random_moves(S, Y_hat, rng):
+    """
+    Returns a list of moves (component index, partition index, source
+    resource index, destination resource index, number of resources)
+    changing the resource, or the number of resources, of a few assigned
+    partitions
+    """
+    assigned = [(i, h, j) for i, y in enumerate(Y_hat) \
+                for h, j in zip(*np.nonzero(y))]
+    moves = []
+    for k in rng.choice(len(assigned), size=rng.integers(1, 3),
+                        replace=False):
+        i, h, source = assigned[k]
+        compatible = np.nonzero(S.compatibility_matrix[i][h])[0]
+        destination = int(rng.choice(compatible))
+        number = 1
+        if destination < S.FaaS_start_index:
+            number = int(rng.integers(1, S.resources[destination].number + 1))
+        moves.append((i, h, source, destination, number))
+    return moves
+
+
+def apply_moves(Y_hat, moves):
+    """
+    Returns a copy of the given assignment matrices where the given moves
+    are applied
+    """
+    Y_hat = copy.deepcopy(Y_hat)
+    for i, h, source, destination, number in moves:
+        Y_hat[i][h, source] = 0
+        Y_hat[i][h, destination] = number
+    return Y_hat
+
+
+def assert_same_evaluation(S, solution, performance, reference, expected):
+    """
+    Checks that the performance, the slack values and the cost of a
+    candidate solution match the ones of the reference solution
+    """
+    assert performance[0] == expected[0]
+    for results, expected_results in ((performance[1], expected[1]),
+                                      (performance[2], expected[2])):
+        assert len(results) == len(expected_results)
+        for result, expected_result in zip(results, expected_results):
+            assert result[0] == expected_result[0]
+            assert np.isclose(result[1], expected_result[1], equal_nan=True)
+    assert np.allclose(solution.local_slack_value, reference.local_slack_value,
+                       equal_nan=True)
+    if expected[0]:
+        assert np.allclose(solution.global_slack_value,
+                           reference.global_slack_value)
+    assert np.isclose(solution.objective_function(S),
+                      reference.objective_function(S))
+
+
+def test_incremental_evaluation():
+    logger = space4ai_logger.Logger(name="test", verbose=0)
+    rng = np.random.default_rng(3)
+    S = System(system_json=make_system_json(rng), log=logger)
+    n_feasible = 0
+    n_candidates = 0
+    for Y_hat in random_configurations(S, logger, 60):
+        parent = Configuration(copy.deepcopy(Y_hat), logger)
+        parent.check_feasibility(S)
+        for _ in range(10):
+            moves = random_moves(S, Y_hat, rng)
+            # candidate evaluated from scratch
+            reference = Configuration(apply_moves(Y_hat, moves), logger)
+            expected = reference.check_feasibility(S)
+            # candidate evaluated incrementally from the parent, both in
+            # compact form, through a Move, and in full form
+            move = Move(Move.get_base(parent), moves, parent, logger)
+            performance = move.check_feasibility(S)
+            assert_same_evaluation(S, move.get_configuration(), performance,
+                                   reference, expected)
+            candidate = Configuration(apply_moves(Y_hat, moves), logger)
+            performance = candidate.check_feasibility(S, parent, moves)
+            assert_same_evaluation(S, candidate, performance, reference,
+                                   expected)
+            n_feasible += int(expected[0])
+            n_candidates += 1
+    # the candidates must exercise both outcomes of the check
+    assert n_candidates > 0
+    assert 0 < n_feasible < n_candidates
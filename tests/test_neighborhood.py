@@ -0,0 +1,52 @@
+import copy
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SPACE4AI_D_CACHE_DIR", tempfile.mkdtemp())
+
+from external import space4ai_logger
+from classes.System import System
+from classes.Heuristics import Local_Search
+from classes.Solution import Configuration
+from test_evaluation import make_system_json, random_configurations
+
+
+def get_neighborhood(S, solution, logger, **kwargs):
+    """
+    Returns the neighbors (assignment matrices and costs) of the given
+    solution and the number of objective function evaluations, as computed
+    by a local search with the given neighborhood options
+    """
+    heuristics = Local_Search(S, 1, 1, solution, log=logger, **kwargs)
+    neighborhood, counter_obj_evaluation = heuristics.union_neighbors(
+        solution
+    )
+    heuristics.shutdown_executor()
+    return [(neighbor.solution.get_fingerprint(), neighbor.cost) \
+            for neighbor in neighborhood], counter_obj_evaluation
+
+
+def test_parallel_neighborhood():
+    logger = space4ai_logger.Logger(name="test", verbose=0)
+    S = System(system_json=make_system_json(np.random.default_rng(3)),
+               log=logger)
+    n_solutions = 0
+    for Y_hat in random_configurations(S, logger, 40):
+        solution = Configuration(copy.deepcopy(Y_hat), logger)
+        if not solution.check_feasibility(S)[0]:
+            continue
+        expected = get_neighborhood(S, solution, logger)
+        for executor in ["thread", "process"]:
+            neighborhood = get_neighborhood(
+                S, solution, logger, neighborhood_workers=3,
+                neighborhood_executor=executor
+            )
+            assert neighborhood == expected
+        n_solutions += 1
+        if n_solutions == 5:
+            break
+    assert n_solutions > 0